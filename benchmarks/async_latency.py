@@ -0,0 +1,112 @@
+'''Load benchmark: p99 latency of fast requests while slow queries are running.
+
+Compares route handlers that call DB directly on the event loop ("before")
+with handlers that go through AsyncDB ("after").
+
+    python -m benchmarks.async_latency --requests 400 --slow 8
+'''
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault('TASK_MANAGER_DB_FILE', os.path.join(tempfile.mkdtemp(), 'bench.db'))
+
+import httpx
+from fastapi import FastAPI
+
+from helpers.async_db import AsyncDB
+from helpers.db import DB
+
+# recursive CTE that keeps sqlite busy for a while without needing any data
+SLOW_SQL = 'WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?) SELECT count(*) AS c FROM n'
+FAST_SQL = 'SELECT id, title FROM tasks WHERE id = ?'
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/blocking/slow')
+    async def blocking_slow(n: int):
+        return DB.select(SLOW_SQL, (n,))
+
+    @app.get('/blocking/fast')
+    async def blocking_fast():
+        return DB.select(FAST_SQL, (1,))
+
+    @app.get('/async/slow')
+    async def async_slow(n: int):
+        return await AsyncDB.select(SLOW_SQL, (n,))
+
+    @app.get('/async/fast')
+    async def async_fast():
+        return await AsyncDB.select(FAST_SQL, (1,))
+
+    return app
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def run(mode: str, requests: int, slow: int, slowRows: int) -> dict:
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        latencies = []
+
+        async def fast(issued: float):
+            # measured from when the request was issued, so time spent queued behind a blocked loop counts
+            await client.get(f'/{mode}/fast')
+            latencies.append((time.perf_counter() - issued) * 1000)
+
+        async def slowLoop(stop: asyncio.Event):
+            while not stop.is_set():
+                await client.get(f'/{mode}/slow', params={'n': slowRows})
+                # the in-process transport may complete without suspending, give other requests a turn
+                await asyncio.sleep(0)
+
+        stop = asyncio.Event()
+        background = [asyncio.create_task(slowLoop(stop)) for _ in range(slow)]
+        await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        for batch in range(0, requests, 20):
+            issued = time.perf_counter()
+            await asyncio.gather(*(fast(issued) for _ in range(min(20, requests - batch))))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await asyncio.gather(*background)
+
+    return {
+        'mode': mode,
+        'requests': requests,
+        'throughput': requests / elapsed,
+        'p50': statistics.median(latencies),
+        'p99': percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=400, help='fast requests to measure')
+    parser.add_argument('--slow', type=int, default=8, help='concurrent slow query loops')
+    parser.add_argument('--slow-rows', type=int, default=200000, help='rows generated by each slow query')
+    args = parser.parse_args()
+
+    DB.init()
+    DB.execute("INSERT OR IGNORE INTO tasks (id, title) VALUES (1, 'benchmark')")
+
+    for mode in ('blocking', 'async'):
+        result = asyncio.run(run(mode, args.requests, args.slow, args.slow_rows))
+        print(f"{result['mode']:>8}: {result['throughput']:8.1f} req/s  p50 {result['p50']:8.2f} ms  p99 {result['p99']:8.2f} ms")
+
+    AsyncDB.close()
+    DB.close()
+
+
+if __name__ == '__main__':
+    main()
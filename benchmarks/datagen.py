@@ -0,0 +1,118 @@
+'''Synthetic data generator for benchmarks, built on the migrations/base.sql schema.
+
+    python -m benchmarks.datagen --scale 100k
+
+Creates benchmarks/data/bench_<scale>.db (reused by later runs) with, per N tasks:
+N/100 users, N/1000 projects, N tasks, 2N task_records and N task_comments.
+'''
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+BATCH = 10_000
+
+WORDS = ('login', 'signup', 'api', 'database', 'migration', 'report', 'dashboard', 'export', 'import', 'cache',
+         'search', 'index', 'bug', 'feature', 'refactor', 'test', 'deploy', 'billing', 'email', 'profile')
+STATUSES = ('pending', 'in_progress', 'completed', 'blocked')
+PRIORITIES = ('low', 'medium', 'high')
+ACTIONS = ('created', 'updated', 'completed', 'commented')
+
+
+def dbFile(scale: str) -> str:
+    return os.path.join(DATA_DIR, f'bench_{scale}.db')
+
+
+def _sentence(rnd: random.Random, words: int) -> str:
+    return ' '.join(rnd.choice(WORDS) for _ in range(words))
+
+
+def _batches(rows, size: int = BATCH):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate(scale: str, seed: int = 42, force: bool = False) -> str:
+    '''Create the benchmark database for the scale unless it already exists, return its path'''
+    path = dbFile(scale)
+    if os.path.exists(path) and not force:
+        return path
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    # schema goes through the application so migrations, indexes and triggers match production
+    from helpers.settings import Settings
+    from helpers.db import DB
+    Settings.DB_FILE = path
+    DB.close()
+    DB.init()
+    DB.close()
+
+    n = SCALES[scale]
+    users, projects = max(n // 100, 10), max(n // 1000, 5)
+    rnd = random.Random(seed)
+    today = date.today()
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = OFF')
+
+    def insert(sql, rows):
+        for batch in _batches(rows):
+            conn.execute('BEGIN')
+            conn.executemany(sql, batch)
+            conn.execute('COMMIT')
+
+    insert('INSERT INTO users (first_name, last_name, email, password_hash, role) VALUES (?, ?, ?, ?, ?)',
+           ((f'First{i}', f'Last{i}', f'user{i}@example.com', 'x', rnd.choice(('admin', 'manager', 'developer')))
+            for i in range(users)))
+
+    insert('INSERT INTO projects (name, status) VALUES (?, ?)',
+           ((f'Project {i}', rnd.choice(('planned', 'ongoing', 'completed', 'on_hold'))) for i in range(projects)))
+
+    def tasks():
+        for i in range(n):
+            created = datetime.now() - timedelta(days=rnd.randint(0, 720), seconds=rnd.randint(0, 86400))
+            yield (_sentence(rnd, 4), _sentence(rnd, 12), rnd.choice(STATUSES), rnd.choice(PRIORITIES),
+                   (today + timedelta(days=rnd.randint(-90, 180))).isoformat(), rnd.randint(1, projects),
+                   rnd.randint(1, users), rnd.randint(1, users), created.strftime('%Y-%m-%d %H:%M:%S'))
+    insert('''INSERT INTO tasks (title, description, status, priority, due_date, project_id, assigned_user_id,
+              created_by_user_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''', tasks())
+
+    insert('INSERT INTO task_records (task_id, updated_by_user_id, action, comment) VALUES (?, ?, ?, ?)',
+           ((rnd.randint(1, n), rnd.randint(1, users), rnd.choice(ACTIONS), None) for _ in range(2 * n)))
+
+    insert('INSERT INTO task_comments (task_id, user_id, comment) VALUES (?, ?, ?)',
+           ((rnd.randint(1, n), rnd.randint(1, users), _sentence(rnd, 10)) for _ in range(n)))
+
+    conn.execute('ANALYZE')
+    conn.close()
+    print(f'generated {path} in {time.perf_counter() - started:.1f}s')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='10k')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--force', action='store_true', help='regenerate even if the database exists')
+    args = parser.parse_args()
+    generate(args.scale, args.seed, args.force)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import json
+import os
+import statistics
+import time
+
+# timing helpers shared by the benchmarks
+class Benchmark:
+
+    def __init__(self, name: str, iterations: int = 200, warmup: int = 10):
+        self.name = name
+        self.iterations = iterations
+        self.warmup = warmup
+
+    @staticmethod
+    def percentile(values: list, p: float) -> float:
+        values = sorted(values)
+        return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+    def summary(self, latencies: list, elapsed: float) -> dict:
+        '''Throughput and latency percentiles (milliseconds) of a finished run'''
+        return {
+            'name': self.name,
+            'iterations': len(latencies),
+            'ops_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+            'p50': statistics.median(latencies),
+            'p95': self.percentile(latencies, 95),
+            'p99': self.percentile(latencies, 99),
+        }
+
+    def run(self, func) -> dict:
+        '''Time func(i) for every iteration after the warmup calls'''
+        for i in range(self.warmup):
+            func(i)
+
+        latencies = []
+        started = time.perf_counter()
+        for i in range(self.iterations):
+            callStarted = time.perf_counter()
+            func(i)
+            latencies.append((time.perf_counter() - callStarted) * 1000)
+        return self.summary(latencies, time.perf_counter() - started)
+
+    async def runAsync(self, func) -> dict:
+        '''Time await func(i) for every iteration after the warmup calls'''
+        for i in range(self.warmup):
+            await func(i)
+
+        latencies = []
+        started = time.perf_counter()
+        for i in range(self.iterations):
+            callStarted = time.perf_counter()
+            await func(i)
+            latencies.append((time.perf_counter() - callStarted) * 1000)
+        return self.summary(latencies, time.perf_counter() - started)
+
+
+# stored results of a previous run, compared case by case
+class Baseline:
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, results: list, key: str):
+        '''Store results under key (e.g. the data scale), keeping other keys'''
+        baseline = self.load()
+        baseline[key] = {result['name']: result for result in results}
+        with open(self.path, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+
+    def compare(self, results: list, key: str, threshold: float) -> list:
+        '''Print results next to the baseline, return the names of cases whose p95 regressed by more than threshold'''
+        baseline = self.load().get(key, {})
+        regressions = []
+        print(f"{'case':<40} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'p95 vs baseline':>16}")
+        for result in results:
+            if 'error' in result:
+                print(f"{result['name']:<40} skipped: {result['error']}")
+                continue
+
+            delta = ''
+            previous = baseline.get(result['name'])
+            if previous and 'p95' in previous and previous['p95']:
+                change = (result['p95'] - previous['p95']) / previous['p95']
+                delta = f'{change:+.1%}'
+                if change > threshold:
+                    delta += ' REGRESSION'
+                    regressions.append(result['name'])
+
+            print(f"{result['name']:<40} {result['ops_per_sec']:>10.1f} {result['p50']:>9.3f} {result['p95']:>9.3f} {result['p99']:>9.3f} {delta:>16}")
+        return regressions
@@ -0,0 +1,74 @@
+'''Per-endpoint benchmark of the task and user search routes with pydantic serialisation versus the fast JSON path.
+
+    python -m benchmarks.json_routes --scale 100k
+
+Every case is timed twice in-process on the synthetic database (benchmarks.datagen), with the response
+cache disabled: first validated and dumped through the response model, then with fastJson enabled
+(rows selected as records in output shape and dumped with orjson). Both bodies are checked to be identical.
+'''
+import argparse
+import asyncio
+import os
+import random
+
+from benchmarks import datagen
+from benchmarks.harness import Benchmark
+
+
+def cases() -> list:
+    return [
+        ('GET /tasks/search limit=100', '/tasks/search', {'limit': 100}),
+        ('GET /tasks/search limit=500', '/tasks/search', {'limit': 500}),
+        ('GET /tasks/search limit=1000', '/tasks/search', {'limit': 1000}),
+        ('GET /tasks/search status limit=500', '/tasks/search', {'status': 'pending', 'limit': 500}),
+        ('GET /tasks/search sort=created_at limit=500', '/tasks/search', {'sort': 'created_at', 'limit': 500}),
+        ('GET /tasks/search q= limit=500', '/tasks/search', {'q': 'login', 'limit': 500}),
+        ('GET /users/search limit=100', '/users/search', {'limit': 100}),
+        ('GET /users/search limit=1000', '/users/search', {'limit': 1000}),
+        ('GET /users/search role limit=500', '/users/search', {'role': 'developer', 'limit': 500}),
+    ]
+
+
+async def run(iterations: int):
+    import httpx
+    import main
+    from helpers.response_cache import responseCache
+
+    responseCache.enabled = False
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url='http://bench')
+
+    print(f"{'case':<44} {'pydantic p50':>13} {'fast p50':>9} {'pydantic p95':>13} {'fast p95':>9} {'speedup':>8}")
+    for name, path, params in cases():
+        bodies, results = {}, {}
+        for fast in (False, True):
+            responseCache.fastJson = fast
+            response = await client.get(path, params=params)
+            response.raise_for_status()
+            bodies[fast] = response.content
+
+            async def call(i):
+                (await client.get(path, params=params)).raise_for_status()
+            results[fast] = await Benchmark(name, iterations).runAsync(call)
+
+        same = '' if bodies[False] == bodies[True] else '  BODIES DIFFER'
+        slow, quick = results[False], results[True]
+        print(f"{name:<44} {slow['p50']:>13.2f} {quick['p50']:>9.2f} {slow['p95']:>13.2f} {quick['p95']:>9.2f} {slow['p50'] / quick['p50']:>7.1f}x{same}")
+    await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=datagen.SCALES, default='100k')
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    # settings are read on first import, which generating a database does
+    os.environ['TASK_MANAGER_SQL_PROFILING'] = '0'
+    os.environ['TASK_MANAGER_ADMISSION'] = '0'  # one client at full speed would be rate limited
+    os.environ['TASK_MANAGER_DB_FILE'] = datagen.generate(args.scale)
+    random.seed(1)
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+'''Stress test of the shared write path: N worker processes against one database file.
+
+    python -m benchmarks.multiprocess_stress --workers 4 --threads 4 --writes 500
+
+Every worker starts with DB.init() at the same moment (as uvicorn --workers does), then its threads
+mix Tasks.add, Tasks.update and Tasks.search. The run fails (exit 1) when any operation raised,
+when a migration was applied twice or when the final row counts do not add up.
+'''
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def worker(number: int, threads: int, writes: int, start, results):
+    # imported here so Settings reads the environment prepared by main()
+    from helpers.db import DB
+    from services.tasks import Tasks
+    from schemas.task_input_output import TaskInputAdd, TaskInputUpdate, TaskStatus
+
+    start.wait()
+    DB.init()
+
+    def run(thread: int) -> tuple[int, list, list]:
+        ids, errors, latencies = [], [], []
+        for i in range(writes):
+            started = time.perf_counter()
+            try:
+                id = Tasks.add(TaskInputAdd(title=f'stress {number}.{thread}.{i}', assigned_user_id=random.randint(1, 50)))
+                ids.append(id)
+                if i % 3 == 0:
+                    Tasks.update(random.choice(ids), TaskInputUpdate(status=random.choice(list(TaskStatus))))
+                if i % 5 == 0:
+                    Tasks.search(assigned_user_id=random.randint(1, 50), limit=20)
+            except Exception as e:
+                errors.append(f'{type(e).__name__}: {e}')
+            latencies.append(time.perf_counter() - started)
+        return len(ids), errors, latencies
+
+    with ThreadPoolExecutor(threads) as executor:
+        outcomes = list(executor.map(run, range(threads)))
+
+    results.put({
+        'worker': number,
+        'added': sum(added for added, _, _ in outcomes),
+        'errors': [error for _, errors, _ in outcomes for error in errors],
+        'latencies': [latency for _, _, latencies in outcomes for latency in latencies],
+        'retries': DB.stats()['write_retries'],
+    })
+    DB.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='processes sharing the database file')
+    parser.add_argument('--threads', type=int, default=4, help='writer threads per process')
+    parser.add_argument('--writes', type=int, default=500, help='tasks added per thread')
+    parser.add_argument('--db', help='database file (default: a new temporary file)')
+    args = parser.parse_args()
+
+    dbFile = args.db or os.path.join(tempfile.mkdtemp(), 'stress.db')
+    os.environ['TASK_MANAGER_DB_FILE'] = dbFile
+    os.environ['TASK_MANAGER_WORKERS'] = str(args.workers)
+
+    context = multiprocessing.get_context('spawn')
+    start, results = context.Event(), context.Queue()
+    processes = [context.Process(target=worker, args=(n, args.threads, args.writes, start, results)) for n in range(args.workers)]
+    for process in processes:
+        process.start()
+
+    started = time.perf_counter()
+    start.set()
+    reports = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    errors = [error for report in reports for error in report['errors']]
+    latencies = sorted(latency for report in reports for latency in report['latencies'])
+    added = sum(report['added'] for report in reports)
+
+    conn = sqlite3.connect(dbFile)
+    tasks = conn.execute('SELECT count(*) FROM tasks').fetchone()[0]
+    created = conn.execute("SELECT count(*) FROM task_records WHERE action = 'created'").fetchone()[0]
+    rollup = conn.execute("SELECT sum(task_count) FROM task_stats WHERE scope = 'all'").fetchone()[0]
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    conn.close()
+
+    print(f'{args.workers} workers x {args.threads} threads x {args.writes} writes in {elapsed:.1f}s ({len(latencies) / elapsed:.0f} ops/s)')
+    print(f'p50 {latencies[len(latencies) // 2] * 1000:.1f}ms  p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms  '
+          f'locked retries {sum(report["retries"] for report in reports)}')
+    print(f'tasks {tasks}  created records {created}  task_stats total {rollup}  user_version {version}')
+
+    failures = []
+    if errors:
+        failures.append(f'{len(errors)} operations failed, first: {errors[0]}')
+    if not tasks == created == rollup == added == args.workers * args.threads * args.writes:
+        failures.append('row counts do not match the number of writes')
+    for failure in failures:
+        print('FAIL', failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
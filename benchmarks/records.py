@@ -0,0 +1,78 @@
+'''Memory and throughput of DB.select result modes on a large select.
+
+    python -m benchmarks.records --scale 100k
+
+Selects every task of the synthetic database (benchmarks.datagen) as
+- dicts (DB.select), then validated into TaskOutputSearch models and dumped by pydantic, the search route path
+- slotted records (DB.select(records=True)), dumped with orjson by Records.dumps
+and reports the time of each step and the memory the result holds (tracemalloc).
+'''
+import argparse
+import gc
+import os
+import statistics
+import time
+import tracemalloc
+
+from benchmarks import datagen
+
+SQL = 'SELECT * FROM tasks'
+
+
+def measure(func, runs: int) -> tuple:
+    '''Median seconds of func over runs, and (retained, peak) bytes of one more call'''
+    times = []
+    for _ in range(runs):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return statistics.median(times), retained, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=datagen.SCALES, default='100k')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ['TASK_MANAGER_DB_FILE'] = datagen.generate(args.scale)
+    os.environ['TASK_MANAGER_SQL_PROFILING'] = '0'
+
+    from pydantic import TypeAdapter
+    from helpers.db import DB
+    from helpers.records import Records
+    from schemas.task_input_output import TaskOutputSearch
+
+    adapter = TypeAdapter(list[TaskOutputSearch])
+    dicts = DB.select(SQL)
+    models = adapter.validate_python(dicts)
+    records = DB.select(SQL, records=True)
+
+    cases = [
+        ('select dicts', lambda: DB.select(SQL)),
+        ('select records', lambda: DB.select(SQL, records=True)),
+        ('validate dicts -> models', lambda: adapter.validate_python(dicts)),
+        ('dump models (pydantic)', lambda: adapter.dump_json(models)),
+        ('dump records (orjson)', lambda: Records.dumps(records)),
+        ('select + validate + dump', lambda: adapter.dump_json(adapter.validate_python(DB.select(SQL)))),
+        ('select records + dump', lambda: Records.dumps(DB.select(SQL, records=True))),
+    ]
+
+    print(f'{len(dicts)} rows')
+    print(f'{"case":<28}{"median ms":>11}{"rows/s":>12}{"retained MiB":>14}{"peak MiB":>10}')
+    for name, func in cases:
+        seconds, retained, peak = measure(func, args.runs)
+        print(f'{name:<28}{seconds * 1000:>11.1f}{len(dicts) / seconds:>12,.0f}{retained / 2**20:>14.1f}{peak / 2**20:>10.1f}')
+    DB.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+'''Benchmark suite for DB, the service layer and the HTTP routes.
+
+    python -m benchmarks.run --scale 100k
+    python -m benchmarks.run --scale 100k --save-baseline
+    python -m benchmarks.run --scale 100k --fail-on-regression
+
+Generates (or reuses) the synthetic database of benchmarks.datagen, times every case
+and compares p95 latency with benchmarks/baseline.json. Caches are disabled unless
+--with-caches is given, so repeated requests measure the database path.
+'''
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+from benchmarks import datagen
+from benchmarks.harness import Benchmark, Baseline
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def dbCases(n: int, users: int) -> list:
+    from helpers.db import DB
+    return [
+        ('db.select task by pk', lambda i: DB.select('SELECT * FROM tasks WHERE id = ?', (random.randint(1, n),))),
+        ('db.select open tasks of assignee', lambda i: DB.select(
+            "SELECT * FROM tasks WHERE assigned_user_id = ? AND status = 'pending' ORDER BY due_date LIMIT 20",
+            (random.randint(1, users),))),
+        ('db.select task history', lambda i: DB.select(
+            'SELECT * FROM task_records WHERE task_id = ? ORDER BY update_date', (random.randint(1, n),))),
+        ('db.select_task_by_id', lambda i: DB.select_task_by_id(random.randint(1, n))),
+    ]
+
+
+def serviceCases(n: int, users: int) -> list:
+    from services.tasks import Tasks
+    from services.users import Users
+    return [
+        ('Tasks.search by status', lambda i: Tasks.search(status='pending', limit=50)),
+        ('Tasks.search by assignee', lambda i: Tasks.search(assigned_user_id=random.randint(1, users), limit=50)),
+        ('Tasks.search deep offset', lambda i: Tasks.search(limit=50, offset=n // 2)),
+        ('Tasks.search full text', lambda i: Tasks.search(q=random.choice(datagen.WORDS), limit=50)),
+        ('Users.searchUsers', lambda i: Users.searchUsers(limit=50)),
+        ('Users.searchUsers full text', lambda i: Users.searchUsers(q=f'Last{random.randint(1, users)}', limit=50)),
+    ]
+
+
+def routeCases(n: int, users: int) -> list:
+    import httpx
+    import main
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url='http://bench')
+    return [
+        ('GET /tasks/search', lambda i: client.get('/tasks/search', params={'status': 'pending', 'limit': 50, 'offset': i})),
+        ('GET /tasks/search?q=', lambda i: client.get('/tasks/search', params={'q': random.choice(datagen.WORDS), 'limit': 50})),
+        ('GET /users/search', lambda i: client.get('/users/search', params={'limit': 50, 'offset': i})),
+        ('GET /users/search?q=', lambda i: client.get('/users/search', params={'q': f'Last{random.randint(1, users)}', 'limit': 50})),
+    ]
+
+
+def runCases(cases: list, iterations: int) -> list:
+    results = []
+    for name, func in cases:
+        try:
+            results.append(Benchmark(name, iterations).run(func))
+        except Exception as e:
+            results.append({'name': name, 'error': f'{type(e).__name__}: {e}'})
+    return results
+
+
+async def runRouteCases(cases: list, iterations: int) -> list:
+    results = []
+    for name, func in cases:
+        async def call(i, func=func):
+            response = await func(i)
+            if response.status_code >= 400:
+                raise RuntimeError(f'HTTP {response.status_code}: {response.text[:200]}')
+        try:
+            results.append(await Benchmark(name, iterations).runAsync(call))
+        except Exception as e:
+            results.append({'name': name, 'error': f'{type(e).__name__}: {e}'})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=datagen.SCALES, default='10k')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--with-caches', action='store_true', help='keep the entity and response caches enabled')
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline for the scale')
+    parser.add_argument('--threshold', type=float, default=0.2, help='p95 slowdown counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='exit with status 1 on any regression')
+    args = parser.parse_args()
+
+    # settings are read on first import, which generating a database does
+    os.environ['TASK_MANAGER_ADMISSION'] = '0'  # one client at full speed would be rate limited
+    if not args.with_caches:
+        os.environ['TASK_MANAGER_ENTITY_CACHE'] = '0'
+        os.environ['TASK_MANAGER_RESPONSE_CACHE'] = '0'
+    os.environ['TASK_MANAGER_DB_FILE'] = datagen.generate(args.scale)
+
+    from helpers.db import DB
+    n = datagen.SCALES[args.scale]
+    users = max(n // 100, 10)
+    random.seed(1)
+
+    results = runCases(dbCases(n, users), args.iterations)
+    results += runCases(serviceCases(n, users), args.iterations)
+    try:
+        results += asyncio.run(runRouteCases(routeCases(n, users), args.iterations))
+    except Exception as e:
+        results.append({'name': 'routes', 'error': f'{type(e).__name__}: {e}'})
+    DB.close()
+
+    baseline = Baseline(BASELINE)
+    regressions = baseline.compare(results, args.scale, args.threshold)
+    if args.save_baseline:
+        baseline.save([result for result in results if 'error' not in result], args.scale)
+        print(f'baseline saved to {BASELINE}')
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
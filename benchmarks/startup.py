@@ -0,0 +1,76 @@
+'''Cold start benchmark: import time of main and time to the first response, in fresh interpreters.
+
+    python -m benchmarks.startup --runs 10
+
+Each run starts a new python process that imports main, runs the app lifespan startup and serves
+GET /tasks/search in-process. Reports the median of every phase and which heavy optional modules
+were imported before the first response.
+'''
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+import asyncio, httpx
+
+async def first():
+    async with main.app.router.lifespan_context(main.app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            response = await client.get('/tasks/search')
+        return ready, response.status_code
+
+ready, status = asyncio.run(first())
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'lifespan_ms': (ready - imported) * 1000,
+    'first_response_ms': (time.perf_counter() - started) * 1000,
+    'status': status,
+    'modules': len(sys.modules),
+    'heavy': [name for name in ('numpy', 'sqlalchemy') if name in sys.modules],
+}))
+'''
+
+PHASES = ('process_ms', 'import_ms', 'lifespan_ms', 'first_response_ms')
+
+
+def run(env: dict) -> dict:
+    '''One fresh interpreter, process_ms includes interpreter startup'''
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', CHILD], env=env, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    env = {**os.environ, 'TASK_MANAGER_DB_FILE': os.path.join(tempfile.mkdtemp(), 'startup.db')}
+    run(env)  # creates the database and warms the bytecode and page caches
+    results = [run(env) for _ in range(args.runs)]
+
+    for phase in PHASES:
+        print(f'{phase:<18} median {statistics.median(r[phase] for r in results):8.1f}  max {max(r[phase] for r in results):8.1f}')
+    print(f'modules loaded     {results[-1]["modules"]}')
+    print(f'heavy modules      {", ".join(results[-1]["heavy"]) or "none"}')
+    if any(r['status'] != 200 for r in results):
+        print('FAIL first request did not return 200')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from helpers.settings import Settings
+
+# per-client token buckets: rate tokens per second refilled up to burst, one token per request
+class RateLimiter:
+
+    def __init__(self, rate: float, burst: float, maxClients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.maxClients = maxClients
+        self._buckets = OrderedDict()  # client -> (tokens, last refill)
+
+    def take(self, client: str) -> float:
+        '''Take a token for the client; return 0 when admitted, else the seconds until a token is available'''
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+
+        # least recently seen clients are forgotten first, a forgotten client starts with a full bucket
+        self._buckets[client] = (tokens, now)
+        while len(self._buckets) > self.maxClients:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+# bounded admission of writes: at most concurrency requests run, at most queueSize wait (up to timeout seconds),
+# anything beyond is rejected at once so a burst cannot pile up behind the single sqlite writer
+class WriteGate:
+
+    def __init__(self, concurrency: int, queueSize: int, timeout: float):
+        self.concurrency = concurrency
+        self.queueSize = queueSize
+        self.timeout = timeout
+        self.inFlight = 0
+        self.waiting = 0
+        self._semaphore = None
+        self._loop = None
+
+    def _slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore, self._loop = asyncio.Semaphore(self.concurrency), loop
+        return self._semaphore
+
+    async def acquire(self) -> str | None:
+        '''Wait for a write slot; return None once admitted, else the reason of the rejection'''
+        slots = self._slots()
+        if slots.locked():
+            if self.waiting >= self.queueSize:
+                return 'queue_full'
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                return 'queue_timeout'
+            finally:
+                self.waiting -= 1
+        else:
+            await slots.acquire()
+        self.inFlight += 1
+        return None
+
+    def release(self):
+        self.inFlight -= 1
+        self._semaphore.release()
+
+
+# admission control in front of the routes: per-client rate limits for reads and writes (429)
+# and the write gate (503), both answered with Retry-After before any database work is done
+class Admission:
+
+    enabled = Settings.ADMISSION_ENABLED
+    reads = RateLimiter(Settings.RATE_LIMIT_READS, Settings.RATE_LIMIT_READ_BURST)
+    writes = RateLimiter(Settings.RATE_LIMIT_WRITES, Settings.RATE_LIMIT_WRITE_BURST)
+    gate = WriteGate(Settings.WRITE_CONCURRENCY, Settings.WRITE_QUEUE_SIZE, Settings.WRITE_QUEUE_TIMEOUT)
+
+    # documentation and metrics stay reachable while the API is shedding load
+    EXEMPT_PATHS = ('/', '/docs', '/redoc', '/openapi.json', '/debug/admission')
+    READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    _stats = {'admitted': 0, 'rate_limited_reads': 0, 'rate_limited_writes': 0, 'write_queue_full': 0, 'write_queue_timeout': 0}
+
+    @staticmethod
+    def client(request: Request) -> str:
+        '''Client identity: the peer address. Request headers are not used, a client could rotate them
+        to get a fresh bucket on every request and push other clients out of the tracked set'''
+        return request.client.host if request.client else 'unknown'
+
+    @staticmethod
+    def reject(statusCode: int, detail: str, retryAfter: float) -> JSONResponse:
+        return JSONResponse(status_code=statusCode, content={'detail': detail}, headers={'Retry-After': str(max(1, math.ceil(retryAfter)))})
+
+    @classmethod
+    async def handle(cls, request: Request, call_next):
+        if not cls.enabled or request.url.path in cls.EXEMPT_PATHS:
+            return await call_next(request)
+
+        isRead = request.method in cls.READ_METHODS
+        wait = (cls.reads if isRead else cls.writes).take(cls.client(request))
+        if wait:
+            cls._stats['rate_limited_reads' if isRead else 'rate_limited_writes'] += 1
+            return cls.reject(status.HTTP_429_TOO_MANY_REQUESTS, 'Rate limit exceeded', wait)
+
+        if isRead:
+            cls._stats['admitted'] += 1
+            return await call_next(request)
+
+        rejected = await cls.gate.acquire()
+        if rejected is not None:
+            cls._stats[f'write_{rejected}'] += 1
+            return cls.reject(status.HTTP_503_SERVICE_UNAVAILABLE, 'Too many concurrent writes', cls.gate.timeout)
+
+        cls._stats['admitted'] += 1
+        try:
+            return await call_next(request)
+        finally:
+            cls.gate.release()
+
+    @classmethod
+    def stats(cls) -> dict:
+        '''Admitted and shed request counters, current write concurrency and tracked clients'''
+        return {
+            **cls._stats,
+            'enabled': cls.enabled,
+            'write_in_flight': cls.gate.inFlight,
+            'write_waiting': cls.gate.waiting,
+            'clients': len(cls.reads) + len(cls.writes),
+        }
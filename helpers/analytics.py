@@ -0,0 +1,134 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from helpers.db import DB
+from helpers.profiler import QueryProfiler
+from helpers.settings import Settings
+from schemas.task_input_output import TaskStatus, TaskPriority
+
+# in-memory columnar copy of tasks for the reporting endpoints: one numpy array per column,
+# status/priority as integer codes and times as epoch seconds. Refreshes read only the tasks changed
+# since the previous refresh (idx_tasks_changed_at) and the new completion events, so reports never scan the database
+class TaskSnapshot:
+
+    COLUMNS = ('id', 'status', 'priority', 'project_id', 'assigned_user_id', 'created_at', 'due_date', 'changed_at')
+
+    # codes are positions in the enums, NULL ids are 0 and a missing due date is -1
+    TASKS_SQL = f'''
+        SELECT id,
+               CASE status {' '.join(f"WHEN '{s.value}' THEN {code}" for code, s in enumerate(TaskStatus))} END,
+               CASE priority {' '.join(f"WHEN '{p.value}' THEN {code}" for code, p in enumerate(TaskPriority))} END,
+               COALESCE(project_id, 0),
+               COALESCE(assigned_user_id, 0),
+               CAST(strftime('%s', created_at) AS INTEGER),
+               COALESCE(CAST(strftime('%s', due_date) AS INTEGER), -1),
+               CAST(strftime('%s', COALESCE(updated_at, created_at)) AS INTEGER)
+        FROM tasks WHERE COALESCE(updated_at, created_at) >= :since
+    '''
+
+    COMPLETIONS_SQL = '''
+        SELECT id, task_id, CAST(strftime('%s', update_date) AS INTEGER) FROM task_records
+        WHERE id > :after AND action = 'completed' ORDER BY id
+    '''
+
+    # number of tasks according to the task_stats rollup, a cheap way to notice deleted tasks
+    COUNT_SQL = "SELECT COALESCE(sum(task_count), 0) FROM task_stats WHERE scope = 'all' AND scope_id = 0"
+
+    def __init__(self, refreshInterval: float = 30):
+        self.refreshInterval = refreshInterval
+        self.lock = threading.RLock()  # held by refreshes and by readers of the columns
+        self._reset()
+
+    def _reset(self):
+        self.columns = {name: np.empty(0, dtype=np.int64) for name in self.COLUMNS}
+        self.columns['completed_at'] = np.empty(0, dtype=np.int64)  # 0 until a completion is seen
+        self._index = {}  # task id -> row
+        self._since = ''  # COALESCE(updated_at, created_at) of the newest task loaded
+        self._lastRecordId = 0
+        self._refreshed = 0.0
+        self._stats = {'full_loads': 0, 'refreshes': 0, 'rows_read': 0}
+
+    def _select(self, conn, sql: str, params: dict) -> list[tuple]:
+        started = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        QueryProfiler.record(sql, params, time.perf_counter() - started, len(rows))
+        self._stats['rows_read'] += len(rows)
+        return rows
+
+    def refresh(self, full: bool = False):
+        '''Apply the tasks changed and the completions recorded since the last refresh, or reload everything'''
+        with self.lock:
+            if full:
+                stats = self._stats
+                self._reset()
+                self._stats = stats
+            # one read transaction so tasks, records and the count agree
+            with DB.connection() as conn:
+                conn.execute('BEGIN')
+                try:
+                    tasks = self._select(conn, self.TASKS_SQL, {'since': self._since})
+                    completions = self._select(conn, self.COMPLETIONS_SQL, {'after': self._lastRecordId})
+                    count = conn.execute(self.COUNT_SQL).fetchone()[0]
+                finally:
+                    conn.rollback()
+
+            self._upsert(tasks)
+            self._complete(completions)
+
+            if len(self._index) != count and not full:
+                # tasks were deleted since the last refresh, deletes leave nothing to read incrementally.
+                # The connection is back in the pool, the full reload takes one of its own
+                return self.refresh(full=True)
+
+            self._stats['full_loads' if full else 'refreshes'] += 1
+            self._refreshed = time.monotonic()
+
+    def ensureFresh(self):
+        '''Refresh when the snapshot is older than refreshInterval seconds'''
+        if time.monotonic() - self._refreshed >= self.refreshInterval:
+            self.refresh(full=not self._index)
+
+    def _upsert(self, rows: list[tuple]):
+        if not rows:
+            return
+        data = np.array(rows, dtype=np.int64)
+        rowIndex = np.array([self._index.get(id, -1) for id in data[:, 0]], dtype=np.int64)
+        existing = rowIndex >= 0
+
+        for position, name in enumerate(self.COLUMNS):
+            self.columns[name][rowIndex[existing]] = data[existing, position]
+
+        new = data[~existing]
+        if len(new):
+            start = len(self.columns['id'])
+            for position, name in enumerate(self.COLUMNS):
+                self.columns[name] = np.concatenate((self.columns[name], new[:, position]))
+            self.columns['completed_at'] = np.concatenate((self.columns['completed_at'], np.zeros(len(new), dtype=np.int64)))
+            self._index.update(zip(new[:, 0].tolist(), range(start, start + len(new))))
+
+        # timestamps have second precision, the next refresh re-reads the rows of the newest second
+        newest = int(data[:, self.COLUMNS.index('changed_at')].max())
+        self._since = max(self._since, datetime.fromtimestamp(newest, timezone.utc).strftime('%Y-%m-%d %H:%M:%S'))
+
+    def _complete(self, rows: list[tuple]):
+        for recordId, taskId, completedAt in rows:
+            row = self._index.get(taskId)
+            if row is not None:
+                self.columns['completed_at'][row] = completedAt
+            self._lastRecordId = recordId
+
+    def stats(self) -> dict:
+        '''Size of the snapshot and refresh counters'''
+        with self.lock:
+            return {
+                **self._stats,
+                'rows': len(self._index),
+                'bytes': sum(column.nbytes for column in self.columns.values()),
+                'age_seconds': round(time.monotonic() - self._refreshed, 3) if self._refreshed else None,
+            }
+
+
+taskSnapshot = TaskSnapshot(Settings.ANALYTICS_REFRESH_INTERVAL)
@@ -0,0 +1,50 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from helpers.db import DB
+from helpers.settings import Settings
+
+# async counterpart of DB: runs the blocking sqlite calls on a dedicated executor
+# so the event loop keeps serving other requests while a query is running
+class AsyncDB:
+
+    _executor: ThreadPoolExecutor | None = None
+    _executorLock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        '''Return the database executor, creating it on first use'''
+        if cls._executor is None:
+            with cls._executorLock:
+                if cls._executor is None:
+                    # one thread per pooled connection, extra threads would only wait for a connection
+                    cls._executor = ThreadPoolExecutor(max_workers=Settings.DB_POOL_SIZE, thread_name_prefix='db')
+        return cls._executor
+
+    @classmethod
+    async def run(cls, func, *args, **kwargs):
+        '''Run any blocking function (a DB method or a service call) on the database executor'''
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await loop.run_in_executor(cls.executor(), call)
+
+    @classmethod
+    async def execute(cls, sql, params=()):
+        '''Execute the sql query and return lastrowid'''
+        return await cls.run(DB.execute, sql, params)
+
+    @classmethod
+    async def select(cls, sql, params=()) -> list:
+        '''Select and return associated rows as a list of dictionaries'''
+        return await cls.run(DB.select, sql, params)
+
+    @classmethod
+    def close(cls):
+        '''Wait for running queries and shut the executor down'''
+        with cls._executorLock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=True)
+                cls._executor = None
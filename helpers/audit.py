@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from helpers.async_db import AsyncDB
+from helpers.db import DB
+from helpers.settings import Settings
+
+logger = logging.getLogger('task_manager.audit')
+
+# append-only writer of task_records: the task write paths enqueue events and a background task
+# owned by the app lifespan inserts them in batches. Events are written in the order they were enqueued,
+# pending events are drained on graceful shutdown (a crash loses at most one flush interval)
+class AuditLog:
+
+    INSERT_SQL = 'INSERT INTO task_records (task_id, updated_by_user_id, update_date, action, comment) VALUES (?, ?, ?, ?, ?)'
+
+    batchSize = Settings.AUDIT_BATCH_SIZE
+    flushInterval = Settings.AUDIT_FLUSH_INTERVAL
+    maxPending = Settings.AUDIT_MAX_PENDING
+
+    _pending = deque()
+    _lock = threading.Lock()
+    _flushLock = threading.Lock()  # one flush at a time keeps the insert order
+    _task: asyncio.Task | None = None
+    _loop: asyncio.AbstractEventLoop | None = None
+    _wake: asyncio.Event | None = None
+    _stats = {'enqueued': 0, 'written': 0, 'batches': 0, 'failures': 0}
+
+    @classmethod
+    def record(cls, task_id: int, action: str, updated_by_user_id: int | None = None, comment: str | None = None):
+        '''Queue a history event, timestamped now. Written right away when the background writer is not running'''
+        event = (task_id, updated_by_user_id, datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'), action, comment)
+        with cls._lock:
+            cls._pending.append(event)
+            cls._stats['enqueued'] += 1
+            pending = len(cls._pending)
+
+        if cls._task is None or pending >= cls.maxPending:
+            # no writer (scripts, tests) or the writer fell behind: write from the caller
+            cls.flush()
+        elif pending >= cls.batchSize:
+            cls._loop.call_soon_threadsafe(cls._wake.set)
+
+    @classmethod
+    def flush(cls) -> int:
+        '''Insert all pending events in batches, return the number written'''
+        with cls._flushLock:
+            return cls._flushPending()
+
+    @classmethod
+    @contextmanager
+    def direct(cls):
+        '''For history rows a write path inserts itself (in its own transaction): pending events are written first
+        and no flush runs until the block ends, so the rows get ids after every event recorded before them'''
+        with cls._flushLock:
+            cls._flushPending()
+            yield
+
+    @classmethod
+    def _flushPending(cls) -> int:
+        written = 0
+        while True:
+            with cls._lock:
+                batch = [cls._pending.popleft() for _ in range(min(cls.batchSize, len(cls._pending)))]
+            if not batch:
+                return written
+            try:
+                DB.executemany(cls.INSERT_SQL, batch)
+            except Exception:
+                # put the batch back in front so nothing is lost or reordered, retried on the next flush
+                with cls._lock:
+                    cls._pending.extendleft(reversed(batch))
+                    cls._stats['failures'] += 1
+                raise
+            written += len(batch)
+            with cls._lock:
+                cls._stats['written'] += len(batch)
+                cls._stats['batches'] += 1
+
+    @classmethod
+    async def _run(cls):
+        '''Flush every flushInterval seconds, or sooner when a full batch is waiting'''
+        while True:
+            try:
+                await asyncio.wait_for(cls._wake.wait(), cls.flushInterval)
+            except asyncio.TimeoutError:
+                pass
+            cls._wake.clear()
+            try:
+                await AsyncDB.run(cls.flush)
+            except Exception:
+                logger.exception('Writing task history failed, retrying on the next flush')
+
+    @classmethod
+    def start(cls):
+        '''Start the background writer on the running event loop'''
+        if cls._task is None:
+            cls._loop = asyncio.get_running_loop()
+            cls._wake = asyncio.Event()
+            cls._task = cls._loop.create_task(cls._run())
+
+    @classmethod
+    async def stop(cls):
+        '''Stop the background writer and write everything still pending'''
+        if cls._task is not None:
+            task, cls._task = cls._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        cls.flush()
+
+    @classmethod
+    def stats(cls) -> dict:
+        '''Queue and writer counters'''
+        with cls._lock:
+            return {**cls._stats, 'pending': len(cls._pending), 'running': cls._task is not None}
@@ -0,0 +1,99 @@
+import json
+import sqlite3
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+
+from helpers.async_db import AsyncDB
+from helpers.db import DB
+from helpers.settings import Settings
+
+# bulk import of rows posted as a JSON array or as an NDJSON stream
+class BulkImport:
+
+    NDJSON_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+    @classmethod
+    async def records(cls, request: Request):
+        '''Yield (index, parsed object or parse error) for every record of the request body'''
+        contentType = request.headers.get('content-type', '').split(';')[0].strip()
+
+        if contentType in cls.NDJSON_TYPES:
+            # stream line by line so the whole body is never held in memory
+            index, buffer = 0, b''
+            async for chunk in request.stream():
+                buffer += chunk
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    if line.strip():
+                        yield index, cls._parse(line)
+                        index += 1
+            if buffer.strip():
+                yield index, cls._parse(buffer)
+            return
+
+        try:
+            items = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f'Invalid JSON: {e}')
+        if not isinstance(items, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Expected a JSON array or an NDJSON stream')
+        for index, item in enumerate(items):
+            yield index, item
+
+    @staticmethod
+    def _parse(line: bytes):
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            return ValueError(f'Invalid JSON: {e}')
+
+    @classmethod
+    async def run(cls, request: Request, schema: type[BaseModel], insertBatch) -> dict:
+        '''Validate records with schema and insert them in batches with insertBatch(list of (index, model)).
+        insertBatch returns (inserted count, list of row errors); invalid rows are reported, not fatal'''
+        inserted, errors, batch = 0, [], []
+
+        async for index, item in cls.records(request):
+            if isinstance(item, Exception):
+                errors.append({'index': index, 'error': str(item)})
+                continue
+            try:
+                batch.append((index, schema.model_validate(item)))
+            except ValidationError as e:
+                errors.append({'index': index, 'error': e.errors(include_url=False, include_context=False, include_input=False)})
+
+            if len(batch) >= Settings.BULK_BATCH_SIZE:
+                count, batchErrors = await AsyncDB.run(insertBatch, batch)
+                inserted, batch = inserted + count, []
+                errors.extend(batchErrors)
+
+        if batch:
+            count, batchErrors = await AsyncDB.run(insertBatch, batch)
+            inserted += count
+            errors.extend(batchErrors)
+
+        return {'inserted': inserted, 'errors': sorted(errors, key=lambda error: error['index'])}
+
+    @staticmethod
+    def insert(sql: str, rows: list) -> tuple[int, list]:
+        '''Insert (index, params) rows with executemany in one transaction.
+        If the batch violates a constraint it is retried row by row so only the offending rows are rejected'''
+        try:
+            return DB.executemany(sql, [params for _, params in rows]), []
+        except sqlite3.IntegrityError:
+            pass
+
+        inserted, errors = 0, []
+        with DB.transaction() as conn:
+            for index, params in rows:
+                conn.execute('SAVEPOINT bulk_row')
+                try:
+                    conn.execute(sql, params)
+                    inserted += 1
+                except sqlite3.IntegrityError as e:
+                    conn.execute('ROLLBACK TO bulk_row')
+                    errors.append({'index': index, 'error': str(e)})
+                conn.execute('RELEASE bulk_row')
+        DB.invalidate(sql)
+        return inserted, errors
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+
+# bounded LRU cache of entity rows keyed by (table, id), with a TTL and per-table invalidation
+class EntityCache:
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60, enabled: bool = True):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self._items = OrderedDict()  # (table, id) -> (expires, row)
+        self._generations = {}  # table -> number of invalidations so far
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def generation(self, table: str) -> int:
+        '''Invalidation counter of the table, read before loading a row and passed to put'''
+        return self._generations.get(table, 0)
+
+    def get(self, table: str, id: int) -> dict | None:
+        '''Return a copy of the cached row or None on a miss'''
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            item = self._items.get((table, id))
+            if item is None:
+                self._stats['misses'] += 1
+                return None
+
+            expires, row = item
+            if expires < time.monotonic():
+                del self._items[(table, id)]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._items.move_to_end((table, id))
+            self._stats['hits'] += 1
+            return dict(row)
+
+    def put(self, table: str, id: int, row: dict, generation: int):
+        '''Cache a row loaded while the table was at the given generation.
+        Rows loaded before a concurrent invalidation are dropped instead of caching stale data'''
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if self._generations.get(table, 0) != generation:
+                return
+
+            self._items[(table, id)] = (time.monotonic() + self.ttl, dict(row))
+            self._items.move_to_end((table, id))
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, table: str, id: int | None = None):
+        '''Drop one row, or every row of the table when id is None'''
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            self._stats['invalidations'] += 1
+            if id is not None:
+                self._items.pop((table, id), None)
+            else:
+                for key in [key for key in self._items if key[0] == table]:
+                    del self._items[key]
+
+    def clear(self):
+        '''Drop every cached row'''
+        with self._lock:
+            for table in {key[0] for key in self._items} | set(self._generations):
+                self._generations[table] = self._generations.get(table, 0) + 1
+            self._stats['invalidations'] += 1
+            self._items.clear()
+
+    def stats(self) -> dict:
+        '''Hit/miss/eviction counters and current occupancy'''
+        with self._lock:
+            return {**self._stats, 'enabled': self.enabled, 'size': len(self._items), 'maxsize': self.maxsize, 'ttl': self.ttl}
+
+
+# per-table change counters, bumped on every write, used to tell whether cached responses are still current.
+# bumpAll also moves the epoch, part of every snapshot, so tables never written so far are covered as well
+class TableVersions:
+
+    def __init__(self):
+        self._versions = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def bump(self, table: str):
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def bumpAll(self):
+        with self._lock:
+            self._epoch += 1
+            for table in self._versions:
+                self._versions[table] += 1
+
+    def snapshot(self, tables) -> tuple:
+        return (self._epoch, *(self._versions.get(table, 0) for table in tables))
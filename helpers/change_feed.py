@@ -0,0 +1,101 @@
+import asyncio
+import logging
+
+from helpers.async_db import AsyncDB
+from helpers.settings import Settings
+from services.task_changes import TaskChanges
+
+logger = logging.getLogger('task_manager.changes')
+
+# in-process fan-out of the task change feed: one poller per process reads the new rows of task_changes
+# (written by any worker) and pushes them to the queue of every subscribed stream. Nothing is polled
+# while there are no subscribers
+class ChangeFeed:
+
+    def __init__(self, pollInterval: float, queueSize: int, batchSize: int = 1000):
+        self.pollInterval = pollInterval
+        self.queueSize = queueSize
+        self.batchSize = batchSize
+        self.lastSeq = None  # last sequence number fanned out, None until the first poll with subscribers
+        self.subscribers = set()
+        self._task = None
+        self._stats = {'polls': 0, 'changes': 0, 'delivered': 0, 'dropped_subscribers': 0}
+
+    def subscribe(self) -> asyncio.Queue:
+        '''Queue receiving every change from now on, then None once the subscription is closed'''
+        queue = asyncio.Queue(self.queueSize + 1)  # one slot is kept for the closing None
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            self.lastSeq = None
+
+    def close(self, queue: asyncio.Queue):
+        '''End a subscription; the stream sees None after the changes already queued'''
+        self.subscribers.discard(queue)
+        queue.put_nowait(None)
+
+    def publish(self, changes: list[dict]):
+        '''Push changes to every subscriber. A subscriber too slow to keep up is closed,
+        its client reconnects with Last-Event-ID and catches up from the table'''
+        for queue in list(self.subscribers):
+            if queue.qsize() + len(changes) > self.queueSize:
+                self._stats['dropped_subscribers'] += 1
+                self.close(queue)
+                continue
+            for change in changes:
+                queue.put_nowait(change)
+            self._stats['delivered'] += len(changes)
+
+    async def poll(self) -> int:
+        '''Read and publish the changes after lastSeq, return how many there were'''
+        if self.lastSeq is None:
+            self.lastSeq = await AsyncDB.run(TaskChanges.latest)
+            return 0
+
+        changes = await AsyncDB.run(TaskChanges.since, self.lastSeq, self.batchSize)
+        self._stats['polls'] += 1
+        if changes and self.subscribers:
+            self.lastSeq = changes[-1]['seq']
+            self._stats['changes'] += len(changes)
+            self.publish(changes)
+        return len(changes)
+
+    async def _run(self):
+        while True:
+            count = 0
+            if self.subscribers:
+                try:
+                    count = await self.poll()
+                except Exception:
+                    logger.exception('Reading task changes failed, retrying on the next poll')
+            if count < self.batchSize:
+                # a full batch means more changes are waiting: read them right away
+                await asyncio.sleep(self.pollInterval)
+
+    def start(self):
+        '''Start the poller on the running event loop'''
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name='change_feed')
+
+    async def stop(self):
+        '''Stop the poller and close every subscription so open streams end'''
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.reset()
+
+    def reset(self):
+        '''Close every subscription and start over from the latest change, after the database was replaced'''
+        for queue in list(self.subscribers):
+            self.close(queue)
+        self.lastSeq = None
+
+    def stats(self) -> dict:
+        return {**self._stats, 'subscribers': len(self.subscribers), 'last_seq': self.lastSeq, 'running': self._task is not None}
+
+
+changeFeed = ChangeFeed(Settings.CHANGE_FEED_POLL_INTERVAL, Settings.CHANGE_FEED_QUEUE_SIZE)
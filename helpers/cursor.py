@@ -0,0 +1,48 @@
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+# opaque keyset pagination cursor: encodes the (sort_key, id) of the last row of a page
+class Cursor:
+
+    @staticmethod
+    def encode(sort: str, value, id: int) -> str:
+        '''Encode the position after the row with the given sort value and id'''
+        raw = json.dumps([sort, value, id], separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode(cursor: str, sort: str) -> tuple:
+        '''Decode a cursor into (sort value, id), the cursor must have been issued for the same sort'''
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            cursorSort, value, id = json.loads(base64.urlsafe_b64decode(padded))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor')
+
+        # the value is bound as a query parameter: only scalars sqlite can bind
+        if not isinstance(value, (str, int, float, type(None))):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor')
+
+        if cursorSort != sort or not isinstance(id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f'Cursor was not issued for sort "{sort}"')
+        return value, id
+
+    @classmethod
+    def next(cls, rows: list, sort: str, limit: int) -> str | None:
+        '''Cursor of the page following rows, or None when rows is the last page'''
+        if not rows or len(rows) < limit:
+            return None
+        last = rows[-1]
+        if isinstance(last, dict):
+            return cls.encode(sort, last[sort], last['id'])
+        # models and slotted records
+        return cls.encode(sort, getattr(last, sort), last.id)
+
+    @staticmethod
+    def where(column: str, idColumn: str = 'id') -> str:
+        '''WHERE condition selecting rows after the cursor (named params :cursor_value and :cursor_id)'''
+        if column == idColumn:
+            return f'{idColumn} > :cursor_id'
+        return f'({column}, {idColumn}) > (:cursor_value, :cursor_id)'
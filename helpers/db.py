@@ -1,35 +1,248 @@
+import glob
+import os
+import random
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from helpers.cache import EntityCache, TableVersions
+from helpers.pool import ConnectionPool
+from helpers.profiler import QueryProfiler
+from helpers.records import Records
+from helpers.settings import Settings
 
 # helper class to work with database
 class DB:
 
+    _pool: ConnectionPool | None = None
+    _poolLock = threading.Lock()
+
+    # writes of this process go one at a time, so they queue here instead of spinning in sqlite's busy handler;
+    # writers in other processes are serialised by sqlite's own lock, the busy timeout and retry()
+    _writeLock = threading.RLock()
+    _retries = 0
+
+    # read-through cache for the select_*_by_id lookups, invalidated by execute/executemany
+    cache = EntityCache(Settings.ENTITY_CACHE_SIZE, Settings.ENTITY_CACHE_TTL, Settings.ENTITY_CACHE_ENABLED)
+
+    # per-table write counters for the response cache, bumped by the same write paths
+    versions = TableVersions()
+
+    _WRITE_RE = re.compile(r'\s*(INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(\w+)', re.IGNORECASE)
+    _BY_ID_RE = re.compile(r'WHERE\s+id\s*=\s*\?\s*$', re.IGNORECASE)
+
     @classmethod
     def init(cls):
         '''Create database and all the necessary tables'''
         with open('migrations/base.sql') as f:
             sql = f.read()
-            sqlite3.connect(cls.dbFile(), isolation_level=None).executescript(sql)
+        with cls._writeLock, cls.connection() as conn:
+            cls.retry(conn.executescript, sql)
+        cls.migrate()
+
+    @classmethod
+    def migrate(cls):
+        '''Apply versioned migrations (migrations/NNN_name.sql) newer than the database user_version.
+        Each one runs in a BEGIN IMMEDIATE transaction and rechecks the version under the write lock,
+        so workers starting together apply every migration exactly once'''
+        with cls._writeLock, cls.connection() as conn:
+            for path in sorted(glob.glob('migrations/[0-9][0-9][0-9]_*.sql')):
+                number = int(os.path.basename(path)[:3])
+                if number <= conn.execute('PRAGMA user_version').fetchone()[0]:
+                    continue
+                with open(path) as f:
+                    sql = f.read()
+
+                cls.retry(conn.execute, 'BEGIN IMMEDIATE')
+                try:
+                    if number > conn.execute('PRAGMA user_version').fetchone()[0]:
+                        for statement in cls.statements(sql):
+                            conn.execute(statement)
+                        conn.execute(f'PRAGMA user_version = {number}')
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+
+    @staticmethod
+    def statements(script: str) -> list[str]:
+        '''Split a sql script into complete statements (trigger bodies and quoted semicolons stay intact)'''
+        statements, current = [], ''
+        for part in script.split(';'):
+            current += part + ';'
+            if sqlite3.complete_statement(current):
+                if current.strip(' \t\n;'):
+                    statements.append(current.strip())
+                current = ''
+        return statements
+
+    @classmethod
+    def retry(cls, func, *args, **kwargs):
+        '''Call func, retrying with exponential backoff and jitter while the database is locked by another process'''
+        for attempt in range(Settings.DB_WRITE_RETRIES + 1):
+            try:
+                return func(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                message = str(e)
+                if attempt == Settings.DB_WRITE_RETRIES or ('locked' not in message and 'busy' not in message):
+                    raise
+                cls._retries += 1
+                time.sleep(Settings.DB_RETRY_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5))
 
     @classmethod
     def dbFile(cls):
-        return 'task_manager.db'  # Changed to task_manager.db for task management system
+        return Settings.DB_FILE
+
+    @classmethod
+    def pool(cls) -> ConnectionPool:
+        '''Return the connection pool, creating it on first use'''
+        if cls._pool is None:
+            with cls._poolLock:
+                if cls._pool is None:
+                    cls._pool = ConnectionPool(
+                        cls.dbFile(),
+                        size=Settings.DB_POOL_SIZE,
+                        timeout=Settings.DB_POOL_TIMEOUT,
+                        pragmas={
+                            'journal_mode': Settings.DB_JOURNAL_MODE,
+                            'synchronous': Settings.DB_SYNCHRONOUS,
+                            'mmap_size': Settings.DB_MMAP_SIZE,
+                            'cache_size': Settings.DB_CACHE_SIZE,
+                            'busy_timeout': Settings.DB_BUSY_TIMEOUT,
+                        },
+                        cachedStatements=Settings.DB_STATEMENT_CACHE,
+                    )
+        return cls._pool
+
+    @classmethod
+    @contextmanager
+    def connection(cls):
+        '''Check out a pooled connection for the duration of the with block'''
+        with cls.pool().connection() as conn:
+            yield conn
+
+    @classmethod
+    def close(cls):
+        '''Close all pooled connections, a new pool is created on next use'''
+        cls.cache.clear()
+        cls.versions.bumpAll()
+        with cls._poolLock:
+            if cls._pool is not None:
+                cls._pool.close()
+                cls._pool = None
+
+    @classmethod
+    @contextmanager
+    def transaction(cls):
+        '''Run the with block in a single write transaction on a pooled connection, rolled back on error.
+        The write lock is taken up front (BEGIN IMMEDIATE) so the block never fails halfway on a busy database.
+        Statements run on the yielded connection bypass cache invalidation, call DB.invalidate for updates and deletes'''
+        with cls._writeLock, cls.connection() as conn:
+            cls.retry(conn.execute, 'BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    @classmethod
+    def stats(cls) -> dict:
+        '''Connection pool checkout/return metrics and the number of retried locked writes'''
+        return {**cls.pool().stats(), 'write_retries': cls._retries}
+
+    @classmethod
+    def writeTarget(cls, sql) -> tuple[str, str] | None:
+        '''Return (statement verb, table) of an INSERT/REPLACE/UPDATE/DELETE statement, None for anything else'''
+        match = cls._WRITE_RE.match(sql)
+        if match is None:
+            return None
+        return match.group(1).split()[0].upper(), match.group(2).lower()
+
+    @classmethod
+    def invalidate(cls, sql, params=()):
+        '''Drop the cached entities a write statement may have changed and bump the table version'''
+        target = cls.writeTarget(sql)
+        if target is None:
+            return
+
+        verb, table = target
+        cls.versions.bump(table)
+        if verb == 'DELETE':
+            # foreign key actions can change rows of other tables too
+            cls.cache.clear()
+            cls.versions.bumpAll()
+        elif verb == 'UPDATE' and cls._BY_ID_RE.search(sql) and isinstance(params, (tuple, list)) and params:
+            cls.cache.invalidate(table, params[-1])
+        elif verb != 'INSERT' or 'ON CONFLICT' in sql.upper():
+            cls.cache.invalidate(table)
     
     @classmethod
     def execute(cls, sql, params=()):
-        '''Execute the sql query and return lastrowid'''
-        with sqlite3.connect(cls.dbFile(), isolation_level=None) as conn:
-            crs = conn.cursor()
-            crs.execute(sql, params)
-            return crs.lastrowid
+        '''Execute the sql query and return lastrowid, a write is retried while the database is locked'''
+        try:
+            with cls._writeLock if cls.writeTarget(sql) else nullcontext(), cls.connection() as conn:
+                started = time.perf_counter()
+                crs = conn.cursor()
+                cls.retry(crs.execute, sql, params)
+                QueryProfiler.record(sql, params, time.perf_counter() - started, crs.rowcount)
+                return crs.lastrowid
+        finally:
+            cls.invalidate(sql, params)
+    
+    @classmethod
+    def executemany(cls, sql, seqOfParams) -> int:
+        '''Execute the sql query for every set of params in one transaction and return the number of affected rows'''
+        try:
+            with cls.transaction() as conn:
+                started = time.perf_counter()
+                rowcount = conn.executemany(sql, seqOfParams).rowcount
+                QueryProfiler.record(sql, (), time.perf_counter() - started, rowcount)
+                return rowcount
+        finally:
+            cls.invalidate(sql)
     
     @classmethod
-    def select(cls, sql, params=()) -> list:
-        '''Select and return associated rows as a list of dictionaries'''
-        with sqlite3.connect(cls.dbFile(), isolation_level=None) as conn:
-            conn.row_factory = sqlite3.Row
+    def select(cls, sql, params=(), records: bool = False) -> list:
+        '''Select and return associated rows as a list of dictionaries,
+        or of slotted record objects (see Records) with records=True'''
+        with cls.connection() as conn:
+            started = time.perf_counter()
+            crs = conn.cursor()
+            if records:
+                crs.execute(sql, params)
+                rows = Records.fromCursor(crs, crs.fetchall())
+            else:
+                crs.row_factory = sqlite3.Row
+                crs.execute(sql, params)
+                rows = [dict(row) for row in crs.fetchall()]
+            QueryProfiler.record(sql, params, time.perf_counter() - started, len(rows))
+            return rows
+
+    @classmethod
+    def iterate(cls, sql, params=(), size: int = 500, records: bool = False):
+        '''Yield rows as dictionaries (or records, see select), fetching size rows at a time so the result is never held in memory.
+        The pooled connection stays checked out until the generator is exhausted or closed'''
+        with cls.connection() as conn:
+            started, count = time.perf_counter(), 0
             crs = conn.cursor()
+            if not records:
+                crs.row_factory = sqlite3.Row
             crs.execute(sql, params)
-            return [dict(row) for row in crs.fetchall()] or []
+            try:
+                while rows := crs.fetchmany(size):
+                    count += len(rows)
+                    yield from Records.fromCursor(crs, rows) if records else map(dict, rows)
+            finally:
+                # includes the time the consumer spent between chunks
+                QueryProfiler.record(sql, params, time.perf_counter() - started, count)
+
+    @classmethod
+    def explain(cls, sql, params=()) -> list[str]:
+        '''Return the EXPLAIN QUERY PLAN details of the sql query'''
+        return [row['detail'] for row in cls.select('EXPLAIN QUERY PLAN ' + sql, params)]
 
     @classmethod
     def insert_user(cls, first_name: str, last_name: str, role: str, team_id: int | None = None):
@@ -85,29 +298,36 @@ class DB:
         """
         return cls.select(sql, (limit, offset))
     
+    @classmethod
+    def _selectById(cls, table: str, id: int) -> dict | None:
+        '''Read-through lookup of a row by id'''
+        row = cls.cache.get(table, id)
+        if row is not None:
+            return row
+
+        generation = cls.cache.generation(table)
+        result = cls.select(f'SELECT * FROM {table} WHERE id = ?', (id,))
+        if not result:
+            return None
+        cls.cache.put(table, id, result[0], generation)
+        return result[0]
+
     @classmethod
     def select_user_by_id(cls, user_id: int) -> dict | None:
         '''Select user by id from the database'''
-        sql = """
-            SELECT * FROM users WHERE id = ?
-        """
-        result = cls.select(sql, (user_id,))
-        return result[0] if result else None
+        return cls._selectById('users', user_id)
     
     @classmethod
     def select_team_by_id(cls, team_id: int) -> dict | None:
         '''Select team by id from the database'''
-        sql = """
-            SELECT * FROM teams WHERE id = ?
-        """
-        result = cls.select(sql, (team_id,))
-        return result[0] if result else None
+        return cls._selectById('teams', team_id)
     
     @classmethod
     def select_task_by_id(cls, task_id: int) -> dict | None:
         '''Select task by id from the database'''
-        sql = """
-            SELECT * FROM tasks WHERE id = ?
-        """
-        result = cls.select(sql, (task_id,))
-        return result[0] if result else None
+        return cls._selectById('tasks', task_id)
+
+    @classmethod
+    def select_project_by_id(cls, project_id: int) -> dict | None:
+        '''Select project by id from the database'''
+        return cls._selectById('projects', project_id)
@@ -0,0 +1,48 @@
+import csv
+import io
+
+from helpers.records import Records
+
+# encoders turning a stream of row dictionaries or records into chunks of an NDJSON or CSV document
+class Export:
+
+    FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+    @staticmethod
+    def ndjson(rows, chunkRows: int = 500):
+        '''Yield NDJSON bytes, one chunk per chunkRows rows'''
+        lines = []
+        for row in rows:
+            lines.append(Records.dumps(row))
+            if len(lines) >= chunkRows:
+                yield b'\n'.join(lines) + b'\n'
+                lines = []
+        if lines:
+            yield b'\n'.join(lines) + b'\n'
+
+    @staticmethod
+    def csv(rows, chunkRows: int = 500):
+        '''Yield CSV text with a header taken from the first row, one chunk per chunkRows rows'''
+        buffer = io.StringIO()
+        writer = None
+        for count, row in enumerate(rows, start=1):
+            if writer is None:
+                writer = csv.writer(buffer)
+                fields = list(row.keys()) if isinstance(row, dict) else Records.fields(row)
+                writer.writerow(fields)
+            writer.writerow(row.values() if isinstance(row, dict) else [getattr(row, field) for field in fields])
+            if count % chunkRows == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @classmethod
+    def encode(cls, rows, format: str):
+        '''Encode rows in the given format (ndjson or csv)'''
+        return cls.ndjson(rows) if format == 'ndjson' else cls.csv(rows)
+
+    @classmethod
+    def filename(cls, name: str, format: str) -> str:
+        return f'{name}.{"csv" if format == "csv" else "ndjson"}'
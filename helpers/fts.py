@@ -0,0 +1,25 @@
+import re
+
+# helpers for building sqlite FTS5 queries from user input
+class FTS:
+
+    @staticmethod
+    def match(text: str) -> str | None:
+        '''Turn free text into a safe FTS5 MATCH expression: every word must match, as a prefix'''
+        words = re.findall(r'\w+', text)
+        if not words:
+            return None
+        return ' '.join(f'"{word}"*' for word in words)
+
+    # task ids matching the query in the title/description or in any of their comments, best rank per task;
+    # title matches weigh more than description matches, bm25 is lower for better matches
+    TASKS_MATCH_SQL = '''
+        SELECT task_id, min(rank) AS rank FROM (
+            SELECT rowid AS task_id, bm25(tasks_fts, 10.0, 1.0) AS rank
+            FROM tasks_fts WHERE tasks_fts MATCH :q
+            UNION ALL
+            SELECT c.task_id, bm25(task_comments_fts) AS rank
+            FROM task_comments_fts JOIN task_comments c ON c.id = task_comments_fts.rowid
+            WHERE task_comments_fts MATCH :q
+        ) GROUP BY task_id
+    '''
@@ -0,0 +1,34 @@
+import importlib
+import threading
+
+# stand-in for a module attribute (usually a service class) that is imported on first use,
+# keeping heavy or optional dependencies (numpy, SQLAlchemy) out of application startup
+class LazyImport:
+
+    def __init__(self, module: str, name: str):
+        self._module = module
+        self._name = name
+        self._target = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        '''Import the module and return the attribute, raising ImportError when a dependency is missing'''
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = getattr(importlib.import_module(self._module), self._name)
+        return self._target
+
+    def available(self) -> bool:
+        '''Whether the attribute can be imported'''
+        try:
+            self.resolve()
+        except ImportError:
+            return False
+        return True
+
+    def __getattr__(self, attribute):
+        return getattr(self.resolve(), attribute)
+
+    def __repr__(self):
+        return f'<lazy {self._module}.{self._name}>'
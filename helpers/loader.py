@@ -0,0 +1,53 @@
+from helpers.db import DB
+
+# dataloader-style batching of related rows: collects the foreign keys referenced by a page of results
+# and resolves them with a single IN (...) query instead of one query per row
+class BatchLoader:
+
+    def __init__(self, table: str, chunk: int = 500):
+        self.table = table
+        self.chunk = chunk
+
+    @staticmethod
+    def _bucket(count: int) -> int:
+        '''Round the placeholder count up to a power of two so only a few statement shapes exist'''
+        size = 1
+        while size < count:
+            size *= 2
+        return size
+
+    def loadMany(self, ids) -> dict:
+        '''Return {id: row} for the given ids, reading through the entity cache and querying only the misses'''
+        rows, missing = {}, []
+        for id in dict.fromkeys(id for id in ids if id is not None):
+            row = DB.cache.get(self.table, id)
+            if row is not None:
+                rows[id] = row
+            else:
+                missing.append(id)
+
+        generation = DB.cache.generation(self.table)
+        for start in range(0, len(missing), self.chunk):
+            chunk = missing[start:start + self.chunk]
+            # pad with the last id, duplicates in IN (...) are harmless
+            padded = chunk + [chunk[-1]] * (self._bucket(len(chunk)) - len(chunk))
+            sql = f'SELECT * FROM {self.table} WHERE id IN ({", ".join("?" * len(padded))})'
+            for row in DB.select(sql, padded):
+                rows[row['id']] = row
+                DB.cache.put(self.table, row['id'], row, generation)
+        return rows
+
+    def attach(self, rows: list, foreignKey: str, field: str, fields: tuple | None = None) -> list:
+        '''Set field to the related row referenced by foreignKey (None when missing) on every row (dict or record).
+        With fields, the related rows are reduced to those keys'''
+        keys = [row[foreignKey] if isinstance(row, dict) else getattr(row, foreignKey) for row in rows]
+        related = self.loadMany(keys)
+        if fields is not None:
+            related = {id: {key: value.get(key) for key in fields} for id, value in related.items()}
+
+        for row, key in zip(rows, keys):
+            if isinstance(row, dict):
+                row[field] = related.get(key)
+            else:
+                setattr(row, field, related.get(key))
+        return rows
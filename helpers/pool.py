@@ -0,0 +1,106 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+# bounded pool of long-lived sqlite connections shared between threads
+class ConnectionPool:
+
+    def __init__(self, dbFile: str, size: int = 8, timeout: float = 30, pragmas: dict | None = None, cachedStatements: int = 128):
+        self.dbFile = dbFile
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = pragmas or {}
+        self.cachedStatements = cachedStatements
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {'created': 0, 'checkouts': 0, 'returns': 0, 'waits': 0, 'wait_time': 0.0, 'discarded': 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        '''Open a new connection and apply the configured pragmas'''
+        conn = sqlite3.connect(self.dbFile, isolation_level=None, check_same_thread=False, cached_statements=self.cachedStatements)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        '''Check out an idle connection, opening a new one while the pool is below its size'''
+        if self._closed:
+            raise RuntimeError('Connection pool is closed')
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if len(self._all) < self.size:
+                    conn = self._connect()
+                    self._all.append(conn)
+                    self._stats['created'] += 1
+
+            if conn is None:
+                started = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f'No database connection available after {self.timeout} seconds')
+                with self._lock:
+                    self._stats['waits'] += 1
+                    self._stats['wait_time'] += time.perf_counter() - started
+
+        with self._lock:
+            self._stats['checkouts'] += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        '''Return a connection to the pool, rolling back anything left open by the caller'''
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._lock:
+            self._stats['returns'] += 1
+            if self._closed:
+                self._discard(conn)
+            else:
+                self._idle.put(conn)
+
+    def _discard(self, conn: sqlite3.Connection):
+        '''Close a connection and forget about it (caller holds the lock)'''
+        if conn in self._all:
+            self._all.remove(conn)
+        self._stats['discarded'] += 1
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        '''Context manager wrapping acquire/release'''
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        '''Close idle connections now; checked out ones are closed when they are returned'''
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._discard(self._idle.get_nowait())
+                except queue.Empty:
+                    break
+
+    def stats(self) -> dict:
+        '''Checkout/return metrics and current pool occupancy'''
+        with self._lock:
+            return {
+                **self._stats,
+                'size': self.size,
+                'open': len(self._all),
+                'idle': self._idle.qsize(),
+                'in_use': len(self._all) - self._idle.qsize(),
+            }
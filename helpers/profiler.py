@@ -0,0 +1,89 @@
+import logging
+import re
+import threading
+from contextvars import ContextVar
+
+from helpers.settings import Settings
+
+logger = logging.getLogger('task_manager.sql')
+
+# records every statement run through DB:
+# per-request lists for Server-Timing, slow query logging and process-wide top-N normalised statements
+class QueryProfiler:
+
+    enabled = Settings.SQL_PROFILING_ENABLED
+    slowQueryMs = Settings.SLOW_QUERY_MS
+    maxStatements = 1000
+
+    _current: ContextVar[list | None] = ContextVar('queries', default=None)
+    _statements = {}  # normalised sql -> aggregated timings
+    _lock = threading.Lock()
+
+    _LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+    _IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+    _SPACE_RE = re.compile(r'\s+')
+
+    @classmethod
+    def normalize(cls, sql: str) -> str:
+        '''Collapse whitespace, literals and IN lists so statements differing only in values aggregate together'''
+        sql = cls._LITERAL_RE.sub('?', sql)
+        sql = cls._IN_LIST_RE.sub('IN (...)', sql)
+        return cls._SPACE_RE.sub(' ', sql).strip()
+
+    @staticmethod
+    def shape(params) -> str:
+        '''Parameter shape without the values: named parameter keys or the positional count'''
+        if isinstance(params, dict):
+            return '{' + ','.join(sorted(params)) + '}'
+        try:
+            return f'({len(params)})'
+        except TypeError:
+            return '(?)'
+
+    @classmethod
+    def begin(cls) -> tuple:
+        '''Start collecting the queries of the current request, returns (token, query list)'''
+        queries = []
+        return cls._current.set(queries), queries
+
+    @classmethod
+    def end(cls, token):
+        cls._current.reset(token)
+
+    @classmethod
+    def record(cls, sql: str, params, seconds: float, rows: int | None):
+        '''Record a finished statement'''
+        if not cls.enabled:
+            return
+
+        ms = seconds * 1000
+        normalized = cls.normalize(sql)
+        queries = cls._current.get()
+        if queries is not None:
+            queries.append({'sql': normalized, 'params': cls.shape(params), 'ms': ms, 'rows': rows})
+
+        if ms >= cls.slowQueryMs:
+            logger.warning('slow query %.1f ms, %s rows, params %s: %s', ms, rows, cls.shape(params), normalized)
+
+        with cls._lock:
+            stats = cls._statements.get(normalized)
+            if stats is None:
+                if len(cls._statements) >= cls.maxStatements:
+                    return
+                stats = cls._statements[normalized] = {'sql': normalized, 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0}
+            stats['calls'] += 1
+            stats['total_ms'] += ms
+            stats['max_ms'] = max(stats['max_ms'], ms)
+            stats['rows'] += rows or 0
+
+    @classmethod
+    def top(cls, n: int = 20, order: str = 'total_ms') -> list:
+        '''Top n normalised statements ordered by total_ms, mean_ms, max_ms or calls'''
+        with cls._lock:
+            items = [{**stats, 'mean_ms': stats['total_ms'] / stats['calls']} for stats in cls._statements.values()]
+        return sorted(items, key=lambda stats: stats[order], reverse=True)[:n]
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._statements.clear()
@@ -0,0 +1,70 @@
+import threading
+
+# builds canonical, fully parameterised SELECT statements from a set of optional filters.
+# The statement text depends only on which filters are present (the filter shape), never on their values,
+# so it is built once per shape and sqlite's per-connection statement cache can reuse the prepared statement
+class QueryBuilder:
+
+    def __init__(self, select: str, filters: dict, orderBy: str | None = None):
+        '''filters maps a filter name to its WHERE condition using :name,
+        or to a (condition, transform) pair where transform(value) gives the bound parameter'''
+        self.select = select.strip()
+        self.filters = {name: spec if isinstance(spec, tuple) else (spec, None) for name, spec in filters.items()}
+        self.orderBy = orderBy
+        self._statements = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def statement(self, active: tuple, extra: tuple = (), orderBy: str | None = None, paginate: bool = True, select: str | None = None) -> str:
+        '''SQL text for a filter shape, memoised'''
+        key = (active, extra, orderBy, paginate, select)
+        sql = self._statements.get(key)
+        if sql is not None:
+            self.hits += 1
+            return sql
+
+        where = [self.filters[name][0] for name in active] + list(extra)
+        sql = select or self.select
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        if orderBy:
+            sql += ' ORDER BY ' + orderBy
+        if paginate:
+            sql += ' LIMIT :limit OFFSET :offset'
+
+        with self._lock:
+            self.misses += 1
+            self._statements[key] = sql
+        return sql
+
+    def build(
+                self,
+                values: dict,
+                extra: tuple = (),
+                extraParams: dict | None = None,
+                orderBy: str | None = None,
+                select: str | None = None,
+                limit: int | None = None,
+                offset: int = 0
+            ) -> tuple[str, dict]:
+        '''Return (sql, named params) for the filters in values that are not None.
+        extra adds WHERE conditions bound through extraParams; limit None means no LIMIT/OFFSET'''
+        active = tuple(name for name in self.filters if values.get(name) is not None)
+        sql = self.statement(active, tuple(extra), orderBy or self.orderBy, limit is not None, select)
+
+        params = {}
+        for name in active:
+            transform = self.filters[name][1]
+            params[name] = transform(values[name]) if transform else values[name]
+        params.update(extraParams or {})
+        if limit is not None:
+            params['limit'], params['offset'] = limit, offset
+        return sql, params
+
+    def stats(self) -> dict:
+        return {'shapes': len(self._statements), 'hits': self.hits, 'misses': self.misses}
+
+
+def like(value: str) -> str:
+    '''Bind value as a substring LIKE pattern'''
+    return f'%{value}%'
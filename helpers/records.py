@@ -0,0 +1,48 @@
+import dataclasses
+import threading
+from itertools import starmap
+
+import orjson
+
+# compact row objects for large result sets: one slotted dataclass per result shape (tuple of column names),
+# built from the cursor's plain tuples, so a row costs one small object instead of a sqlite3.Row plus a dict.
+# orjson serialises dataclasses natively, records go to JSON without an intermediate dict or model
+class Records:
+
+    _types = {}  # column names -> record type
+    _lock = threading.Lock()
+
+    @classmethod
+    def type(cls, columns: tuple[str, ...]) -> type:
+        '''Record type of a result shape, created once per distinct tuple of column names'''
+        recordType = cls._types.get(columns)
+        if recordType is None:
+            with cls._lock:
+                recordType = cls._types.get(columns)
+                if recordType is None:
+                    try:
+                        recordType = dataclasses.make_dataclass('Record', columns, slots=True, eq=False)
+                    except TypeError as e:
+                        raise ValueError(f'Result columns {columns} cannot be record fields, alias them: {e}')
+                    cls._types[columns] = recordType
+        return recordType
+
+    @classmethod
+    def fromCursor(cls, crs, rows: list[tuple]) -> list:
+        '''Records of the tuple rows fetched from crs'''
+        recordType = cls.type(tuple(column[0] for column in crs.description))
+        return list(starmap(recordType, rows))
+
+    @staticmethod
+    def fields(record) -> tuple[str, ...]:
+        return record.__slots__
+
+    @staticmethod
+    def asdict(record) -> dict:
+        '''Shallow dict of a record (dataclasses.asdict deep-copies values)'''
+        return {field: getattr(record, field) for field in record.__slots__}
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        '''JSON bytes of records, lists of records or anything else orjson handles'''
+        return orjson.dumps(value, default=str)
@@ -0,0 +1,115 @@
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from helpers.async_db import AsyncDB
+from helpers.db import DB
+from helpers.records import Records
+from helpers.responses import FastJSONResponse
+from helpers.settings import Settings
+
+# cache of serialized search responses keyed on path + normalised query params.
+# The ETag is derived from the key and the versions of the tables the response reads,
+# so a matching If-None-Match is answered with 304 without touching the database or the serializer
+class ResponseCache:
+
+    def __init__(self, maxsize: int = 1000, enabled: bool = True, fastJson: bool = False):
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.fastJson = fastJson
+        self._items = OrderedDict()  # key -> (etag, body, headers)
+        self._adapters = {}
+        self._lock = threading.Lock()
+        self._stats = {'not_modified': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+        # versions restart from zero with the process, keep ETags from a previous process from matching
+        self._boot = secrets.token_hex(8)
+
+    @staticmethod
+    def key(request: Request) -> tuple:
+        '''Path plus query params in a canonical order'''
+        return request.url.path, tuple(sorted(request.query_params.multi_items()))
+
+    def etag(self, key: tuple, versions: tuple) -> str:
+        digest = hashlib.sha1(repr((self._boot, key, versions)).encode()).hexdigest()
+        return f'"{digest}"'
+
+    @staticmethod
+    def matches(request: Request, etag: str) -> bool:
+        '''Whether the If-None-Match header lists the ETag'''
+        header = request.headers.get('if-none-match')
+        if not header:
+            return False
+        tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+        return etag in tags or '*' in tags
+
+    def adapter(self, model) -> TypeAdapter:
+        if model not in self._adapters:
+            self._adapters[model] = TypeAdapter(model)
+        return self._adapters[model]
+
+    def render(self, result, model, raw: bool) -> bytes:
+        '''JSON body of a load result: raw results are trusted rows dumped with orjson, others are validated as model'''
+        if raw:
+            return Records.dumps(result)
+        adapter = self.adapter(model)
+        return adapter.dump_json(adapter.validate_python(result))
+
+    async def respond(self, request: Request, tables: tuple, load, model, headers=None, rawLoad=None) -> Response:
+        '''Answer from the cache when the tables have not changed, else run load() on the database
+        executor, serialize its result as model and cache it. headers(result) adds response headers.
+        With fastJson enabled, rawLoad() (returning rows already in the shape of model) is run and dumped instead'''
+        raw = self.fastJson and rawLoad is not None
+        if raw:
+            load = rawLoad
+
+        if not self.enabled:
+            result = await AsyncDB.run(load)
+            if raw:
+                return FastJSONResponse(result, headers=headers(result) if headers else None)
+            return Response(self.render(result, model, raw), media_type='application/json',
+                            headers=headers(result) if headers else None)
+
+        key = self.key(request)
+        versions = DB.versions.snapshot(tables)
+        etag = self.etag(key, versions)
+
+        if self.matches(request, etag):
+            with self._lock:
+                self._stats['not_modified'] += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] == etag:
+                self._items.move_to_end(key)
+                self._stats['hits'] += 1
+                return Response(item[1], media_type='application/json', headers=item[2])
+            self._stats['misses'] += 1
+
+        result = await AsyncDB.run(load)
+        body = self.render(result, model, raw)
+        responseHeaders = {'ETag': etag, 'Cache-Control': 'no-cache', **(headers(result) if headers else {})}
+
+        # a write during the load may or may not be in the result, only cache when none happened
+        if DB.versions.snapshot(tables) == versions:
+            with self._lock:
+                self._items[key] = (etag, body, responseHeaders)
+                self._items.move_to_end(key)
+                while len(self._items) > self.maxsize:
+                    self._items.popitem(last=False)
+                    self._stats['evictions'] += 1
+        else:
+            del responseHeaders['ETag']
+
+        return Response(body, media_type='application/json', headers=responseHeaders)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'enabled': self.enabled, 'fast_json': self.fastJson, 'size': len(self._items), 'maxsize': self.maxsize}
+
+
+responseCache = ResponseCache(Settings.RESPONSE_CACHE_SIZE, Settings.RESPONSE_CACHE_ENABLED, Settings.FAST_JSON_ENABLED)
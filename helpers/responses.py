@@ -0,0 +1,10 @@
+from fastapi.responses import JSONResponse
+
+from helpers.records import Records
+
+# JSON response rendered with orjson: accepts dicts, lists and slotted records (see Records).
+# Returning it from a route bypasses the route's response_model, so only use it for data that is already in output shape
+class FastJSONResponse(JSONResponse):
+
+    def render(self, content) -> bytes:
+        return Records.dumps(content)
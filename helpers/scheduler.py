@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import random
+import time
+
+from helpers.async_db import AsyncDB
+
+logger = logging.getLogger('task_manager.scheduler')
+
+# a periodic job and its run metrics
+class Job:
+
+    def __init__(self, name: str, func, interval: float, jitter: float = 0.1):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter  # fraction of the interval each wait is randomly shortened or lengthened by
+        self.running = False
+        self.nextRun = None
+        self.metrics = {'runs': 0, 'failures': 0, 'skipped': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                        'last_ms': None, 'last_started': None, 'last_result': None, 'last_error': None}
+
+    def delay(self) -> float:
+        '''Seconds until the next run; jitter keeps workers and jobs from firing in lockstep'''
+        return max(0.0, self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    async def run(self) -> bool:
+        '''Run the job once on the database executor; returns False, without running, when a run is in progress'''
+        if self.running:
+            self.metrics['skipped'] += 1
+            return False
+
+        self.running = True
+        self.metrics['last_started'] = time.time()
+        started = time.perf_counter()
+        try:
+            self.metrics['last_result'] = await AsyncDB.run(self.func)
+            self.metrics['last_error'] = None
+        except Exception as e:
+            self.metrics['failures'] += 1
+            self.metrics['last_error'] = f'{type(e).__name__}: {e}'
+            logger.exception('Job %s failed', self.name)
+        finally:
+            self.running = False
+            ms = (time.perf_counter() - started) * 1000
+            self.metrics['runs'] += 1
+            self.metrics['total_ms'] += ms
+            self.metrics['max_ms'] = max(self.metrics['max_ms'], ms)
+            self.metrics['last_ms'] = ms
+        return True
+
+    def stats(self) -> dict:
+        return {
+            **self.metrics,
+            'interval': self.interval,
+            'running': self.running,
+            'mean_ms': self.metrics['total_ms'] / self.metrics['runs'] if self.metrics['runs'] else None,
+            'next_run_in': round(self.nextRun - time.monotonic(), 3) if self.nextRun is not None else None,
+        }
+
+
+# in-process scheduler of periodic jobs, started and stopped by the app lifespan.
+# Each job has its own loop that waits, runs the job to completion and only then waits again,
+# so a job never overlaps with itself (a manual run during a scheduled one is skipped)
+class Scheduler:
+
+    def __init__(self):
+        self.jobs = {}
+        self._tasks = []
+
+    def add(self, name: str, func, interval: float, jitter: float = 0.1) -> Job:
+        '''Register func (a blocking callable) to run every interval seconds'''
+        job = self.jobs[name] = Job(name, func, interval, jitter)
+        return job
+
+    async def _loop(self, job: Job):
+        while True:
+            delay = job.delay()
+            job.nextRun = time.monotonic() + delay
+            await asyncio.sleep(delay)
+            await job.run()
+
+    def start(self):
+        '''Start the job loops on the running event loop'''
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [loop.create_task(self._loop(job), name=f'job:{job.name}') for job in self.jobs.values()]
+
+    async def stop(self):
+        '''Cancel the job loops; a job already running on the database executor completes before AsyncDB.close() returns'''
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.nextRun = None
+
+    async def run(self, name: str) -> bool:
+        '''Run a job now, outside its schedule'''
+        return await self.jobs[name].run()
+
+    def stats(self) -> dict:
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+
+scheduler = Scheduler()
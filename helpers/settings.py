@@ -0,0 +1,88 @@
+import os
+
+# deployment settings, read once from environment variables at startup
+class Settings:
+
+    # sqlite database file
+    DB_FILE = os.getenv('TASK_MANAGER_DB_FILE', 'task_manager.db')
+
+    # number of server processes sharing the database file (uvicorn --workers), the in-process caches
+    # only see their own process's writes and are off by default when there is more than one
+    WORKERS = int(os.getenv('TASK_MANAGER_WORKERS', 1))
+
+    # connection pool
+    DB_POOL_SIZE = int(os.getenv('TASK_MANAGER_DB_POOL_SIZE', 8))
+    DB_POOL_TIMEOUT = float(os.getenv('TASK_MANAGER_DB_POOL_TIMEOUT', 30))
+
+    # pragmas applied to every new connection
+    DB_JOURNAL_MODE = os.getenv('TASK_MANAGER_DB_JOURNAL_MODE', 'WAL')
+    DB_SYNCHRONOUS = os.getenv('TASK_MANAGER_DB_SYNCHRONOUS', 'NORMAL')
+    DB_MMAP_SIZE = int(os.getenv('TASK_MANAGER_DB_MMAP_SIZE', 256 * 1024 * 1024))
+    DB_CACHE_SIZE = int(os.getenv('TASK_MANAGER_DB_CACHE_SIZE', -64000))  # negative value is in KiB
+    DB_BUSY_TIMEOUT = int(os.getenv('TASK_MANAGER_DB_BUSY_TIMEOUT', 5000))  # milliseconds
+
+    # writes still failing with "database is locked" after the busy timeout are retried with exponential backoff
+    DB_WRITE_RETRIES = int(os.getenv('TASK_MANAGER_DB_WRITE_RETRIES', 5))
+    DB_RETRY_BACKOFF = float(os.getenv('TASK_MANAGER_DB_RETRY_BACKOFF', 0.05))  # seconds, doubled per attempt
+
+    # prepared statements kept per connection (sqlite3 default is 128)
+    DB_STATEMENT_CACHE = int(os.getenv('TASK_MANAGER_DB_STATEMENT_CACHE', 1024))
+
+    # bulk imports: rows inserted per transaction
+    BULK_BATCH_SIZE = int(os.getenv('TASK_MANAGER_BULK_BATCH_SIZE', 1000))
+
+    # read-through cache of users, teams and tasks by id
+    ENTITY_CACHE_ENABLED = os.getenv('TASK_MANAGER_ENTITY_CACHE', '1' if WORKERS == 1 else '0') not in ('0', 'false', 'no', 'off')
+    ENTITY_CACHE_SIZE = int(os.getenv('TASK_MANAGER_ENTITY_CACHE_SIZE', 10000))
+    ENTITY_CACHE_TTL = float(os.getenv('TASK_MANAGER_ENTITY_CACHE_TTL', 60))  # seconds
+
+    # ETag response cache of the search endpoints
+    RESPONSE_CACHE_ENABLED = os.getenv('TASK_MANAGER_RESPONSE_CACHE', '1' if WORKERS == 1 else '0') not in ('0', 'false', 'no', 'off')
+    RESPONSE_CACHE_SIZE = int(os.getenv('TASK_MANAGER_RESPONSE_CACHE_SIZE', 1000))
+
+    # search endpoints serialise database rows straight to JSON with orjson, skipping pydantic validation
+    FAST_JSON_ENABLED = os.getenv('TASK_MANAGER_FAST_JSON', '0') not in ('0', 'false', 'no', 'off')
+
+    # per-request SQL profiling
+    SQL_PROFILING_ENABLED = os.getenv('TASK_MANAGER_SQL_PROFILING', '1') not in ('0', 'false', 'no', 'off')
+    SLOW_QUERY_MS = float(os.getenv('TASK_MANAGER_SLOW_QUERY_MS', 100))
+
+    # task_records audit writer: events per insert batch, seconds between flushes,
+    # and the queue length at which writers flush themselves instead of waiting for the background task
+    AUDIT_BATCH_SIZE = int(os.getenv('TASK_MANAGER_AUDIT_BATCH_SIZE', 500))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv('TASK_MANAGER_AUDIT_FLUSH_INTERVAL', 0.5))
+    AUDIT_MAX_PENDING = int(os.getenv('TASK_MANAGER_AUDIT_MAX_PENDING', 10000))
+
+    # seconds the reporting endpoints may serve an analytics snapshot before refreshing it
+    ANALYTICS_REFRESH_INTERVAL = float(os.getenv('TASK_MANAGER_ANALYTICS_REFRESH_INTERVAL', 30))
+
+    # admission control: per-client token buckets (requests per second and burst), write concurrency
+    # and the number of writes allowed to wait for a slot (for up to WRITE_QUEUE_TIMEOUT seconds)
+    ADMISSION_ENABLED = os.getenv('TASK_MANAGER_ADMISSION', '1') not in ('0', 'false', 'no', 'off')
+    RATE_LIMIT_READS = float(os.getenv('TASK_MANAGER_RATE_LIMIT_READS', 50))
+    RATE_LIMIT_READ_BURST = float(os.getenv('TASK_MANAGER_RATE_LIMIT_READ_BURST', 100))
+    RATE_LIMIT_WRITES = float(os.getenv('TASK_MANAGER_RATE_LIMIT_WRITES', 10))
+    RATE_LIMIT_WRITE_BURST = float(os.getenv('TASK_MANAGER_RATE_LIMIT_WRITE_BURST', 20))
+    WRITE_CONCURRENCY = int(os.getenv('TASK_MANAGER_WRITE_CONCURRENCY', 4))
+    WRITE_QUEUE_SIZE = int(os.getenv('TASK_MANAGER_WRITE_QUEUE_SIZE', 32))
+    WRITE_QUEUE_TIMEOUT = float(os.getenv('TASK_MANAGER_WRITE_QUEUE_TIMEOUT', 2))
+
+    # largest page the search endpoints return
+    MAX_PAGE_SIZE = int(os.getenv('TASK_MANAGER_MAX_PAGE_SIZE', 1000))
+
+    # background jobs: seconds between runs of the overdue sweep and of the reminder dispatch,
+    # random jitter as a fraction of the interval, days ahead a task counts as due soon and rows per chunk
+    SCHEDULER_ENABLED = os.getenv('TASK_MANAGER_SCHEDULER', '1') not in ('0', 'false', 'no', 'off')
+    OVERDUE_SWEEP_INTERVAL = float(os.getenv('TASK_MANAGER_OVERDUE_SWEEP_INTERVAL', 300))
+    REMINDER_DISPATCH_INTERVAL = float(os.getenv('TASK_MANAGER_REMINDER_DISPATCH_INTERVAL', 60))
+    SCHEDULER_JITTER = float(os.getenv('TASK_MANAGER_SCHEDULER_JITTER', 0.1))
+    REMINDER_DUE_SOON_DAYS = int(os.getenv('TASK_MANAGER_REMINDER_DUE_SOON_DAYS', 1))
+    REMINDER_CHUNK_SIZE = int(os.getenv('TASK_MANAGER_REMINDER_CHUNK_SIZE', 500))
+
+    # task change feed: seconds between polls of task_changes while streams are open, changes a stream may
+    # have queued before it is closed as too slow, seconds between keep-alive comments, and days changes are kept
+    CHANGE_FEED_POLL_INTERVAL = float(os.getenv('TASK_MANAGER_CHANGE_FEED_POLL_INTERVAL', 0.5))
+    CHANGE_FEED_QUEUE_SIZE = int(os.getenv('TASK_MANAGER_CHANGE_FEED_QUEUE_SIZE', 1000))
+    CHANGE_FEED_HEARTBEAT = float(os.getenv('TASK_MANAGER_CHANGE_FEED_HEARTBEAT', 15))
+    CHANGE_RETENTION_DAYS = int(os.getenv('TASK_MANAGER_CHANGE_RETENTION_DAYS', 7))
+    CHANGE_PRUNE_INTERVAL = float(os.getenv('TASK_MANAGER_CHANGE_PRUNE_INTERVAL', 3600))
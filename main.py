@@ -1,31 +1,71 @@
+import asyncio
+import logging
 import os
-from fastapi import FastAPI, HTTPException, status, Query, Request, APIRouter
-from fastapi.responses import JSONResponse, RedirectResponse
+import time
+from fastapi import FastAPI, HTTPException, status, Query, Request, Response, APIRouter
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from contextlib import asynccontextmanager
 
 # Database initialization
 from helpers.db import DB
-
-from models.manager import Manager
-
-# Import services
+from helpers.async_db import AsyncDB
+from helpers.cursor import Cursor
+from helpers.bulk import BulkImport
+from helpers.export import Export
+from helpers.response_cache import responseCache
+from helpers.profiler import QueryProfiler
+from helpers.audit import AuditLog
+from helpers.lazy import LazyImport
+from helpers.admission import Admission
+from helpers.scheduler import scheduler
+from helpers.change_feed import changeFeed
+from helpers.settings import Settings
+
+# Import services; numpy (reports) and SQLAlchemy (managers) are imported on first use, not at startup
 from services.users import Users
-from services.managers import Managers
 from services.tasks import Tasks
+from services.task_records import TaskRecords
+from services.stats import TaskStats
+from services.projects import Projects
+from services.reminders import Reminders
+from services.task_changes import TaskChanges
+Managers = LazyImport("services.managers", "Managers")
+Reports = LazyImport("services.reports", "Reports")
+taskSnapshot = LazyImport("helpers.analytics", "taskSnapshot")
 
 # Import schemas
-from schemas.user_input_output import *
-from schemas.team_input_output import *
-from schemas.manager_input_output import *
-from schemas.task_input_output import *
+from schemas.user_input_output import UserInputAdd, UserInputUpdate, UserOutputSearch
+from schemas.task_input_output import TaskInputAdd, TaskInputUpdate, TaskInputMove, TaskInputBulkUpdate, TaskBulkUpdateOutput, TaskOutputSearch, TaskOutputSubtask, TaskStatus, TaskPriority, TaskStatsOutput, TaskChangeOutput, TaskChangesOutput
+from schemas.task_record_input_output import TaskRecordOutput
+from schemas.project_input_output import ProjectInputAdd, ProjectInputMove, ProjectOutputNode
+from schemas.report_input_output import ThroughputOutput, LeadTimeOutput, WorkloadOutput
+from datetime import date, datetime
+
+logger = logging.getLogger("task_manager")
 
 
 # ========================= LIFESPAN EVENT =========================
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    """Initialize database when the app starts."""
+    """Initialize database and start the task history writer, the scheduled jobs and the change feed when the app starts,
+    close the change streams, stop the jobs, write pending history and release connections on shutdown."""
     DB.init()
+    AuditLog.start()
+    if Settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    changeFeed.start()
     yield
+    await changeFeed.stop()
+    await scheduler.stop()
+    await AuditLog.stop()
+    AsyncDB.close()
+    DB.close()
+
+
+# ========================= SCHEDULED JOBS =========================
+scheduler.add("overdue_sweep", Reminders.sweep, Settings.OVERDUE_SWEEP_INTERVAL, Settings.SCHEDULER_JITTER)
+scheduler.add("reminder_dispatch", Reminders.dispatch, Settings.REMINDER_DISPATCH_INTERVAL, Settings.SCHEDULER_JITTER)
+scheduler.add("change_prune", TaskChanges.prune, Settings.CHANGE_PRUNE_INTERVAL, Settings.SCHEDULER_JITTER)
 
 
 # ========================= APP INITIALIZATION =========================
@@ -46,81 +86,217 @@ async def global_exception_handler(request: Request, e: Exception):
     )
 
 
+# ========================= SQL PROFILING MIDDLEWARE =========================
+@app.middleware("http")
+async def profile_queries(request: Request, call_next):
+    """Collect the SQL statements run for the request and report them in a Server-Timing header."""
+    if not QueryProfiler.enabled:
+        return await call_next(request)
+
+    token, queries = QueryProfiler.begin()
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        QueryProfiler.end(token)
+
+    total_ms = (time.perf_counter() - started) * 1000
+    db_ms = sum(query["ms"] for query in queries)
+    response.headers["Server-Timing"] = f'db;dur={db_ms:.2f};desc="{len(queries)} queries", total;dur={total_ms:.2f}'
+    return response
+
+
+# ========================= ADMISSION CONTROL MIDDLEWARE =========================
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Shed load before it reaches the database: per-client rate limits (429) and bounded write concurrency (503)."""
+    return await Admission.handle(request, call_next)
+
+
 # ========================= ROOT PATH REDIRECT =========================
 @app.get("/", response_class=RedirectResponse, include_in_schema=False)
 async def root():
     return "/docs"
 
 
+# ========================= PAGINATION =========================
+CURSOR_DESCRIPTION = "Cursor from the X-Next-Cursor header of the previous page; takes precedence over offset."
+Q_DESCRIPTION = "Full-text query; results are ordered by relevance and paginated by offset."
+PROJECT_TREE_DESCRIPTION = "Tasks of this project and of all its sub-projects."
+
+
+def next_cursor_headers(rows: list, sort: str, limit: int) -> dict:
+    """X-Next-Cursor header carrying the keyset cursor of the next page, if there may be one."""
+    next_cursor = Cursor.next(rows, sort, limit)
+    return {"X-Next-Cursor": next_cursor} if next_cursor is not None else {}
+
+
+# ========================= EXPORT =========================
+def export_response(chunks, name: str, format: str) -> StreamingResponse:
+    """Stream export chunks as a file download; rows are read from the database while the response is sent."""
+    return StreamingResponse(
+        chunks,
+        media_type=Export.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{Export.filename(name, format)}"'},
+    )
+
+
+# ========================= CHANGE FEED =========================
+SINCE_DESCRIPTION = "Sequence number of the last change already seen; 0 reads the feed from the start."
+
+
+def sse_event(event: str, data: str, id: int | None = None) -> str:
+    """One server-sent event."""
+    return (f"id: {id}\n" if id is not None else "") + f"event: {event}\ndata: {data}\n\n"
+
+
+async def change_stream(since: int):
+    """Server-sent events of the task changes after since: the backlog is read from task_changes,
+    then new changes arrive from the in-process fan-out. Sequence numbers have no gaps, so a change
+    missing from the fan-out (the stream subscribed before the poller caught up) is read from the table."""
+    queue = changeFeed.subscribe()
+    try:
+        yield f"retry: {int(Settings.CHANGE_FEED_POLL_INTERVAL * 1000) + 1000}\n\n"
+        while True:
+            # backlog: the changes after since still in the table
+            while True:
+                page = await AsyncDB.run(TaskChanges.feed, since, changeFeed.batchSize)
+                if page.resync:
+                    yield sse_event("resync", page.model_dump_json(include={"last_seq"}), page.last_seq)
+                for change in page.changes:
+                    yield sse_event("change", change.model_dump_json(), change.seq)
+                since = page.last_seq
+                if len(page.changes) < changeFeed.batchSize:
+                    break
+
+            # live: the changes fanned out by the poller
+            while True:
+                try:
+                    change = await asyncio.wait_for(queue.get(), Settings.CHANGE_FEED_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if change is None:
+                    return  # closed: too slow to keep up, or the server is shutting down
+                if change["seq"] <= since:
+                    continue  # already sent from the backlog
+                if change["seq"] > since + 1:
+                    break  # a gap: read it from the table
+                yield sse_event("change", TaskChangeOutput(**change).model_dump_json(), change["seq"])
+                since = change["seq"]
+    finally:
+        changeFeed.unsubscribe(queue)
+
+
 # ========================= ROUTERS =========================
 def create_user_routes():
     router = APIRouter(prefix="/users", tags=["Users"])
 
     @router.post("/add")
     async def add_user(userData: UserInputAdd):
-        return {"id": Users.addUser(userData)}
+        return {"id": await AsyncDB.run(Users.addUser, userData)}
+
+    @router.post("/bulk")
+    async def add_users_bulk(request: Request):
+        """Import users posted as a JSON array or an NDJSON stream; invalid rows are reported, not fatal."""
+        return await BulkImport.run(request, UserInputAdd, Users.addUsersBulk)
 
     @router.put("/update/{id}")
     async def update_user(id: int, userData: UserInputUpdate):
-        return Users.updateUser(id, userData)
+        return await AsyncDB.run(Users.updateUser, id, userData)
 
-    @router.get("/search")
+    @router.get("/search", response_model=list[UserOutputSearch])
     async def search_users(
+        request: Request,
         id: int | None = Query(None, ge=0),
         name: str | None = Query(None, max_length=50),
+        q: str | None = Query(None, max_length=200, description=Q_DESCRIPTION),
         role: str | None = None,
-        limit: int = Query(10, gt=0),
+        cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+        limit: int = Query(10, gt=0, le=Settings.MAX_PAGE_SIZE),
         offset: int = Query(0, ge=0),
-    ) -> list[UserOutputSearch]:
-        return Users.searchUsers(**locals())
+    ):
+        return await responseCache.respond(
+            request,
+            ("users",),
+            lambda: Users.searchUsers(id=id, name=name, q=q, role=role, cursor=cursor, limit=limit, offset=offset),
+            list[UserOutputSearch],
+            # full-text results are paginated by offset, a cursor would be rejected
+            lambda users: next_cursor_headers(users, "id", limit) if q is None else {},
+            rawLoad=lambda: Users.searchUsers(
+                id=id, name=name, q=q, role=role, cursor=cursor, limit=limit, offset=offset, records=True
+            ),
+        )
 
     return router
 
 
 def create_team_routes():
+    from schemas.team_input_output import TeamInputAdd, TeamInputUpdate, TeamOutputSearch
+
     router = APIRouter(prefix="/teams", tags=["Teams"])
 
     @router.post("/add")
     async def add_team(teamData: TeamInputAdd):
-        return {"id": Users.addTeam(teamData)}
+        return {"id": await AsyncDB.run(Users.addTeam, teamData)}
 
     @router.put("/update/{id}")
     async def update_team(id: int, teamData: TeamInputUpdate):
-        return Users.updateTeam(id, teamData)
+        return await AsyncDB.run(Users.updateTeam, id, teamData)
 
-    @router.get("/search")
+    @router.get("/search", response_model=list[TeamOutputSearch])
     async def search_teams(
+        request: Request,
         id: int | None = Query(None, ge=0),
         code: str | None = Query(None, max_length=50),
         leader: str | None = Query(None, max_length=50),
-        limit: int = Query(10, gt=0),
+        cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+        limit: int = Query(10, gt=0, le=Settings.MAX_PAGE_SIZE),
         offset: int = Query(0, ge=0),
-    ) -> list[TeamOutputSearch]:
-        return Users.searchTeams(**locals())
+    ):
+        return await responseCache.respond(
+            request,
+            ("teams", "users"),
+            lambda: Users.searchTeams(id=id, code=code, leader=leader, cursor=cursor, limit=limit, offset=offset),
+            list[TeamOutputSearch],
+            lambda teams: next_cursor_headers(teams, "id", limit),
+        )
 
     return router
 
 
 def create_manager_routes():
+    from schemas.manager_input_output import ManagerInputAdd, ManagerInputUpdate, ManagerOutputSearch
+
+    # the manager service needs SQLAlchemy, leave the routes out when it cannot be imported
+    if not Managers.available():
+        raise ImportError("services.managers cannot be imported")
+
     router = APIRouter(prefix="/managers", tags=["Managers"])
 
     @router.post("/add")
     async def add_manager(managerData: ManagerInputAdd):
-        return {"id": Managers.add(managerData)}
+        return {"id": await AsyncDB.run(Managers.add, managerData)}
 
     @router.put("/update/{id}")
     async def update_manager(id: int, managerData: ManagerInputUpdate):
-        return Managers.update(id, managerData)
+        return await AsyncDB.run(Managers.update, id, managerData)
 
-    @router.get("/search")
+    @router.get("/search", response_model=list[ManagerOutputSearch])
     async def search_managers(
+        response: Response,
         id: int | None = Query(None, ge=0),
         name: str | None = Query(None, max_length=50),
         role: str | None = None,
-        limit: int = Query(10, gt=0),
+        cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+        limit: int = Query(10, gt=0, le=Settings.MAX_PAGE_SIZE),
         offset: int = Query(0, ge=0),
-    ) -> list[Manager]:
-        return Managers.search(**locals())
+    ):
+        managers = await AsyncDB.run(
+            Managers.search, id=id, name=name, role=role, cursor=cursor, limit=limit, offset=offset
+        )
+        response.headers.update(next_cursor_headers(managers, "id", limit))
+        return managers
 
     return router
 
@@ -130,23 +306,243 @@ def create_task_routes():
 
     @router.post("/add")
     async def add_task(taskData: TaskInputAdd):
-        return {"id": Tasks.add(taskData)}
+        return {"id": await AsyncDB.run(Tasks.add, taskData)}
+
+    @router.post("/bulk")
+    async def add_tasks_bulk(request: Request):
+        """Import tasks posted as a JSON array or an NDJSON stream; invalid rows are reported, not fatal."""
+        return await BulkImport.run(request, TaskInputAdd, Tasks.addBulk)
 
     @router.put("/update/{id}")
     async def update_task(id: int, taskData: TaskInputUpdate):
-        return Tasks.update(id, taskData)
-
-    @router.get("/search")
+        return await AsyncDB.run(Tasks.update, id, taskData)
+
+    @router.put("/{id}/parent")
+    async def move_task(id: int, moveData: TaskInputMove):
+        """Make a task a subtask of another one, or a top-level task; its subtasks move along."""
+        return await AsyncDB.run(Tasks.move, id, moveData.parent_id)
+
+    @router.get("/{id}/subtasks", response_model=list[TaskOutputSubtask])
+    async def task_subtasks(
+        id: int,
+        max_depth: int = Query(100, gt=0),
+        limit: int = Query(1000, gt=0, le=Settings.MAX_PAGE_SIZE),
+    ):
+        """Subtasks of a task at any depth up to max_depth, level by level."""
+        return await AsyncDB.run(Tasks.subtasks, id, max_depth, limit)
+
+    @router.get("/{id}/progress", response_model=TaskStatsOutput)
+    async def task_progress(id: int):
+        """Counts of all the subtasks of a task by status and priority plus overdue count."""
+        if await AsyncDB.run(DB.select_task_by_id, id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Task with id {id} does not exist")
+        return await AsyncDB.run(TaskStats.taskTree, id)
+
+    @router.put("/bulk_update", response_model=TaskBulkUpdateOutput)
+    async def update_tasks_bulk(updateData: TaskInputBulkUpdate):
+        """Apply one patch to a list of task ids, or to every task matching a filter, in a single transaction."""
+        return await AsyncDB.run(Tasks.updateBulk, updateData)
+
+    @router.get("/search", response_model=list[TaskOutputSearch])
     async def search_tasks(
+        request: Request,
         id: int | None = Query(None, ge=0),
         name: str | None = Query(None, max_length=50),
-        code: str | None = Query(None, max_length=50),
-        hours_from: int | None = Query(None, ge=0),
-        hours_to: int | None = Query(None, ge=0),
-        limit: int = Query(10, gt=0),
+        q: str | None = Query(None, max_length=200, description=Q_DESCRIPTION),
+        status: TaskStatus | None = None,
+        priority: TaskPriority | None = None,
+        project_id: int | None = Query(None, ge=0),
+        project_tree: int | None = Query(None, ge=0, description=PROJECT_TREE_DESCRIPTION),
+        assigned_user_id: int | None = Query(None, ge=0),
+        sort: str = Query("id", pattern="^(id|created_at)$"),
+        cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+        limit: int = Query(10, gt=0, le=Settings.MAX_PAGE_SIZE),
         offset: int = Query(0, ge=0),
-    ) -> list[TaskOutputSearch]:
-        return Tasks.search(**locals())
+    ):
+        return await responseCache.respond(
+            request,
+            ("tasks", "task_comments", "projects", "users"),
+            lambda: Tasks.search(
+                id=id, name=name, q=q, status=status, priority=priority, project_id=project_id, project_tree=project_tree,
+                assigned_user_id=assigned_user_id, sort=sort, cursor=cursor, limit=limit, offset=offset,
+            ),
+            list[TaskOutputSearch],
+            lambda tasks: next_cursor_headers(tasks, sort, limit) if q is None else {},
+            rawLoad=lambda: Tasks.search(
+                id=id, name=name, q=q, status=status, priority=priority, project_id=project_id, project_tree=project_tree,
+                assigned_user_id=assigned_user_id, sort=sort, cursor=cursor, limit=limit, offset=offset, records=True,
+            ),
+        )
+
+    @router.get("/changes", response_model=TaskChangesOutput)
+    async def task_changes(
+        since: int = Query(0, ge=0, description=SINCE_DESCRIPTION),
+        limit: int = Query(100, gt=0, le=Settings.MAX_PAGE_SIZE),
+    ):
+        """Tasks inserted, updated or deleted after the change `since`; re-fetch only those tasks."""
+        return await AsyncDB.run(TaskChanges.feed, since, limit)
+
+    @router.get("/changes/stream")
+    async def task_changes_stream(
+        request: Request,
+        since: int = Query(0, ge=0, description=SINCE_DESCRIPTION + " The Last-Event-ID header takes precedence."),
+    ):
+        """Server-sent events: a `change` event per task change after `since`, as it happens.
+        A `resync` event means changes were pruned: reload the tasks, the stream continues from there."""
+        last_event_id = request.headers.get("last-event-id", "")
+        if last_event_id.isdigit():
+            since = int(last_event_id)
+        return StreamingResponse(
+            change_stream(since),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @router.get("/export")
+    async def export_tasks(
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        id: int | None = Query(None, ge=0),
+        name: str | None = Query(None, max_length=50),
+        q: str | None = Query(None, max_length=200, description=Q_DESCRIPTION),
+        status: TaskStatus | None = None,
+        priority: TaskPriority | None = None,
+        project_id: int | None = Query(None, ge=0),
+        project_tree: int | None = Query(None, ge=0, description=PROJECT_TREE_DESCRIPTION),
+        assigned_user_id: int | None = Query(None, ge=0),
+    ):
+        """Stream every task matching the search filters as NDJSON or CSV."""
+        chunks = Tasks.export(
+            format, id=id, name=name, q=q, status=status, priority=priority,
+            project_id=project_id, project_tree=project_tree, assigned_user_id=assigned_user_id,
+        )
+        return export_response(chunks, "tasks", format)
+
+    return router
+
+
+def create_project_routes():
+    router = APIRouter(prefix="/projects", tags=["Projects"])
+
+    @router.post("/add")
+    async def add_project(projectData: ProjectInputAdd):
+        return {"id": await AsyncDB.run(Projects.add, projectData)}
+
+    @router.put("/{id}/parent")
+    async def move_project(id: int, moveData: ProjectInputMove):
+        """Move a project with its sub-projects under another project, or to the top level."""
+        return await AsyncDB.run(Projects.move, id, moveData.parent_id)
+
+    @router.get("/{id}/descendants", response_model=list[ProjectOutputNode])
+    async def project_descendants(
+        id: int,
+        max_depth: int = Query(100, gt=0),
+        limit: int = Query(1000, gt=0, le=Settings.MAX_PAGE_SIZE),
+    ):
+        """Sub-projects of a project at any depth up to max_depth, level by level."""
+        return await AsyncDB.run(Projects.descendants, id, max_depth, limit)
+
+    return router
+
+
+def create_task_record_routes():
+    router = APIRouter(prefix="/task_records", tags=["Task Records"])
+
+    @router.get("/export")
+    async def export_task_records(
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        task_id: int | None = Query(None, ge=0),
+        action: str | None = Query(None, pattern="^(created|updated|deleted|completed|commented)$"),
+        updated_by_user_id: int | None = Query(None, ge=0),
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ):
+        """Stream the task history matching the filters as NDJSON or CSV."""
+        # pending history is written before the rows are streamed
+        chunks = await AsyncDB.run(
+            TaskRecords.export,
+            format, task_id=task_id, action=action, updated_by_user_id=updated_by_user_id, since=since, until=until,
+        )
+        return export_response(chunks, "task_records", format)
+
+    @router.get("/history/{task_id}", response_model=list[TaskRecordOutput])
+    async def task_history(
+        task_id: int,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = Query(100, gt=0, le=Settings.MAX_PAGE_SIZE),
+    ):
+        """History of a task in time order, optionally limited to [since, until)."""
+        return await AsyncDB.run(TaskRecords.history, task_id, since, until, limit)
+
+    return router
+
+
+def create_stats_routes():
+    router = APIRouter(prefix="/stats", tags=["Statistics"])
+
+    @router.get("", response_model=TaskStatsOutput)
+    async def all_task_stats():
+        """Task counts by status and priority plus overdue count over all tasks."""
+        return await AsyncDB.run(TaskStats.get)
+
+    @router.get("/projects/{id}", response_model=TaskStatsOutput)
+    async def project_task_stats(id: int, subtree: bool = False):
+        """Task counts of a project, id 0 counts the tasks without a project. With subtree, of the project and all its sub-projects."""
+        if subtree:
+            return await AsyncDB.run(TaskStats.projectTree, id)
+        return await AsyncDB.run(TaskStats.get, "project", id)
+
+    @router.get("/users/{id}", response_model=TaskStatsOutput)
+    async def user_task_stats(id: int):
+        """Task counts of an assignee, id 0 counts the unassigned tasks."""
+        return await AsyncDB.run(TaskStats.get, "user", id)
+
+    @router.post("/rebuild")
+    async def rebuild_task_stats():
+        """Recompute the statistics rollups from the tasks table."""
+        await AsyncDB.run(TaskStats.rebuild)
+        return {"status": "Task statistics rebuilt."}
+
+    return router
+
+
+def create_report_routes():
+    router = APIRouter(prefix="/reports", tags=["Reports"])
+
+    @router.get("/throughput", response_model=list[ThroughputOutput])
+    async def throughput_report(
+        weeks: int = Query(12, gt=0, le=520),
+        project_id: int | None = Query(None, ge=0),
+        assigned_user_id: int | None = Query(None, ge=0),
+    ):
+        """Tasks completed per week over the last weeks, oldest first."""
+        return await AsyncDB.run(Reports.throughput, weeks, project_id, assigned_user_id)
+
+    @router.get("/lead_time", response_model=LeadTimeOutput)
+    async def lead_time_report(
+        project_id: int | None = Query(None, ge=0),
+        assigned_user_id: int | None = Query(None, ge=0),
+        since: date | None = None,
+    ):
+        """Hours from creation to completion of completed tasks."""
+        return await AsyncDB.run(Reports.leadTime, project_id, assigned_user_id, since)
+
+    @router.get("/workload", response_model=list[WorkloadOutput])
+    async def workload_report(project_id: int | None = Query(None, ge=0)):
+        """Open and overdue tasks per assignee."""
+        return await AsyncDB.run(Reports.workload, project_id)
+
+    @router.get("/snapshot")
+    async def snapshot_stats():
+        """Size and refresh counters of the in-memory task snapshot the reports read."""
+        # stats() waits for a running refresh, keep that off the event loop
+        return await AsyncDB.run(taskSnapshot.stats)
+
+    @router.post("/snapshot/refresh")
+    async def refresh_snapshot():
+        """Reload the task snapshot from the database."""
+        await AsyncDB.run(taskSnapshot.refresh, True)
+        return await AsyncDB.run(taskSnapshot.stats)
 
     return router
 
@@ -157,26 +553,100 @@ def create_database_routes():
     @router.post("/populate_dummy_data")
     async def populate_dummy_data():
         """Populate the database with dummy data."""
-        Users.addUserDummyData()
-        Users.addTeamDummyData()
-        Managers.addManagerDummyData()
-        Tasks.addTaskDummyData()
+        await AsyncDB.run(Users.addUserDummyData)
+        await AsyncDB.run(Users.addTeamDummyData)
+        if Managers.available():
+            await AsyncDB.run(Managers.addManagerDummyData)
+        await AsyncDB.run(Tasks.addTaskDummyData)
         return {"status": "Dummy data populated successfully."}
 
     @router.post("/reset_database")
     async def reset_database():
         """Reset the database by truncating all data."""
-        if os.path.exists("task_manager.db"):
-            os.remove("task_manager.db")
-        DB.init()
+        def reset():
+            AuditLog.flush()
+            DB.close()
+            for path in (DB.dbFile(), DB.dbFile() + "-wal", DB.dbFile() + "-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+            DB.init()
+
+        await AsyncDB.run(reset)
+        changeFeed.reset()
         return {"status": "Database reset successfully."}
 
+    @router.get("/database_stats")
+    async def database_stats():
+        """Connection pool checkout/return metrics, cache and audit writer counters."""
+        return {
+            "pool": DB.stats(),
+            "entity_cache": DB.cache.stats(),
+            "response_cache": responseCache.stats(),
+            "audit": AuditLog.stats(),
+        }
+
+    return router
+
+
+def create_debug_routes():
+    router = APIRouter(prefix="/debug", tags=["Debug"])
+
+    @router.get("/queries")
+    async def top_queries(
+        top: int = Query(20, gt=0, le=1000),
+        order: str = Query("total_ms", pattern="^(total_ms|mean_ms|max_ms|calls)$"),
+    ):
+        """Top normalised SQL statements since start (or the last reset)."""
+        return QueryProfiler.top(top, order)
+
+    @router.get("/admission")
+    async def admission_stats():
+        """Requests admitted and shed by rate limits and the write queue."""
+        return Admission.stats()
+
+    @router.get("/change_feed")
+    async def change_feed_stats():
+        """Open change streams and counters of the change feed poller."""
+        return changeFeed.stats()
+
+    @router.get("/scheduler")
+    async def scheduler_stats():
+        """Run-time metrics of the scheduled jobs and the number of reminders waiting to be sent."""
+        return {"jobs": scheduler.stats(), "pending_reminders": await AsyncDB.run(Reminders.pending)}
+
+    @router.post("/scheduler/{name}/run")
+    async def run_job(name: str):
+        """Run a scheduled job now; skipped when the job is already running."""
+        if name not in scheduler.jobs:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {name} does not exist")
+        ran = await scheduler.run(name)
+        return {"ran": ran, **scheduler.jobs[name].stats()}
+
+    @router.delete("/queries")
+    async def reset_queries():
+        """Reset the aggregated statement statistics."""
+        QueryProfiler.reset()
+        return {"status": "Query statistics reset."}
+
     return router
 
 
 # ========================= REGISTER ROUTERS =========================
+def include_optional_routes(create_routes):
+    """Register a router whose schemas or services depend on optional modules, skipping it when they are missing."""
+    try:
+        app.include_router(create_routes())
+    except ImportError as e:
+        logger.warning("%s skipped: %s", create_routes.__name__, e)
+
+
 app.include_router(create_user_routes())
-app.include_router(create_team_routes())
-app.include_router(create_manager_routes())
+include_optional_routes(create_team_routes)
+include_optional_routes(create_manager_routes)
 app.include_router(create_task_routes())
+app.include_router(create_project_routes())
+app.include_router(create_task_record_routes())
+app.include_router(create_stats_routes())
+app.include_router(create_report_routes())
 app.include_router(create_database_routes())
+app.include_router(create_debug_routes())
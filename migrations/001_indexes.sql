@@ -0,0 +1,20 @@
+-- Secondary indexes for task search, history and comment lookups
+
+-- Tasks: foreign keys and filter columns (project_id is covered by idx_tasks_project_status_due)
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_by_user_id ON tasks (created_by_user_id);
+
+-- "My open tasks by due date": assignee + status filter, ordered by due date
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee_status_due ON tasks (assigned_user_id, status, due_date);
+
+-- Project board: tasks of a project by status, ordered by due date
+CREATE INDEX IF NOT EXISTS idx_tasks_project_status_due ON tasks (project_id, status, due_date);
+
+-- Task Records: history of a task in chronological order
+CREATE INDEX IF NOT EXISTS idx_task_records_task_date ON task_records (task_id, update_date);
+CREATE INDEX IF NOT EXISTS idx_task_records_updated_by_user_id ON task_records (updated_by_user_id);
+
+-- Task Comments: comments of a task in chronological order
+CREATE INDEX IF NOT EXISTS idx_task_comments_task_created ON task_comments (task_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_task_comments_user_id ON task_comments (user_id);
@@ -0,0 +1,2 @@
+-- Indexes backing keyset pagination on (sort_key, id); the rowid is implicitly the last index column
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
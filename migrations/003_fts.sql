@@ -0,0 +1,54 @@
+-- Full-text search over task titles/descriptions, task comments and user names (external content FTS5 tables)
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(title, description, content='tasks', content_rowid='id');
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+
+
+CREATE VIRTUAL TABLE IF NOT EXISTS task_comments_fts USING fts5(comment, content='task_comments', content_rowid='id');
+
+CREATE TRIGGER IF NOT EXISTS task_comments_fts_insert AFTER INSERT ON task_comments BEGIN
+    INSERT INTO task_comments_fts (rowid, comment) VALUES (new.id, new.comment);
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_comments_fts_delete AFTER DELETE ON task_comments BEGIN
+    INSERT INTO task_comments_fts (task_comments_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_comments_fts_update AFTER UPDATE OF comment ON task_comments BEGIN
+    INSERT INTO task_comments_fts (task_comments_fts, rowid, comment) VALUES ('delete', old.id, old.comment);
+    INSERT INTO task_comments_fts (rowid, comment) VALUES (new.id, new.comment);
+END;
+
+
+CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(first_name, last_name, content='users', content_rowid='id');
+
+CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+    INSERT INTO users_fts (rowid, first_name, last_name) VALUES (new.id, new.first_name, new.last_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN
+    INSERT INTO users_fts (users_fts, rowid, first_name, last_name) VALUES ('delete', old.id, old.first_name, old.last_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_fts_update AFTER UPDATE OF first_name, last_name ON users BEGIN
+    INSERT INTO users_fts (users_fts, rowid, first_name, last_name) VALUES ('delete', old.id, old.first_name, old.last_name);
+    INSERT INTO users_fts (rowid, first_name, last_name) VALUES (new.id, new.first_name, new.last_name);
+END;
+
+
+-- Index rows that existed before this migration
+INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
+INSERT INTO task_comments_fts (task_comments_fts) VALUES ('rebuild');
+INSERT INTO users_fts (users_fts) VALUES ('rebuild');
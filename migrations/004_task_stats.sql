@@ -0,0 +1,80 @@
+-- Task statistics rollups maintained incrementally by triggers on tasks.
+-- scope is 'all', 'project' or 'user' (assignee); scope_id is 0 for 'all' and for tasks without a project/assignee
+
+-- Task counts per scope, status and priority
+CREATE TABLE IF NOT EXISTS task_stats (
+    scope TEXT NOT NULL CHECK (scope IN ('all', 'project', 'user')),
+    scope_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    task_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, scope_id, status, priority)
+) WITHOUT ROWID;
+
+-- Open (not completed) tasks per scope and due date, overdue counts sum the dates before today
+CREATE TABLE IF NOT EXISTS task_due_stats (
+    scope TEXT NOT NULL CHECK (scope IN ('all', 'project', 'user')),
+    scope_id INTEGER NOT NULL,
+    due_date DATE NOT NULL,
+    open_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, scope_id, due_date)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS task_stats_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO task_stats (scope, scope_id, status, priority, task_count) VALUES
+        ('all', 0, new.status, new.priority, 1),
+        ('project', COALESCE(new.project_id, 0), new.status, new.priority, 1),
+        ('user', COALESCE(new.assigned_user_id, 0), new.status, new.priority, 1)
+    ON CONFLICT DO UPDATE SET task_count = task_count + excluded.task_count;
+
+    INSERT INTO task_due_stats (scope, scope_id, due_date, open_count)
+        SELECT 'all', 0, new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+        UNION ALL SELECT 'project', COALESCE(new.project_id, 0), new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+        UNION ALL SELECT 'user', COALESCE(new.assigned_user_id, 0), new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+    ON CONFLICT DO UPDATE SET open_count = open_count + excluded.open_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_stats_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO task_stats (scope, scope_id, status, priority, task_count) VALUES
+        ('all', 0, old.status, old.priority, -1),
+        ('project', COALESCE(old.project_id, 0), old.status, old.priority, -1),
+        ('user', COALESCE(old.assigned_user_id, 0), old.status, old.priority, -1)
+    ON CONFLICT DO UPDATE SET task_count = task_count + excluded.task_count;
+
+    INSERT INTO task_due_stats (scope, scope_id, due_date, open_count)
+        SELECT 'all', 0, old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'project', COALESCE(old.project_id, 0), old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'user', COALESCE(old.assigned_user_id, 0), old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+    ON CONFLICT DO UPDATE SET open_count = open_count + excluded.open_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_stats_update AFTER UPDATE OF status, priority, project_id, assigned_user_id, due_date ON tasks BEGIN
+    INSERT INTO task_stats (scope, scope_id, status, priority, task_count) VALUES
+        ('all', 0, old.status, old.priority, -1),
+        ('project', COALESCE(old.project_id, 0), old.status, old.priority, -1),
+        ('user', COALESCE(old.assigned_user_id, 0), old.status, old.priority, -1),
+        ('all', 0, new.status, new.priority, 1),
+        ('project', COALESCE(new.project_id, 0), new.status, new.priority, 1),
+        ('user', COALESCE(new.assigned_user_id, 0), new.status, new.priority, 1)
+    ON CONFLICT DO UPDATE SET task_count = task_count + excluded.task_count;
+
+    INSERT INTO task_due_stats (scope, scope_id, due_date, open_count)
+        SELECT 'all', 0, old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'project', COALESCE(old.project_id, 0), old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'user', COALESCE(old.assigned_user_id, 0), old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'all', 0, new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+        UNION ALL SELECT 'project', COALESCE(new.project_id, 0), new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+        UNION ALL SELECT 'user', COALESCE(new.assigned_user_id, 0), new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+    ON CONFLICT DO UPDATE SET open_count = open_count + excluded.open_count;
+END;
+
+-- Roll up tasks that existed before this migration (same statements as TaskStats.rebuild)
+INSERT INTO task_stats (scope, scope_id, status, priority, task_count)
+    SELECT 'all', 0, status, priority, count(*) FROM tasks GROUP BY status, priority
+    UNION ALL SELECT 'project', COALESCE(project_id, 0), status, priority, count(*) FROM tasks GROUP BY 2, status, priority
+    UNION ALL SELECT 'user', COALESCE(assigned_user_id, 0), status, priority, count(*) FROM tasks GROUP BY 2, status, priority;
+
+INSERT INTO task_due_stats (scope, scope_id, due_date, open_count)
+    SELECT 'all', 0, due_date, count(*) FROM tasks WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY due_date
+    UNION ALL SELECT 'project', COALESCE(project_id, 0), due_date, count(*) FROM tasks WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY 2, due_date
+    UNION ALL SELECT 'user', COALESCE(assigned_user_id, 0), due_date, count(*) FROM tasks WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY 2, due_date;
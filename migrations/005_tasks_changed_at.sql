@@ -0,0 +1,2 @@
+-- Incremental refresh of the analytics snapshot (helpers/analytics.py) reads the tasks changed since its last refresh
+CREATE INDEX IF NOT EXISTS idx_tasks_changed_at ON tasks (COALESCE(updated_at, created_at));
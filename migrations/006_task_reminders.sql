@@ -0,0 +1,20 @@
+-- Overdue sweep and due-date reminders (services/reminders.py)
+
+-- open tasks by due date per status; idx_tasks_status is a prefix of it
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks (status, due_date);
+DROP INDEX IF EXISTS idx_tasks_status;
+
+-- one reminder per task, kind and due date: rescheduling a task makes it eligible again
+CREATE TABLE IF NOT EXISTS task_reminders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('due_soon', 'overdue')),
+    due_date DATE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP,
+    UNIQUE (task_id, kind, due_date),
+    FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE
+);
+
+-- the dispatch queue: reminders not sent yet, in insertion order
+CREATE INDEX IF NOT EXISTS idx_task_reminders_unsent ON task_reminders (id) WHERE sent_at IS NULL;
@@ -0,0 +1,20 @@
+-- Change feed of tasks (services/task_changes.py): one row per insert, update or delete of a task.
+-- seq is AUTOINCREMENT so it only grows, even after old changes are pruned
+CREATE TABLE IF NOT EXISTS task_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS task_changes_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO task_changes (task_id, op) VALUES (new.id, 'insert');
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_changes_update AFTER UPDATE ON tasks BEGIN
+    INSERT INTO task_changes (task_id, op) VALUES (new.id, 'update');
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_changes_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO task_changes (task_id, op) VALUES (old.id, 'delete');
+END;
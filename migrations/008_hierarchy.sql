@@ -0,0 +1,91 @@
+-- Sub-projects and sub-tasks: parent_id columns and closure tables holding one row per (ancestor, descendant) pair,
+-- the node itself included at depth 0. "All descendants" is a range scan on the primary key, "all ancestors"
+-- one on the (descendant, ancestor) index. Triggers keep them up to date: an insert adds the new node's ancestor rows,
+-- a move rewrites only the rows linking the moved subtree to its old and new ancestors
+ALTER TABLE projects ADD COLUMN parent_id INTEGER REFERENCES projects (id) ON DELETE SET NULL;
+ALTER TABLE tasks ADD COLUMN parent_id INTEGER REFERENCES tasks (id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_projects_parent_id ON projects (parent_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_parent_id ON tasks (parent_id);
+
+CREATE TABLE IF NOT EXISTS project_closure (
+    ancestor INTEGER NOT NULL,
+    descendant INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor, descendant)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_project_closure_descendant ON project_closure (descendant, ancestor, depth);
+
+CREATE TABLE IF NOT EXISTS task_closure (
+    ancestor INTEGER NOT NULL,
+    descendant INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor, descendant)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_task_closure_descendant ON task_closure (descendant, ancestor, depth);
+
+-- every existing project and task is a root
+INSERT OR IGNORE INTO project_closure (ancestor, descendant, depth) SELECT id, id, 0 FROM projects;
+INSERT OR IGNORE INTO task_closure (ancestor, descendant, depth) SELECT id, id, 0 FROM tasks;
+
+-- projects
+CREATE TRIGGER IF NOT EXISTS project_closure_insert AFTER INSERT ON projects BEGIN
+    INSERT INTO project_closure (ancestor, descendant, depth)
+        SELECT new.id, new.id, 0
+        UNION ALL SELECT ancestor, new.id, depth + 1 FROM project_closure WHERE descendant = new.parent_id;
+END;
+
+-- a project cannot be moved under itself or one of its descendants
+CREATE TRIGGER IF NOT EXISTS project_closure_cycle BEFORE UPDATE OF parent_id ON projects
+WHEN new.parent_id IS NOT NULL AND EXISTS (SELECT 1 FROM project_closure WHERE ancestor = new.id AND descendant = new.parent_id) BEGIN
+    SELECT RAISE(ABORT, 'Hierarchy cycle: a project cannot be moved under itself or its descendants');
+END;
+
+CREATE TRIGGER IF NOT EXISTS project_closure_move AFTER UPDATE OF parent_id ON projects
+WHEN old.parent_id IS NOT new.parent_id BEGIN
+    -- detach the subtree from its old ancestors
+    DELETE FROM project_closure
+    WHERE descendant IN (SELECT descendant FROM project_closure WHERE ancestor = new.id)
+      AND ancestor IN (SELECT ancestor FROM project_closure WHERE descendant = new.id AND ancestor != new.id);
+    -- attach it below the new parent and its ancestors
+    INSERT INTO project_closure (ancestor, descendant, depth)
+        SELECT a.ancestor, d.descendant, a.depth + d.depth + 1
+        FROM project_closure a JOIN project_closure d ON d.ancestor = new.id
+        WHERE a.descendant = new.parent_id;
+END;
+
+-- children of a deleted project become roots (the move trigger detaches their subtrees), then its own rows go
+CREATE TRIGGER IF NOT EXISTS project_closure_delete AFTER DELETE ON projects BEGIN
+    UPDATE projects SET parent_id = NULL WHERE parent_id = old.id;
+    DELETE FROM project_closure WHERE descendant = old.id;
+    DELETE FROM project_closure WHERE ancestor = old.id;
+END;
+
+-- tasks
+CREATE TRIGGER IF NOT EXISTS task_closure_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO task_closure (ancestor, descendant, depth)
+        SELECT new.id, new.id, 0
+        UNION ALL SELECT ancestor, new.id, depth + 1 FROM task_closure WHERE descendant = new.parent_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_closure_cycle BEFORE UPDATE OF parent_id ON tasks
+WHEN new.parent_id IS NOT NULL AND EXISTS (SELECT 1 FROM task_closure WHERE ancestor = new.id AND descendant = new.parent_id) BEGIN
+    SELECT RAISE(ABORT, 'Hierarchy cycle: a task cannot be moved under itself or its subtasks');
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_closure_move AFTER UPDATE OF parent_id ON tasks
+WHEN old.parent_id IS NOT new.parent_id BEGIN
+    DELETE FROM task_closure
+    WHERE descendant IN (SELECT descendant FROM task_closure WHERE ancestor = new.id)
+      AND ancestor IN (SELECT ancestor FROM task_closure WHERE descendant = new.id AND ancestor != new.id);
+    INSERT INTO task_closure (ancestor, descendant, depth)
+        SELECT a.ancestor, d.descendant, a.depth + d.depth + 1
+        FROM task_closure a JOIN task_closure d ON d.ancestor = new.id
+        WHERE a.descendant = new.parent_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_closure_delete AFTER DELETE ON tasks BEGIN
+    UPDATE tasks SET parent_id = NULL WHERE parent_id = old.id;
+    DELETE FROM task_closure WHERE descendant = old.id;
+    DELETE FROM task_closure WHERE ancestor = old.id;
+END;
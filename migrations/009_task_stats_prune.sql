@@ -0,0 +1,64 @@
+-- Rollup rows whose count drops to zero are deleted by the triggers of 004_task_stats.sql from now on,
+-- so task_due_stats holds only due dates that still have open tasks and overdue reads stay bounded.
+-- Each delete is three primary key lookups (a multi-index OR)
+DROP TRIGGER IF EXISTS task_stats_delete;
+DROP TRIGGER IF EXISTS task_stats_update;
+
+CREATE TRIGGER IF NOT EXISTS task_stats_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO task_stats (scope, scope_id, status, priority, task_count) VALUES
+        ('all', 0, old.status, old.priority, -1),
+        ('project', COALESCE(old.project_id, 0), old.status, old.priority, -1),
+        ('user', COALESCE(old.assigned_user_id, 0), old.status, old.priority, -1)
+    ON CONFLICT DO UPDATE SET task_count = task_count + excluded.task_count;
+
+    INSERT INTO task_due_stats (scope, scope_id, due_date, open_count)
+        SELECT 'all', 0, old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'project', COALESCE(old.project_id, 0), old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'user', COALESCE(old.assigned_user_id, 0), old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+    ON CONFLICT DO UPDATE SET open_count = open_count + excluded.open_count;
+
+    DELETE FROM task_stats WHERE task_count = 0 AND status = old.status AND priority = old.priority AND (
+        (scope = 'all' AND scope_id = 0)
+        OR (scope = 'project' AND scope_id = COALESCE(old.project_id, 0))
+        OR (scope = 'user' AND scope_id = COALESCE(old.assigned_user_id, 0)));
+
+    DELETE FROM task_due_stats WHERE open_count = 0 AND due_date = old.due_date AND (
+        (scope = 'all' AND scope_id = 0)
+        OR (scope = 'project' AND scope_id = COALESCE(old.project_id, 0))
+        OR (scope = 'user' AND scope_id = COALESCE(old.assigned_user_id, 0)));
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_stats_update AFTER UPDATE OF status, priority, project_id, assigned_user_id, due_date ON tasks BEGIN
+    INSERT INTO task_stats (scope, scope_id, status, priority, task_count) VALUES
+        ('all', 0, old.status, old.priority, -1),
+        ('project', COALESCE(old.project_id, 0), old.status, old.priority, -1),
+        ('user', COALESCE(old.assigned_user_id, 0), old.status, old.priority, -1),
+        ('all', 0, new.status, new.priority, 1),
+        ('project', COALESCE(new.project_id, 0), new.status, new.priority, 1),
+        ('user', COALESCE(new.assigned_user_id, 0), new.status, new.priority, 1)
+    ON CONFLICT DO UPDATE SET task_count = task_count + excluded.task_count;
+
+    INSERT INTO task_due_stats (scope, scope_id, due_date, open_count)
+        SELECT 'all', 0, old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'project', COALESCE(old.project_id, 0), old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'user', COALESCE(old.assigned_user_id, 0), old.due_date, -1 WHERE old.status != 'completed' AND old.due_date IS NOT NULL
+        UNION ALL SELECT 'all', 0, new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+        UNION ALL SELECT 'project', COALESCE(new.project_id, 0), new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+        UNION ALL SELECT 'user', COALESCE(new.assigned_user_id, 0), new.due_date, 1 WHERE new.status != 'completed' AND new.due_date IS NOT NULL
+    ON CONFLICT DO UPDATE SET open_count = open_count + excluded.open_count;
+
+    -- only the old side is decremented, the new side is at least 1
+    DELETE FROM task_stats WHERE task_count = 0 AND status = old.status AND priority = old.priority AND (
+        (scope = 'all' AND scope_id = 0)
+        OR (scope = 'project' AND scope_id = COALESCE(old.project_id, 0))
+        OR (scope = 'user' AND scope_id = COALESCE(old.assigned_user_id, 0)));
+
+    DELETE FROM task_due_stats WHERE open_count = 0 AND due_date = old.due_date AND (
+        (scope = 'all' AND scope_id = 0)
+        OR (scope = 'project' AND scope_id = COALESCE(old.project_id, 0))
+        OR (scope = 'user' AND scope_id = COALESCE(old.assigned_user_id, 0)));
+END;
+
+-- zero rows left behind so far
+DELETE FROM task_stats WHERE task_count = 0;
+DELETE FROM task_due_stats WHERE open_count = 0;
@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional
+
+
+# Enum for project statuses (matches the CHECK constraint in migrations/base.sql)
+class ProjectStatus(str, Enum):
+    planned = 'planned'
+    ongoing = 'ongoing'
+    completed = 'completed'
+    on_hold = 'on_hold'
+
+
+# Input schema for adding a new project
+class ProjectInputAdd(BaseModel):
+    name: str = Field(..., description="Name of the project, unique")
+    description: Optional[str] = Field(None, description="Description of the project")
+    start_date: Optional[date] = Field(None, description="Start date of the project")
+    end_date: Optional[date] = Field(None, description="End date of the project")
+    status: ProjectStatus = Field(ProjectStatus.planned, description="Status of the project")
+    parent_id: Optional[int] = Field(None, description="ID of the parent project, none for a top-level project")
+
+
+# Input schema for moving a project under another one
+class ProjectInputMove(BaseModel):
+    parent_id: Optional[int] = Field(..., description="ID of the new parent project, null to make it top-level")
+
+
+# Output schema for a project in a project tree
+class ProjectOutputNode(BaseModel):
+    id: int = Field(..., description="ID of the project")
+    name: str = Field(..., description="Name of the project")
+    status: ProjectStatus = Field(..., description="Status of the project")
+    parent_id: Optional[int] = Field(None, description="ID of the parent project")
+    depth: int = Field(..., description="Levels below the project the tree was read from")
+    created_at: datetime = Field(..., description="Creation time of the project")
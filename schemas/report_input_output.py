@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import Optional
+
+from schemas.task_input_output import TaskPriority
+
+
+# Output schema for the number of tasks completed in a week
+class ThroughputOutput(BaseModel):
+    week_start: date = Field(..., description="Monday the week starts on")
+    completed: int = Field(..., description="Number of tasks completed during the week")
+
+
+# Output schema for the time from creation to completion of completed tasks
+class LeadTimeOutput(BaseModel):
+    count: int = Field(..., description="Number of completed tasks")
+    mean_hours: Optional[float] = Field(None, description="Mean lead time in hours")
+    p50_hours: Optional[float] = Field(None, description="Median lead time in hours")
+    p90_hours: Optional[float] = Field(None, description="90th percentile lead time in hours")
+
+
+# Output schema for the open tasks of an assignee
+class WorkloadOutput(BaseModel):
+    assigned_user_id: int = Field(..., description="ID of the assignee, 0 for unassigned tasks")
+    open: int = Field(..., description="Number of tasks not completed")
+    by_priority: dict[TaskPriority, int] = Field(..., description="Number of open tasks per priority")
+    overdue: int = Field(..., description="Number of open tasks due before today")
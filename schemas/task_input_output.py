@@ -0,0 +1,142 @@
+from pydantic import BaseModel, Field, model_validator
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional
+
+
+# Enum for task statuses (matches the CHECK constraint in migrations/base.sql)
+class TaskStatus(str, Enum):
+    pending = 'pending'
+    in_progress = 'in_progress'
+    completed = 'completed'
+    blocked = 'blocked'
+
+
+# Enum for task priorities
+class TaskPriority(str, Enum):
+    low = 'low'
+    medium = 'medium'
+    high = 'high'
+
+
+# Input schema for adding a new task
+class TaskInputAdd(BaseModel):
+    title: str = Field(..., max_length=200, description="Title of the task")
+    description: Optional[str] = Field(None, description="Description of the task")
+    status: TaskStatus = Field(TaskStatus.pending, description="Status of the task")
+    priority: TaskPriority = Field(TaskPriority.medium, description="Priority of the task")
+    due_date: Optional[date] = Field(None, description="Due date of the task")
+    project_id: Optional[int] = Field(None, description="ID of the project the task belongs to")
+    parent_id: Optional[int] = Field(None, description="ID of the parent task, for a subtask")
+    assigned_user_id: Optional[int] = Field(None, description="ID of the user the task is assigned to")
+    created_by_user_id: Optional[int] = Field(None, description="ID of the user who created the task")
+
+
+# Input schema for moving a task under another one
+class TaskInputMove(BaseModel):
+    parent_id: Optional[int] = Field(..., description="ID of the new parent task, null to make it a top-level task")
+
+
+# Input schema for updating an existing task
+class TaskInputUpdate(BaseModel):
+    title: Optional[str] = Field(None, max_length=200, description="Updated title of the task")
+    description: Optional[str] = Field(None, description="Updated description of the task")
+    status: Optional[TaskStatus] = Field(None, description="Updated status of the task")
+    priority: Optional[TaskPriority] = Field(None, description="Updated priority of the task")
+    due_date: Optional[date] = Field(None, description="Updated due date of the task")
+    project_id: Optional[int] = Field(None, description="Updated project of the task")
+    assigned_user_id: Optional[int] = Field(None, description="Updated assignee of the task")
+
+
+
+# Filter of a bulk update: the tasks matching every given field
+class TaskBulkFilter(BaseModel):
+    status: Optional[TaskStatus] = Field(None, description="Current status of the tasks")
+    priority: Optional[TaskPriority] = Field(None, description="Current priority of the tasks")
+    project_id: Optional[int] = Field(None, description="Project of the tasks")
+    assigned_user_id: Optional[int] = Field(None, description="Assignee of the tasks")
+
+
+# Input schema for applying the same update to many tasks
+class TaskInputBulkUpdate(BaseModel):
+    ids: Optional[list[int]] = Field(None, min_length=1, max_length=10000, description="IDs of the tasks to update")
+    filter: Optional[TaskBulkFilter] = Field(None, description="Update the tasks matching this filter instead of a list of ids")
+    patch: TaskInputUpdate = Field(..., description="Fields to set on every task")
+    updated_by_user_id: Optional[int] = Field(None, description="ID of the user making the change, for the task history")
+
+    @model_validator(mode='after')
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError('Give either ids or filter')
+        if self.filter is not None and all(value is None for value in self.filter.model_dump().values()):
+            raise ValueError('filter needs at least one field')
+        return self
+
+
+# Output schema for the user a task is assigned to (nested in TaskOutputSearch)
+class TaskAssigneeOutput(BaseModel):
+    id: int = Field(..., description="ID of the user")
+    first_name: str = Field(..., description="First name of the user")
+    last_name: str = Field(..., description="Last name of the user")
+    email: str = Field(..., description="Email address of the user")
+    role: Optional[str] = Field(None, description="Role of the user")
+
+
+# Output schema for searching and retrieving tasks
+class TaskOutputSearch(BaseModel):
+    id: int = Field(..., description="ID of the task")
+    title: str = Field(..., description="Title of the task")
+    description: Optional[str] = Field(None, description="Description of the task")
+    status: TaskStatus = Field(..., description="Status of the task")
+    priority: TaskPriority = Field(..., description="Priority of the task")
+    due_date: Optional[date] = Field(None, description="Due date of the task")
+    project_id: Optional[int] = Field(None, description="ID of the project the task belongs to")
+    parent_id: Optional[int] = Field(None, description="ID of the parent task")
+    assigned_user_id: Optional[int] = Field(None, description="ID of the user the task is assigned to")
+    assignee: Optional[TaskAssigneeOutput] = Field(None, description="User the task is assigned to")
+    created_by_user_id: Optional[int] = Field(None, description="ID of the user who created the task")
+    created_at: datetime = Field(..., description="Creation time of the task")
+    updated_at: Optional[datetime] = Field(None, description="Last update time of the task")
+
+
+# Output schema for a subtask in a task tree
+class TaskOutputSubtask(TaskOutputSearch):
+    depth: int = Field(..., description="Levels below the task the tree was read from")
+
+
+
+# Output schema for the task statistics rollups of a project, an assignee or all tasks
+class TaskStatsOutput(BaseModel):
+    total: int = Field(..., description="Number of tasks")
+    by_status: dict[TaskStatus, int] = Field(..., description="Number of tasks per status")
+    by_priority: dict[TaskPriority, int] = Field(..., description="Number of tasks per priority")
+    by_status_priority: dict[TaskStatus, dict[TaskPriority, int]] = Field(..., description="Number of tasks per status and priority")
+    overdue: int = Field(..., description="Number of tasks not completed and due before today")
+
+
+# Enum for the kinds of task changes (matches the CHECK constraint in migrations/007_task_changes.sql)
+class TaskChangeOp(str, Enum):
+    insert = 'insert'
+    update = 'update'
+    delete = 'delete'
+
+
+# Output schema for one entry of the task change feed
+class TaskChangeOutput(BaseModel):
+    seq: int = Field(..., description="Sequence number of the change, increasing")
+    task_id: int = Field(..., description="ID of the changed task")
+    op: TaskChangeOp = Field(..., description="Kind of change")
+    changed_at: datetime = Field(..., description="Time of the change (UTC)")
+
+
+# Output schema for a page of the task change feed
+class TaskChangesOutput(BaseModel):
+    changes: list[TaskChangeOutput] = Field(..., description="Changes after `since`, in sequence order")
+    last_seq: int = Field(..., description="Sequence number to pass as `since` for the next page")
+    resync: bool = Field(..., description="Changes after `since` were pruned or the database was reset; reload the tasks and continue from last_seq")
+
+
+# Output schema for a bulk update
+class TaskBulkUpdateOutput(BaseModel):
+    count: int = Field(..., description="Number of tasks changed")
+    ids: list[int] = Field(..., description="IDs of the tasks changed, ascending")
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+
+# Enum for task history actions (matches the CHECK constraint in migrations/base.sql)
+class TaskRecordAction(str, Enum):
+    created = 'created'
+    updated = 'updated'
+    deleted = 'deleted'
+    completed = 'completed'
+    commented = 'commented'
+
+
+# Output schema for the history of a task
+class TaskRecordOutput(BaseModel):
+    id: int = Field(..., description="ID of the record")
+    task_id: int = Field(..., description="ID of the task")
+    updated_by_user_id: Optional[int] = Field(None, description="ID of the user who made the change")
+    update_date: datetime = Field(..., description="Time of the change (UTC)")
+    action: TaskRecordAction = Field(..., description="Kind of change")
+    comment: Optional[str] = Field(None, description="Details of the change")
@@ -1,26 +1,38 @@
 from pydantic import BaseModel, EmailStr, Field
+from enum import Enum
 from typing import Optional
 
 
+# Enum for user roles (matches the CHECK constraint in migrations/base.sql)
+class UserRole(str, Enum):
+    admin = 'admin'
+    manager = 'manager'
+    developer = 'developer'
+
+
 # Input schema for adding a new user
 class UserInputAdd(BaseModel):
-    name: str = Field(..., max_length=50, description="Name of the user")
-    role: str = Field(..., max_length=30, description="Role of the user (e.g., developer, designer)")
-    email: EmailStr = Field(..., description="Email address of the user")
+    first_name: str = Field(..., max_length=50, description="First name of the user")
+    last_name: str = Field(..., max_length=50, description="Last name of the user")
+    email: EmailStr = Field(..., description="Email address of the user, unique")
+    password: str = Field(..., min_length=8, max_length=128, description="Password of the user, stored hashed")
+    role: UserRole = Field(UserRole.developer, description="Role of the user")
 
 
 # Input schema for updating an existing user
 class UserInputUpdate(BaseModel):
-    name: Optional[str] = Field(None, max_length=50, description="Updated name of the user")
-    role: Optional[str] = Field(None, max_length=30, description="Updated role of the user")
+    first_name: Optional[str] = Field(None, max_length=50, description="Updated first name of the user")
+    last_name: Optional[str] = Field(None, max_length=50, description="Updated last name of the user")
     email: Optional[EmailStr] = Field(None, description="Updated email address of the user")
+    role: Optional[UserRole] = Field(None, description="Updated role of the user")
 
 
 # Output schema for searching and retrieving users
 class UserOutputSearch(BaseModel):
     id: int = Field(..., description="ID of the user")
-    name: str = Field(..., description="Name of the user")
-    role: str = Field(..., description="Role of the user")
+    first_name: str = Field(..., description="First name of the user")
+    last_name: str = Field(..., description="Last name of the user")
+    role: UserRole = Field(..., description="Role of the user")
     email: EmailStr = Field(..., description="Email address of the user")
 
     class Config:
@@ -1,6 +1,7 @@
 from models.student import Student
 from models.student_group import StudentGroup
 from helpers.db import DB
+from helpers.query import QueryBuilder, like
 
 from schemas.student_input_output import *
 from schemas.student_group_input_output import *
@@ -9,6 +10,21 @@ from fastapi import HTTPException, status
 
 class Students:
     
+    STUDENTS_QUERY = QueryBuilder('SELECT * FROM students', {
+        'id': 'id = :id',
+        'name': ('(first_name LIKE :name OR last_name LIKE :name OR middle_name LIKE :name)', like),
+        'admission_year_from': 'admission_year >= :admission_year_from',
+        'admission_year_to': 'admission_year <= :admission_year_to',
+    })
+    
+    STUDENT_GROUPS_QUERY = QueryBuilder('''SELECT sg.*, s.first_name AS starosta_first_name, s.last_name AS starosta_last_name
+                                           FROM student_groups sg
+                                           LEFT JOIN students s ON sg.starosta_student_id = s.id''', {
+        'id': 'sg.id = :id',
+        'code': ('sg.code LIKE :code', like),
+        'starosta': ('(s.first_name LIKE :starosta OR s.last_name LIKE :starosta)', like),
+    })
+    
     @classmethod
     def addStudent(cls, studentData: StudentInputAdd) -> int:
         '''Add a student to the database and return the id of the new student'''
@@ -48,27 +64,10 @@ class Students:
             ) -> list[Student]:
         '''Search students based on the provided filters'''
         
-        sql = 'SELECT * FROM students '
-        where, values = [], {}
-        
-        if id is not None:
-            where.append("id = :id")
-            values['id'] = id
-            
-        if name is not None:
-            where.append("(first_name LIKE :name OR last_name LIKE :name OR middle_name LIKE :name)")
-            values['name'] = f'%{name}%'
-        
-        if admission_year_from is not None:
-            where.append("admission_year >= :admission_year_from")
-            values['admission_year_from'] = admission_year_from
-        
-        if admission_year_to is not None:
-            where.append("admission_year <= :admission_year_to")
-            values['admission_year_to'] = admission_year_to
-        
-        sql += ' WHERE ' + ' AND '.join(where) if where else ''
-        sql += f' LIMIT {limit} OFFSET {offset}'
+        sql, values = cls.STUDENTS_QUERY.build(
+            dict(id=id, name=name, admission_year_from=admission_year_from, admission_year_to=admission_year_to),
+            limit=limit, offset=offset
+        )
         
         return DB.select(sql, values)
     
@@ -119,26 +118,9 @@ class Students:
             ) -> list[StudentGroupOutputSearch]:
         '''Search student groups based on the provided filters'''
         
-        sql = '''SELECT sg.*, s.first_name AS starosta_first_name, s.last_name AS starosta_last_name
-                 FROM student_groups sg
-                 LEFT JOIN students s ON sg.starosta_student_id = s.id '''
-        
-        where, values = [], {}
-        
-        if id is not None:
-            where.append("sg.id = :id")
-            values['id'] = id
-        
-        if code is not None:
-            where.append("sg.code LIKE :code")
-            values['code'] = f'%{code}%'
-        
-        if starosta is not None:
-            where.append("(s.first_name LIKE :starosta OR s.last_name LIKE :starosta)")
-            values['starosta'] = f'%{starosta}%'
-        
-        sql += ' WHERE ' + ' AND '.join(where) if where else ''
-        sql += f' LIMIT {limit} OFFSET {offset}'
+        sql, values = cls.STUDENT_GROUPS_QUERY.build(
+            dict(id=id, code=code, starosta=starosta), limit=limit, offset=offset
+        )
         
         items = DB.select(sql, values)
         
@@ -1,9 +1,18 @@
 from helpers.db import DB
+from helpers.query import QueryBuilder, like
 from schemas.subject_input_output import *
 from models.subject import Subject
 
 class Subjects:
     
+    QUERY = QueryBuilder('SELECT * FROM subjects', {
+        'id': 'id = :id',
+        'code': 'code = :code',
+        'name': ('(name LIKE :name OR code LIKE :name)', like),
+        'hours_from': 'hours >= :hours_from',
+        'hours_to': 'hours <= :hours_to',
+    })
+    
     @classmethod
     def add(cls, inputData: SubjectInputAdd) -> int:
         '''Add a subject to the database and return the id of added item'''
@@ -41,36 +50,9 @@ class Subjects:
             ) -> list[SubjectOutputSearch]:
         '''Search subjects based on the provided filters'''
         
-        sql = 'SELECT * FROM subjects '
-        where, values = [], {}
-        
-        # Collect conditions for the WHERE clause
-        if id is not None:
-            where.append("id = :id")
-            values['id'] = id
-        
-        if code is not None:
-            where.append("code = :code")
-            values['code'] = code
-            
-        if name is not None:
-            where.append("(name LIKE :name OR code LIKE :name)")
-            values['name'] = f'%{name}%'
-        
-        if hours_from is not None:
-            where.append("hours >= :hours_from")
-            values['hours_from'] = hours_from
-        
-        if hours_to is not None:
-            where.append("hours <= :hours_to")
-            values['hours_to'] = hours_to
-        
-        # Build the SQL query dynamically
-        if where:
-            sql += ' WHERE ' + ' AND '.join(where)
-        
-        # Add LIMIT and OFFSET
-        sql += f' LIMIT {limit} OFFSET {offset}'
+        sql, values = cls.QUERY.build(
+            dict(id=id, name=name, code=code, hours_from=hours_from, hours_to=hours_to), limit=limit, offset=offset
+        )
         
         # Execute and return the results
         return DB.select(sql, values)
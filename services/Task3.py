@@ -1,9 +1,16 @@
 from models.student import Student
 from helpers.db import DB
+from helpers.query import QueryBuilder, like
 from schemas.teacher_input_output import *
 
 class Teachers:
     
+    QUERY = QueryBuilder('SELECT * FROM teachers', {
+        'id': 'id = :id',
+        'name': ('(first_name LIKE :name OR last_name LIKE :name OR middle_name LIKE :name)', like),
+        'academic_rank': ('academic_rank = :academic_rank', lambda rank: rank.value),
+    })
+    
     @classmethod
     def add(cls, teacherData: TeacherInputAdd) -> int:
         '''Add a teacher to the database and return the id of added item'''
@@ -39,28 +46,9 @@ class Teachers:
             ) -> list[Teacher]:
         '''Search teachers based on the provided filters'''
         
-        sql = 'SELECT * FROM teachers '
-        where, values = [], {}
-        
-        # Collect conditions for the WHERE clause
-        if id is not None:
-            where.append("id = :id")
-            values['id'] = id
-        
-        if name is not None:
-            where.append("(first_name LIKE :name OR last_name LIKE :name OR middle_name LIKE :name)")
-            values['name'] = f'%{name}%'
-        
-        if academic_rank is not None:
-            where.append("academic_rank = :academic_rank")
-            values['academic_rank'] = academic_rank.value
-        
-        # Build the SQL query dynamically
-        if where:
-            sql += ' WHERE ' + ' AND '.join(where)
-        
-        # Add LIMIT and OFFSET
-        sql += f' LIMIT {limit} OFFSET {offset}'
+        sql, values = cls.QUERY.build(
+            dict(id=id, name=name, academic_rank=academic_rank), limit=limit, offset=offset
+        )
         
         # Execute and return the results
         return DB.select(sql, values)
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from models import Manager  # Assuming you have a Manager model defined in models.py
 from schemas.manager_input_output import ManagerInputAdd, ManagerInputUpdate, ManagerOutputSearch
 from helpers.db import DB  # Assuming DB is a utility that provides the database connection/session
+from helpers.cursor import Cursor
 
 
 class Managers:
@@ -42,18 +43,25 @@ class Managers:
         return True
 
     @staticmethod
-    def search(name: str | None = None, role: str | None = None, limit: int = 10, offset: int = 0) -> List[ManagerOutputSearch]:
-        """Search for managers based on given parameters."""
+    def search(id: int | None = None, name: str | None = None, role: str | None = None, cursor: str | None = None, limit: int = 10, offset: int = 0) -> List[ManagerOutputSearch]:
+        """Search for managers based on given parameters, paginated by cursor when given, else by offset."""
         db: Session = DB.get_session()
         
         query = db.query(Manager)
         
+        if id is not None:
+            query = query.filter(Manager.id == id)
         if name:
             query = query.filter(Manager.name.ilike(f"%{name}%"))
         if role:
             query = query.filter(Manager.role == role)
         
-        managers = query.offset(offset).limit(limit).all()
+        if cursor is not None:
+            _, lastId = Cursor.decode(cursor, "id")
+            query = query.filter(Manager.id > lastId)
+            offset = 0
+        
+        managers = query.order_by(Manager.id).offset(offset).limit(limit).all()
         db.close()
         
         # Convert managers to the output schema
@@ -0,0 +1,56 @@
+import sqlite3
+
+from helpers.db import DB
+from schemas.project_input_output import *
+
+from fastapi import HTTPException, status
+
+# projects and sub-projects; the tree is read through project_closure (migrations/008_hierarchy.sql),
+# which triggers keep up to date on insert, move and delete
+class Projects:
+
+    DESCENDANTS_SQL = '''
+        SELECT p.id, p.name, p.status, p.parent_id, c.depth, p.created_at
+        FROM project_closure c JOIN projects p ON p.id = c.descendant
+        WHERE c.ancestor = ? AND c.depth BETWEEN 1 AND ?
+        ORDER BY c.depth, p.id LIMIT ?
+    '''
+
+    @classmethod
+    def add(cls, inputData: ProjectInputAdd) -> int:
+        '''Add a project, under its parent when given, and return its id'''
+
+        if inputData.parent_id is not None and DB.select_project_by_id(inputData.parent_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Project with id {inputData.parent_id} does not exist')
+
+        data = inputData.model_dump(mode='json')
+        sql = f'INSERT INTO projects ({", ".join(data.keys())}) VALUES ({", ".join(["?"] * len(data))})'
+        try:
+            return DB.execute(sql, tuple(data.values()))
+        except sqlite3.IntegrityError:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f'Project {inputData.name} already exists')
+
+    @classmethod
+    def descendants(cls, id: int, maxDepth: int = 100, limit: int = 1000) -> list[ProjectOutputNode]:
+        '''Sub-projects of a project at any depth up to maxDepth, level by level, one range scan on project_closure'''
+
+        if DB.select_project_by_id(id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Project with id {id} does not exist')
+        return [ProjectOutputNode(**row) for row in DB.select(cls.DESCENDANTS_SQL, (id, maxDepth, limit))]
+
+    @classmethod
+    def move(cls, id: int, parent_id: int | None) -> dict:
+        '''Move a project, with its sub-projects, under another project (or to the top level when parent_id is None).
+        Only the closure rows between the moved subtree and its old and new ancestors are rewritten'''
+
+        if DB.select_project_by_id(id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Project with id {id} does not exist')
+        if parent_id is not None and DB.select_project_by_id(parent_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Project with id {parent_id} does not exist')
+
+        try:
+            DB.execute('UPDATE projects SET parent_id = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (parent_id, id))
+        except sqlite3.IntegrityError as e:
+            # raised by the project_closure_cycle trigger
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        return DB.select_project_by_id(id)
@@ -0,0 +1,79 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from helpers.db import DB
+from helpers.settings import Settings
+from schemas.task_input_output import TaskStatus
+
+logger = logging.getLogger('task_manager.reminders')
+
+# due-date reminders: the sweep queues 'overdue' and 'due_soon' reminders for open tasks,
+# the dispatch claims unsent reminders and hands them to deliver(). Both run as scheduled jobs (see main.py)
+class Reminders:
+
+    OPEN_STATUSES = tuple(status.value for status in TaskStatus if status != TaskStatus.completed)
+
+    # one chunk of open tasks with a due date in [since, until), keyset paginated on idx_tasks_status_due
+    CHUNK_SQL = '''
+        SELECT id, due_date FROM tasks
+        WHERE status = :status AND due_date >= :since AND due_date < :until AND (due_date, id) > (:after_date, :after_id)
+        ORDER BY due_date, id LIMIT :limit
+    '''
+    QUEUE_SQL = 'INSERT OR IGNORE INTO task_reminders (task_id, kind, due_date) VALUES (?, ?, ?)'
+
+    # claims a batch atomically, so workers running the same job never deliver a reminder twice
+    CLAIM_SQL = '''
+        UPDATE task_reminders SET sent_at = CURRENT_TIMESTAMP
+        WHERE id IN (SELECT id FROM task_reminders WHERE sent_at IS NULL ORDER BY id LIMIT ?)
+        RETURNING id, task_id, kind, due_date
+    '''
+
+    @classmethod
+    def sweep(cls) -> dict:
+        '''Queue reminders for overdue tasks and for tasks due within REMINDER_DUE_SOON_DAYS, return how many were new'''
+        today = datetime.now(timezone.utc).date()  # sqlite date('now') is UTC as well
+        soon = today + timedelta(days=Settings.REMINDER_DUE_SOON_DAYS + 1)
+        return {
+            'overdue': cls._queue('overdue', '', today.isoformat()),
+            'due_soon': cls._queue('due_soon', today.isoformat(), soon.isoformat()),
+        }
+
+    @classmethod
+    def _queue(cls, kind: str, since: str, until: str) -> int:
+        '''Walk the open tasks due in [since, until) chunk by chunk, each chunk queued in its own short transaction'''
+        queued = 0
+        for status in cls.OPEN_STATUSES:
+            params = {'status': status, 'since': since, 'until': until, 'after_date': '', 'after_id': 0, 'limit': Settings.REMINDER_CHUNK_SIZE}
+            while rows := DB.select(cls.CHUNK_SQL, params):
+                queued += DB.executemany(cls.QUEUE_SQL, [(row['id'], kind, row['due_date']) for row in rows])
+                params['after_date'], params['after_id'] = rows[-1]['due_date'], rows[-1]['id']
+                if len(rows) < Settings.REMINDER_CHUNK_SIZE:
+                    break
+        return queued
+
+    @classmethod
+    def dispatch(cls) -> dict:
+        '''Claim unsent reminders batch by batch and deliver them, return how many were sent.
+        A reminder is marked sent before delivery: a failing deliver() loses it rather than repeating it'''
+        sent = 0
+        while True:
+            with DB.transaction() as conn:
+                rows = conn.execute(cls.CLAIM_SQL, (Settings.REMINDER_CHUNK_SIZE,)).fetchall()
+            DB.invalidate(cls.CLAIM_SQL)
+            if not rows:
+                return {'sent': sent}
+
+            reminders = [dict(zip(('id', 'task_id', 'kind', 'due_date'), row)) for row in sorted(rows)]
+            cls.deliver(reminders)
+            sent += len(reminders)
+
+    @staticmethod
+    def deliver(reminders: list[dict]):
+        '''Send a batch of reminders; replace to plug in a notification channel (email, chat, ...)'''
+        for reminder in reminders:
+            logger.info('Task %(task_id)s %(kind)s (due %(due_date)s)', reminder)
+
+    @classmethod
+    def pending(cls) -> int:
+        '''Number of reminders waiting to be dispatched'''
+        return DB.select('SELECT count(*) AS pending FROM task_reminders WHERE sent_at IS NULL')[0]['pending']
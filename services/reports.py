@@ -0,0 +1,98 @@
+import time
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from helpers.analytics import taskSnapshot
+from schemas.report_input_output import ThroughputOutput, LeadTimeOutput, WorkloadOutput
+from schemas.task_input_output import TaskStatus, TaskPriority
+
+# reporting aggregates computed with vectorised operations on the in-memory task snapshot
+class Reports:
+
+    WEEK = 7 * 24 * 3600
+    # the epoch started on a Thursday, weeks are counted from the Monday after it
+    FIRST_MONDAY = 4 * 24 * 3600
+
+    COMPLETED = list(TaskStatus).index(TaskStatus.completed)
+
+    @classmethod
+    def _mask(cls, columns: dict, project_id: int | None, assigned_user_id: int | None) -> np.ndarray:
+        '''Rows matching the optional project and assignee filters'''
+        mask = np.ones(len(columns['id']), dtype=bool)
+        if project_id is not None:
+            mask &= columns['project_id'] == project_id
+        if assigned_user_id is not None:
+            mask &= columns['assigned_user_id'] == assigned_user_id
+        return mask
+
+    @classmethod
+    def _completedAt(cls, columns: dict) -> np.ndarray:
+        '''Completion time from the task history, else the last change of a task created as completed'''
+        return np.where(columns['completed_at'] > 0, columns['completed_at'], columns['changed_at'])
+
+    @staticmethod
+    def _today() -> int:
+        '''Epoch seconds of today's midnight (UTC, as sqlite date('now'))'''
+        return int(datetime.combine(datetime.now(timezone.utc).date(), datetime.min.time(), timezone.utc).timestamp())
+
+    @classmethod
+    def throughput(cls, weeks: int = 12, project_id: int | None = None, assigned_user_id: int | None = None) -> list[ThroughputOutput]:
+        '''Tasks completed per week over the last weeks weeks, oldest first'''
+        taskSnapshot.ensureFresh()
+        with taskSnapshot.lock:
+            columns = taskSnapshot.columns
+            mask = cls._mask(columns, project_id, assigned_user_id) & (columns['status'] == cls.COMPLETED)
+            week = (cls._completedAt(columns)[mask] - cls.FIRST_MONDAY) // cls.WEEK
+
+        first = (int(time.time()) - cls.FIRST_MONDAY) // cls.WEEK - weeks + 1
+        week = week[week >= first] - first
+        counts = np.bincount(week, minlength=weeks)[:weeks]
+
+        return [
+            ThroughputOutput(week_start=datetime.fromtimestamp(cls.FIRST_MONDAY + (first + i) * cls.WEEK, timezone.utc).date(), completed=int(count))
+            for i, count in enumerate(counts)
+        ]
+
+    @classmethod
+    def leadTime(cls, project_id: int | None = None, assigned_user_id: int | None = None, since: date | None = None) -> LeadTimeOutput:
+        '''Hours from creation to completion of completed tasks, optionally only those completed since a date'''
+        taskSnapshot.ensureFresh()
+        with taskSnapshot.lock:
+            columns = taskSnapshot.columns
+            mask = cls._mask(columns, project_id, assigned_user_id) & (columns['status'] == cls.COMPLETED)
+            completedAt = cls._completedAt(columns)
+            if since is not None:
+                mask &= completedAt >= int(datetime.combine(since, datetime.min.time(), timezone.utc).timestamp())
+            hours = np.clip(completedAt[mask] - columns['created_at'][mask], 0, None) / 3600
+
+        if not len(hours):
+            return LeadTimeOutput(count=0)
+        p50, p90 = np.percentile(hours, [50, 90])
+        return LeadTimeOutput(count=len(hours), mean_hours=round(float(hours.mean()), 2), p50_hours=round(float(p50), 2), p90_hours=round(float(p90), 2))
+
+    @classmethod
+    def workload(cls, project_id: int | None = None) -> list[WorkloadOutput]:
+        '''Open, per priority and overdue task counts of every assignee with open tasks'''
+        taskSnapshot.ensureFresh()
+        with taskSnapshot.lock:
+            columns = taskSnapshot.columns
+            mask = cls._mask(columns, project_id, None) & (columns['status'] != cls.COMPLETED)
+            users, row = np.unique(columns['assigned_user_id'][mask], return_inverse=True)
+            priorities = columns['priority'][mask]
+            due = columns['due_date'][mask]
+
+        priorityCount = len(TaskPriority)
+        open = np.bincount(row, minlength=len(users))
+        byPriority = np.bincount(row * priorityCount + priorities, minlength=len(users) * priorityCount).reshape(len(users), priorityCount)
+        overdue = np.bincount(row, weights=(due >= 0) & (due < cls._today()), minlength=len(users))
+
+        return [
+            WorkloadOutput(
+                assigned_user_id=int(users[i]),
+                open=int(open[i]),
+                by_priority={priority: int(byPriority[i, code]) for code, priority in enumerate(TaskPriority)},
+                overdue=int(overdue[i]),
+            )
+            for i in range(len(users))
+        ]
@@ -0,0 +1,92 @@
+import sys
+
+from helpers.db import DB
+from schemas.task_input_output import TaskStatsOutput, TaskStatus, TaskPriority
+
+
+# task counts per project, assignee, status and priority, read from the task_stats and task_due_stats
+# rollups (migrations/004_task_stats.sql, 009_task_stats_prune.sql) that triggers on tasks keep up to date
+class TaskStats:
+
+    # scope is 'all', 'project' or 'user'; scope_id 0 is the 'all' scope and tasks without a project/assignee
+    SCOPES = ('all', 'project', 'user')
+
+    REBUILD_SQL = '''
+        DELETE FROM task_stats;
+        DELETE FROM task_due_stats;
+
+        INSERT INTO task_stats (scope, scope_id, status, priority, task_count)
+            SELECT 'all', 0, status, priority, count(*) FROM tasks GROUP BY status, priority
+            UNION ALL SELECT 'project', COALESCE(project_id, 0), status, priority, count(*) FROM tasks GROUP BY 2, status, priority
+            UNION ALL SELECT 'user', COALESCE(assigned_user_id, 0), status, priority, count(*) FROM tasks GROUP BY 2, status, priority;
+
+        INSERT INTO task_due_stats (scope, scope_id, due_date, open_count)
+            SELECT 'all', 0, due_date, count(*) FROM tasks WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY due_date
+            UNION ALL SELECT 'project', COALESCE(project_id, 0), due_date, count(*) FROM tasks WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY 2, due_date
+            UNION ALL SELECT 'user', COALESCE(assigned_user_id, 0), due_date, count(*) FROM tasks WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY 2, due_date;
+    '''
+
+    @classmethod
+    def get(cls, scope: str = 'all', scope_id: int = 0) -> TaskStatsOutput:
+        '''Task counts by status and priority plus the overdue count of one scope.
+        Reads at most one row per status/priority pair and one per open due date, whatever the size of tasks'''
+
+        if scope not in cls.SCOPES:
+            raise ValueError(f'Unknown statistics scope {scope}')
+
+        rows = DB.select('SELECT status, priority, task_count FROM task_stats WHERE scope = ? AND scope_id = ?', (scope, scope_id))
+        overdue = DB.select('''SELECT COALESCE(sum(open_count), 0) AS overdue FROM task_due_stats
+                               WHERE scope = ? AND scope_id = ? AND due_date < date('now')''', (scope, scope_id))[0]['overdue']
+        return cls._output(rows, overdue)
+
+    @classmethod
+    def projectTree(cls, project_id: int) -> TaskStatsOutput:
+        '''Task counts of a project and all its sub-projects: the project rollups of every project in the subtree
+        (a project_closure range scan) summed up, without reading any task'''
+        rows = DB.select('''SELECT s.status, s.priority, sum(s.task_count) AS task_count
+                             FROM project_closure c JOIN task_stats s ON s.scope = 'project' AND s.scope_id = c.descendant
+                             WHERE c.ancestor = ? GROUP BY s.status, s.priority''', (project_id,))
+        overdue = DB.select('''SELECT COALESCE(sum(d.open_count), 0) AS overdue
+                                FROM project_closure c JOIN task_due_stats d ON d.scope = 'project' AND d.scope_id = c.descendant
+                                WHERE c.ancestor = ? AND d.due_date < date('now')''', (project_id,))[0]['overdue']
+        return cls._output(rows, overdue)
+
+    @classmethod
+    def taskTree(cls, task_id: int) -> TaskStatsOutput:
+        '''Progress of a task: counts of all its subtasks, at any depth, read through task_closure'''
+        rows = DB.select('''SELECT t.status, t.priority, count(*) AS task_count,
+                                    sum(t.status != 'completed' AND t.due_date < date('now')) AS overdue
+                             FROM task_closure c JOIN tasks t ON t.id = c.descendant
+                             WHERE c.ancestor = ? AND c.depth > 0 GROUP BY t.status, t.priority''', (task_id,))
+        return cls._output(rows, sum(row['overdue'] or 0 for row in rows))
+
+    @staticmethod
+    def _output(rows: list, overdue: int) -> TaskStatsOutput:
+        '''Statistics from (status, priority, task_count) rows'''
+        byStatusPriority = {status: {priority: 0 for priority in TaskPriority} for status in TaskStatus}
+        for row in rows:
+            byStatusPriority[TaskStatus(row['status'])][TaskPriority(row['priority'])] = row['task_count']
+
+        return TaskStatsOutput(
+            total=sum(sum(counts.values()) for counts in byStatusPriority.values()),
+            by_status={status: sum(counts.values()) for status, counts in byStatusPriority.items()},
+            by_priority={priority: sum(counts[priority] for counts in byStatusPriority.values()) for priority in TaskPriority},
+            by_status_priority=byStatusPriority,
+            overdue=overdue,
+        )
+
+    @classmethod
+    def rebuild(cls):
+        '''Recompute the rollups from the tasks table, for repairs after writes that bypassed the triggers'''
+        with DB.transaction() as conn:
+            for statement in DB.statements(cls.REBUILD_SQL):
+                conn.execute(statement)
+
+
+# python -m services.stats rebuild
+if __name__ == '__main__':
+    if sys.argv[1:] != ['rebuild']:
+        sys.exit('usage: python -m services.stats rebuild')
+    DB.init()
+    TaskStats.rebuild()
+    print('Task statistics rebuilt.')
@@ -0,0 +1,53 @@
+from helpers.db import DB
+from helpers.settings import Settings
+from schemas.task_input_output import TaskChangesOutput
+
+# the task change feed: triggers on tasks (migrations/007_task_changes.sql) append one row per change,
+# clients read the changes after the last sequence number they saw and re-fetch only those tasks
+class TaskChanges:
+
+    SINCE_SQL = 'SELECT seq, task_id, op, changed_at FROM task_changes WHERE seq > ? ORDER BY seq LIMIT ?'
+
+    # highest sequence number ever assigned, kept by sqlite for AUTOINCREMENT tables even when the rows are pruned
+    LATEST_SQL = "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'task_changes'), 0) AS latest"
+
+    # rows are appended in time order: the scan stops at the first change inside the retention window
+    PRUNE_SQL = '''
+        DELETE FROM task_changes WHERE seq < COALESCE(
+            (SELECT seq FROM task_changes WHERE changed_at >= datetime('now', ?) ORDER BY seq LIMIT 1),
+            (SELECT max(seq) + 1 FROM task_changes)
+        )
+    '''
+
+    @classmethod
+    def since(cls, since: int, limit: int = 1000) -> list[dict]:
+        '''Changes with a sequence number above since, in order, a range scan on the primary key'''
+        return DB.select(cls.SINCE_SQL, (since, limit))
+
+    @classmethod
+    def latest(cls) -> int:
+        '''Sequence number of the most recent change, 0 when there was none'''
+        return DB.select(cls.LATEST_SQL)[0]['latest']
+
+    @classmethod
+    def feed(cls, since: int = 0, limit: int = 1000) -> TaskChangesOutput:
+        '''A page of changes after since. When some of them were pruned (or the database was reset)
+        the page is empty and flags a resync from the latest sequence number'''
+        latest = cls.latest()
+        first = DB.select('SELECT min(seq) AS first FROM task_changes')[0]['first'] or latest + 1
+        if since > latest or since < first - 1:
+            return TaskChangesOutput(changes=[], last_seq=latest, resync=True)
+
+        rows = cls.since(since, limit)
+        return TaskChangesOutput(changes=rows, last_seq=rows[-1]['seq'] if rows else since, resync=False)
+
+    @classmethod
+    def prune(cls) -> dict:
+        '''Delete the changes older than CHANGE_RETENTION_DAYS'''
+        with DB.transaction() as conn:
+            pruned = conn.execute(cls.PRUNE_SQL, (f'-{Settings.CHANGE_RETENTION_DAYS} days',)).rowcount
+        if pruned:
+            # task_changes is never cached by entity and no other table changes: DB.invalidate would
+            # treat the DELETE as a cascading one and drop the whole cache
+            DB.versions.bump('task_changes')
+        return {'pruned': pruned}
@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+
+from helpers.db import DB
+from helpers.audit import AuditLog
+from helpers.export import Export
+from schemas.task_record_input_output import TaskRecordOutput
+
+class TaskRecords:
+
+    @staticmethod
+    def _timestamp(value: datetime) -> str:
+        '''update_date form of a datetime: aware values are converted to UTC, naive ones are taken as UTC'''
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+
+    @classmethod
+    def history(
+                cls,
+                task_id: int,
+                since: datetime | None = None,
+                until: datetime | None = None,
+                limit: int = 100
+            ) -> list[TaskRecordOutput]:
+        '''History of a task in time order, a range scan on idx_task_records_task_date.
+        Pending audit events are written first so a change is visible in the history right after it is made'''
+
+        AuditLog.flush()
+        return [TaskRecordOutput(**row) for row in DB.select(*cls.historyStatement(task_id, since, until, limit))]
+
+    @classmethod
+    def historyStatement(
+                cls,
+                task_id: int,
+                since: datetime | None = None,
+                until: datetime | None = None,
+                limit: int = 100
+            ) -> tuple[str, dict]:
+        '''(sql, params) of a task history'''
+
+        sql = 'SELECT * FROM task_records WHERE task_id = :task_id'
+        values = {'task_id': task_id, 'limit': limit}
+
+        if since is not None:
+            sql += ' AND update_date >= :since'
+            values['since'] = cls._timestamp(since)
+
+        if until is not None:
+            sql += ' AND update_date < :until'
+            values['until'] = cls._timestamp(until)
+
+        sql += ' ORDER BY update_date, id LIMIT :limit'
+        return sql, values
+
+    @classmethod
+    def export(
+                cls,
+                format: str = 'ndjson',
+                task_id: int | None = None,
+                action: str | None = None,
+                updated_by_user_id: int | None = None,
+                since: datetime | None = None,
+                until: datetime | None = None
+            ):
+        '''Stream the task history matching the filters as NDJSON or CSV chunks, in id order.
+        Pending audit events are written first, as for history'''
+
+        AuditLog.flush()
+
+        sql = 'SELECT * FROM task_records '
+        where, values = [], {}
+
+        if task_id is not None:
+            where.append("task_id = :task_id")
+            values['task_id'] = task_id
+
+        if action is not None:
+            where.append("action = :action")
+            values['action'] = action
+
+        if updated_by_user_id is not None:
+            where.append("updated_by_user_id = :updated_by_user_id")
+            values['updated_by_user_id'] = updated_by_user_id
+
+        if since is not None:
+            where.append("update_date >= :since")
+            values['since'] = cls._timestamp(since)
+
+        if until is not None:
+            where.append("update_date < :until")
+            values['until'] = cls._timestamp(until)
+
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id'
+
+        return Export.encode(DB.iterate(sql, values, records=True), format)
@@ -0,0 +1,314 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+from helpers.db import DB
+from helpers.cursor import Cursor
+from helpers.fts import FTS
+from helpers.bulk import BulkImport
+from helpers.export import Export
+from helpers.query import QueryBuilder, like
+from helpers.loader import BatchLoader
+from helpers.audit import AuditLog
+from schemas.task_input_output import *
+
+from fastapi import HTTPException, status
+
+class Tasks:
+
+    # columns a search can be sorted (and keyset paginated) by
+    SORT_KEYS = ('id', 'created_at')
+
+    QUERY = QueryBuilder('SELECT * FROM tasks', {
+        'id': 'id = :id',
+        'name': ('title LIKE :name', like),
+        'status': ('status = :status', lambda value: TaskStatus(value).value),
+        'priority': ('priority = :priority', lambda value: TaskPriority(value).value),
+        'project_id': 'project_id = :project_id',
+        'assigned_user_id': 'assigned_user_id = :assigned_user_id',
+        'project_tree': 'project_id IN (SELECT descendant FROM project_closure WHERE ancestor = :project_tree)',
+    })
+
+    # which of a JSON array of ids are tasks
+    EXISTING_SQL = 'SELECT id FROM tasks WHERE id IN (SELECT value FROM json_each(?))'
+
+    # subtasks at any depth, level by level, a range scan on task_closure
+    SUBTASKS_SQL = '''
+        SELECT tasks.*, c.depth FROM task_closure c JOIN tasks ON tasks.id = c.descendant
+        WHERE c.ancestor = ? AND c.depth BETWEEN 1 AND ?
+        ORDER BY c.depth, tasks.id LIMIT ?
+    '''
+
+    # target of a bulk update: a list of ids (bound as one JSON array, clear of the variable limit) or filters
+    BULK_UPDATE = QueryBuilder('UPDATE tasks', {
+        'ids': ('id IN (SELECT value FROM json_each(:ids))', json.dumps),
+        'status': 'status = :status',
+        'priority': 'priority = :priority',
+        'project_id': 'project_id = :project_id',
+        'assigned_user_id': 'assigned_user_id = :assigned_user_id',
+    })
+    # one history row per updated task, inserted in the bulk update transaction
+    BULK_HISTORY_SQL = '''
+        INSERT INTO task_records (task_id, updated_by_user_id, update_date, action, comment)
+        SELECT value, ?, ?, ?, ? FROM json_each(?)
+    '''
+
+    # assignees of a page of tasks are resolved with one batched query
+    ASSIGNEES = BatchLoader('users')
+    ASSIGNEE_FIELDS = tuple(TaskAssigneeOutput.model_fields)
+
+    # full-text matches joined with their best rank, see FTS.TASKS_MATCH_SQL
+    MATCH_SELECT = f'SELECT tasks.* FROM tasks JOIN ({FTS.TASKS_MATCH_SQL}) m ON m.task_id = tasks.id'
+
+    # columns of TaskOutputSearch in field order, timestamps formatted as pydantic would,
+    # so records of this select dump to the same JSON as the validated models
+    RECORD_COLUMNS = ', '.join(
+        'NULL AS assignee' if field == 'assignee'
+        else f"strftime('%Y-%m-%dT%H:%M:%S', tasks.{field}) AS {field}" if field in ('created_at', 'updated_at')
+        else f'tasks.{field}'
+        for field in TaskOutputSearch.model_fields
+    )
+    RECORD_SELECT = f'SELECT {RECORD_COLUMNS} FROM tasks'
+    RECORD_MATCH_SELECT = f'SELECT {RECORD_COLUMNS} FROM tasks JOIN ({FTS.TASKS_MATCH_SQL}) m ON m.task_id = tasks.id'
+
+    @classmethod
+    def add(cls, inputData: TaskInputAdd) -> int:
+        '''Add a task to the database and return the id of added item'''
+
+        if inputData.parent_id is not None and DB.select_task_by_id(inputData.parent_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Task with id {inputData.parent_id} does not exist')
+
+        data = inputData.model_dump(mode='json')
+        fields = ', '.join(data.keys())
+        values = ', '.join(['?'] * len(data))
+        sql = f'INSERT INTO tasks ({fields}) VALUES ({values})'
+
+        id = DB.execute(sql, tuple(data.values()))
+        AuditLog.record(id, 'created', data['created_by_user_id'])
+        return id
+
+    @classmethod
+    def addBulk(cls, rows: list[tuple[int, TaskInputAdd]]) -> tuple[int, list]:
+        '''Insert a batch of (index, task) rows in one transaction, return the inserted count and per-row errors.
+        Rows whose parent task does not exist are rejected, as foreign keys are not enforced'''
+
+        fields = list(TaskInputAdd.model_fields.keys())
+        sql = f'INSERT INTO tasks ({", ".join(fields)}) VALUES ({", ".join(["?"] * len(fields))})'
+
+        errors = []
+        parentIds = {task.parent_id for _, task in rows if task.parent_id is not None}
+        if parentIds:
+            existing = {row['id'] for row in DB.select(cls.EXISTING_SQL, (json.dumps(sorted(parentIds)),))}
+            errors = [{'index': index, 'error': f'Task with id {task.parent_id} does not exist'}
+                      for index, task in rows if task.parent_id is not None and task.parent_id not in existing]
+            rows = [(index, task) for index, task in rows if task.parent_id is None or task.parent_id in existing]
+
+        inserted, insertErrors = BulkImport.insert(sql, [(index, tuple(task.model_dump(mode='json').values())) for index, task in rows])
+        return inserted, errors + insertErrors
+
+    @classmethod
+    def update(cls, id: int, inputData: TaskInputUpdate) -> TaskOutputSearch:
+        '''Update task by id, update only specified fields'''
+
+        updateKeyValues = {field: value for field, value in inputData.model_dump(mode='json').items()
+                           if field in inputData.model_fields_set and value is not None}
+
+        if updateKeyValues:
+            updateSql = 'UPDATE tasks SET ' + ', '.join([f'{key} = ?' for key in updateKeyValues.keys()]) + ', updated_at = CURRENT_TIMESTAMP WHERE id = ?'
+            DB.execute(updateSql, (*updateKeyValues.values(), id))
+
+        task = DB.select_task_by_id(id)
+        if task is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Task with id {id} does not exist')
+
+        if updateKeyValues:
+            action = 'completed' if updateKeyValues.get('status') == TaskStatus.completed.value else 'updated'
+            AuditLog.record(id, action, comment='Changed ' + ', '.join(updateKeyValues.keys()))
+        return task
+
+    @classmethod
+    def move(cls, id: int, parent_id: int | None) -> TaskOutputSearch:
+        '''Make a task a subtask of another one (or a top-level task when parent_id is None), its subtasks move along.
+        Only the closure rows between the moved subtree and its old and new ancestors are rewritten'''
+
+        if DB.select_task_by_id(id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Task with id {id} does not exist')
+        if parent_id is not None and DB.select_task_by_id(parent_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Task with id {parent_id} does not exist')
+
+        try:
+            DB.execute('UPDATE tasks SET parent_id = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (parent_id, id))
+        except sqlite3.IntegrityError as e:
+            # raised by the task_closure_cycle trigger
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+        AuditLog.record(id, 'updated', comment='Changed parent_id')
+        return DB.select_task_by_id(id)
+
+    @classmethod
+    def subtasks(cls, id: int, maxDepth: int = 100, limit: int = 1000) -> list[TaskOutputSubtask]:
+        '''Subtasks of a task at any depth up to maxDepth, level by level'''
+
+        if DB.select_task_by_id(id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f'Task with id {id} does not exist')
+
+        rows = DB.select(cls.SUBTASKS_SQL, (id, maxDepth, limit))
+        return cls.ASSIGNEES.attach(rows, 'assigned_user_id', 'assignee')
+
+    @classmethod
+    def updateBulk(cls, inputData: TaskInputBulkUpdate) -> TaskBulkUpdateOutput:
+        '''Apply one patch to the tasks with the given ids or matching the filter in a single transaction.
+        Tasks already holding the patched values are left alone. Their history is written in the same transaction'''
+
+        updateKeyValues = {field: value for field, value in inputData.patch.model_dump(mode='json').items()
+                           if field in inputData.patch.model_fields_set and value is not None}
+        if not updateKeyValues:
+            raise HTTPException(status_code=400, detail='The patch sets no fields')
+
+        # SET values are bound as :set_<field>, apart from the filter params of the same name
+        setSql = ', '.join(f'{key} = :set_{key}' for key in updateKeyValues) + ', updated_at = CURRENT_TIMESTAMP'
+        changed = '(' + ' OR '.join(f'{key} IS NOT :set_{key}' for key in updateKeyValues) + ')'
+        filters = inputData.filter.model_dump(mode='json') if inputData.filter is not None else {'ids': inputData.ids}
+        sql, params = cls.BULK_UPDATE.build(
+            filters, (changed,), {f'set_{key}': value for key, value in updateKeyValues.items()}, select=f'UPDATE tasks SET {setSql}'
+        )
+
+        action = 'completed' if updateKeyValues.get('status') == TaskStatus.completed.value else 'updated'
+        history = (inputData.updated_by_user_id, datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+                   action, 'Changed ' + ', '.join(updateKeyValues.keys()))
+
+        # the flush lock is taken before the write lock, in the same order as the background writer
+        with AuditLog.direct(), DB.transaction() as conn:
+            ids = sorted(row[0] for row in conn.execute(sql + ' RETURNING id', params))
+            if ids:
+                conn.execute(cls.BULK_HISTORY_SQL, (*history, json.dumps(ids)))
+        DB.invalidate(sql, params)
+        DB.invalidate(cls.BULK_HISTORY_SQL)
+
+        return TaskBulkUpdateOutput(count=len(ids), ids=ids)
+
+    @classmethod
+    def search(
+                cls,
+                id: int | None = None,
+                name: str | None = None,
+                q: str | None = None,
+                status: TaskStatus | None = None,
+                priority: TaskPriority | None = None,
+                project_id: int | None = None,
+                project_tree: int | None = None,
+                assigned_user_id: int | None = None,
+                sort: str = 'id',
+                cursor: str | None = None,
+                limit: int = 10,
+                offset: int = 0,
+                records: bool = False
+            ) -> list[TaskOutputSearch]:
+        '''Search tasks based on the provided filters, paginated by cursor when given, else by offset.
+        With q, tasks are full-text matched on title, description and comments and ordered by relevance.
+        With records, rows are returned as records already in TaskOutputSearch shape, for direct JSON serialisation'''
+
+        statement = cls.searchStatement(
+            id=id, name=name, q=q, status=status, priority=priority, project_id=project_id, project_tree=project_tree,
+            assigned_user_id=assigned_user_id, sort=sort, cursor=cursor, limit=limit, offset=offset, records=records,
+        )
+        if statement is None:
+            return []
+        rows = DB.select(*statement, records=records)
+        return cls.ASSIGNEES.attach(rows, 'assigned_user_id', 'assignee', cls.ASSIGNEE_FIELDS if records else None)
+
+    @classmethod
+    def searchStatement(
+                cls,
+                id: int | None = None,
+                name: str | None = None,
+                q: str | None = None,
+                status: TaskStatus | None = None,
+                priority: TaskPriority | None = None,
+                project_id: int | None = None,
+                project_tree: int | None = None,
+                assigned_user_id: int | None = None,
+                sort: str = 'id',
+                cursor: str | None = None,
+                limit: int = 10,
+                offset: int = 0,
+                records: bool = False
+            ) -> tuple[str, dict] | None:
+        '''(sql, params) of a search, None when q has no searchable words'''
+
+        if sort not in cls.SORT_KEYS:
+            raise HTTPException(status_code=400, detail=f'Tasks can only be sorted by {", ".join(cls.SORT_KEYS)}')
+
+        if q is not None and cursor is not None:
+            raise HTTPException(status_code=400, detail='Full-text results are paginated by offset, not cursor')
+
+        select, extraParams = cls._fullText(q)
+        if extraParams is None:
+            return None
+        if records:
+            select = cls.RECORD_MATCH_SELECT if q is not None else cls.RECORD_SELECT
+
+        extra = ()
+        # keyset pagination: seek past the last row of the previous page instead of skipping rows
+        if cursor is not None:
+            extraParams['cursor_value'], extraParams['cursor_id'] = Cursor.decode(cursor, sort)
+            if sort == 'created_at' and isinstance(extraParams['cursor_value'], str):
+                # cursors from record pages carry the ISO form of the stored timestamp
+                extraParams['cursor_value'] = extraParams['cursor_value'].replace('T', ' ')
+            extra = (Cursor.where(sort),)
+            offset = 0
+
+        orderBy = 'm.rank, id' if q is not None else sort + (', id' if sort != 'id' else '')
+        if records and q is None:
+            # the formatted created_at output column would shadow the indexed one
+            orderBy = f'tasks.{orderBy}'.replace(', id', ', tasks.id')
+        return cls.QUERY.build(
+            dict(id=id, name=name, status=status, priority=priority, project_id=project_id, project_tree=project_tree, assigned_user_id=assigned_user_id),
+            extra, extraParams, orderBy, select, limit, offset
+        )
+
+    @classmethod
+    def export(
+                cls,
+                format: str = 'ndjson',
+                id: int | None = None,
+                name: str | None = None,
+                q: str | None = None,
+                status: TaskStatus | None = None,
+                priority: TaskPriority | None = None,
+                project_id: int | None = None,
+                project_tree: int | None = None,
+                assigned_user_id: int | None = None
+            ):
+        '''Stream all tasks matching the search filters as NDJSON or CSV chunks, in id order'''
+
+        select, extraParams = cls._fullText(q)
+        if extraParams is None:
+            return Export.encode(iter(()), format)
+
+        sql, params = cls.QUERY.build(
+            dict(id=id, name=name, status=status, priority=priority, project_id=project_id, project_tree=project_tree, assigned_user_id=assigned_user_id),
+            extraParams=extraParams, orderBy='id', select=select
+        )
+
+        return Export.encode(DB.iterate(sql, params, records=True), format)
+
+    @classmethod
+    def _fullText(cls, q: str | None) -> tuple:
+        '''Select and params for an optional full-text query; params are None when q has no searchable words'''
+        if q is None:
+            return None, {}
+        match = FTS.match(q)
+        if match is None:
+            return None, None
+        return cls.MATCH_SELECT, {'q': match}
+
+    @classmethod
+    def addTaskDummyData(cls):
+        '''Add dummy data for testing purposes'''
+        DB.execute('''INSERT INTO tasks (id, title, description, status, priority, due_date) VALUES
+                      (1, 'Set up repository', 'Create the repository and CI pipeline', 'completed', 'high', '2024-01-15'),
+                      (2, 'Design database schema', 'Tables for users, projects and tasks', 'in_progress', 'medium', '2024-02-01'),
+                      (3, 'Write API documentation', NULL, 'pending', 'low', NULL)
+                      ON CONFLICT DO NOTHING
+                   ''')
@@ -1,8 +1,49 @@
+import hashlib
+import secrets
+import sqlite3
+
+from fastapi import HTTPException
+
 from helpers.db import DB
+from helpers.bulk import BulkImport
+from helpers.cursor import Cursor
+from helpers.fts import FTS
+from helpers.query import QueryBuilder, like
 from schemas.user_input_output import UserInputAdd, UserInputUpdate, UserOutputSearch
 
+# pbkdf2 rounds of a stored password hash
+PASSWORD_ITERATIONS = 100_000
+
 
 class Users:
+    # columns are qualified: the full-text select joins users_fts, which has first_name and last_name too.
+    # They are listed in UserOutputSearch field order, so records of these selects dump to the same JSON as the models
+    QUERY = QueryBuilder("SELECT users.id, users.first_name, users.last_name, users.role, users.email FROM users", {
+        "id": "users.id = :id",
+        "name": ("(users.first_name LIKE :name OR users.last_name LIKE :name)", like),
+        "role": "users.role = :role",
+    })
+    MATCH_SELECT = ("SELECT users.id, users.first_name, users.last_name, users.role, users.email "
+                    "FROM users JOIN users_fts f ON f.rowid = users.id")
+
+    INSERT_SQL = "INSERT INTO users (first_name, last_name, email, password_hash, role) VALUES (?, ?, ?, ?, ?)"
+
+    @staticmethod
+    def hashPassword(password: str) -> str:
+        """
+        Hash a password for the password_hash column.
+        :param password: Plain text password
+        :return: pbkdf2_sha256$iterations$salt$hash
+        """
+        salt = secrets.token_hex(16)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), PASSWORD_ITERATIONS).hex()
+        return f"pbkdf2_sha256${PASSWORD_ITERATIONS}${salt}${digest}"
+
+    @staticmethod
+    def _row(userData: UserInputAdd) -> tuple:
+        return (userData.first_name, userData.last_name, userData.email,
+                Users.hashPassword(userData.password), userData.role.value)
+
     @staticmethod
     def addUser(userData: UserInputAdd) -> int:
         """
@@ -10,65 +51,106 @@ class Users:
         :param userData: UserInputAdd schema
         :return: ID of the newly created user
         """
-        query = """
-        INSERT INTO users (name, role, email)
-        VALUES (?, ?, ?)
+        try:
+            return DB.execute(Users.INSERT_SQL, Users._row(userData))
+        except sqlite3.IntegrityError:
+            raise HTTPException(status_code=409, detail=f"User with email {userData.email} already exists")
+
+    @staticmethod
+    def addUsersBulk(rows: list[tuple[int, UserInputAdd]]) -> tuple[int, list]:
+        """
+        Insert a batch of users in one transaction.
+        :param rows: List of (index, UserInputAdd schema) pairs
+        :return: Number of inserted users and the errors of rejected rows (e.g. duplicate emails)
         """
-        params = (userData.name, userData.role, userData.email)
-        return DB.execute(query, params, commit=True)
+        return BulkImport.insert(Users.INSERT_SQL, [(index, Users._row(user)) for index, user in rows])
 
     @staticmethod
     def updateUser(id: int, userData: UserInputUpdate) -> dict:
         """
-        Update an existing user in the database.
+        Update an existing user in the database, only the fields given.
         :param id: ID of the user to update
         :param userData: UserInputUpdate schema
         :return: Success message
         """
-        query = """
-        UPDATE users
-        SET name = ?, role = ?, email = ?
-        WHERE id = ?
-        """
-        params = (userData.name, userData.role, userData.email, id)
-        DB.execute(query, params, commit=True)
+        updateKeyValues = {field: value for field, value in userData.model_dump(mode="json").items()
+                           if field in userData.model_fields_set and value is not None}
+
+        if updateKeyValues:
+            query = "UPDATE users SET " + ", ".join(f"{key} = ?" for key in updateKeyValues) + ", updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+            try:
+                DB.execute(query, (*updateKeyValues.values(), id))
+            except sqlite3.IntegrityError:
+                raise HTTPException(status_code=409, detail=f"User with email {userData.email} already exists")
+
+        if DB.select_user_by_id(id) is None:
+            raise HTTPException(status_code=404, detail=f"User with id {id} does not exist")
         return {"message": f"User with ID {id} has been updated successfully"}
 
     @staticmethod
     def searchUsers(
         id: int = None,
         name: str = None,
+        q: str = None,
         role: str = None,
+        cursor: str = None,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        records: bool = False
     ) -> list[UserOutputSearch]:
         """
         Search users in the database with optional filters.
         :param id: User ID
         :param name: User name
+        :param q: Full-text query over first and last names, results are ordered by relevance
         :param role: User role
+        :param cursor: Keyset cursor of the previous page, takes precedence over offset
         :param limit: Number of records to return
         :param offset: Starting point for records
+        :param records: Return records already in UserOutputSearch shape, for direct JSON serialisation
         :return: List of UserOutputSearch schema
         """
-        query = "SELECT id, name, role, email FROM users WHERE 1=1"
-        params = []
+        statement = Users.searchStatement(id, name, q, role, cursor, limit, offset)
+        if statement is None:
+            return []
+        rows = DB.select(*statement, records=records)
+        return rows if records else [UserOutputSearch(**row) for row in rows]
+
+    @staticmethod
+    def searchStatement(
+        id: int = None,
+        name: str = None,
+        q: str = None,
+        role: str = None,
+        cursor: str = None,
+        limit: int = 10,
+        offset: int = 0
+    ) -> tuple[str, dict] | None:
+        """
+        Build the query of a user search.
+        :return: (sql, params), None when q has no searchable words
+        """
+        if cursor is not None and q is not None:
+            raise HTTPException(status_code=400, detail="Full-text results are paginated by offset, not cursor")
+
+        select, extra, extraParams, order = None, (), {}, "id"
 
-        if id is not None:
-            query += " AND id = ?"
-            params.append(id)
-        if name is not None:
-            query += " AND name LIKE ?"
-            params.append(f"%{name}%")
-        if role is not None:
-            query += " AND role = ?"
-            params.append(role)
+        if q is not None:
+            match = FTS.match(q)
+            if match is None:
+                return None
+            select, order = Users.MATCH_SELECT, "f.rank, users.id"
+            extra += ("f.users_fts MATCH :q",)
+            extraParams["q"] = match
 
-        query += " LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        if cursor is not None:
+            _, extraParams["cursor_id"] = Cursor.decode(cursor, "id")
+            extra += ("users.id > :cursor_id",)
+            offset = 0
 
-        rows = DB.fetch(query, tuple(params))
-        return [UserOutputSearch(id=row[0], name=row[1], role=row[2], email=row[3]) for row in rows]
+        return Users.QUERY.build(
+            dict(id=id, name=name, role=role), extra, extraParams, order, select, limit, offset
+        )
 
     @staticmethod
     def addUserDummyData():
@@ -76,14 +158,12 @@ class Users:
         Populate the users table with dummy data.
         """
         dummy_users = [
-            ("John Doe", "developer", "john@example.com"),
-            ("Jane Smith", "designer", "jane@example.com"),
-            ("Bob Johnson", "manager", "bob@example.com"),
+            ("John", "Doe", "john@example.com", Users.hashPassword("changeme"), "developer"),
+            ("Jane", "Smith", "jane@example.com", Users.hashPassword("changeme"), "admin"),
+            ("Bob", "Johnson", "bob@example.com", Users.hashPassword("changeme"), "manager"),
         ]
 
-        query = "INSERT INTO users (name, role, email) VALUES (?, ?, ?)"
-        for user in dummy_users:
-            DB.execute(query, user, commit=True)
+        DB.executemany("INSERT OR IGNORE" + Users.INSERT_SQL[len("INSERT"):], dummy_users)
 
     @staticmethod
     def addTeam(teamData):
@@ -0,0 +1,26 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# settings are read when the app modules are imported: point them at a throwaway database first
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ['TASK_MANAGER_DB_FILE'] = os.path.join(tempfile.mkdtemp(prefix='task_manager_tests_'), 'test.db')
+os.environ['TASK_MANAGER_ADMISSION'] = '0'
+os.environ['TASK_MANAGER_SCHEDULER'] = '0'
+os.environ['TASK_MANAGER_SQL_PROFILING'] = '0'
+
+# migrations are read relative to the repository root
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def client():
+    '''Test client of the app, running its lifespan once for the whole session'''
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
@@ -0,0 +1,21 @@
+from starlette.requests import Request
+
+from helpers.admission import Admission, RateLimiter
+
+
+def request(host: str, headers: dict | None = None) -> Request:
+    return Request({
+        'type': 'http', 'method': 'GET', 'path': '/tasks/search', 'client': (host, 50000),
+        'headers': [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()],
+    })
+
+
+def test_client_ignores_client_id_header():
+    assert Admission.client(request('10.0.0.1', {'X-Client-Id': 'a'})) == Admission.client(request('10.0.0.1', {'X-Client-Id': 'b'})) == '10.0.0.1'
+
+
+def test_rotating_client_id_does_not_reset_the_bucket():
+    limiter = RateLimiter(rate=1, burst=2)
+    waits = [limiter.take(Admission.client(request('10.0.0.2', {'X-Client-Id': str(i)}))) for i in range(3)]
+    assert waits[:2] == [0, 0] and waits[2] > 0
+    assert len(limiter) == 1
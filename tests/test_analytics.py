@@ -0,0 +1,42 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from helpers.analytics import TaskSnapshot, taskSnapshot
+from helpers.db import DB
+
+
+def test_refresh_after_delete_uses_one_connection(client, monkeypatch):
+    ids = [client.post('/tasks/add', json={'title': f'snapshot {n}'}).json()['id'] for n in range(3)]
+    snapshot = TaskSnapshot()
+    snapshot.refresh(full=True)
+
+    checkedOut, peak = 0, 0
+    connection = DB.connection
+
+    @contextmanager
+    def counting():
+        nonlocal checkedOut, peak
+        checkedOut += 1
+        peak = max(peak, checkedOut)
+        try:
+            with connection() as conn:
+                yield conn
+        finally:
+            checkedOut -= 1
+
+    monkeypatch.setattr(DB, 'connection', counting)
+    DB.execute('DELETE FROM tasks WHERE id = ?', (ids[0],))
+    snapshot.refresh()
+
+    assert peak == 1
+    assert snapshot.stats()['full_loads'] == 2
+    assert ids[0] not in snapshot._index and ids[1] in snapshot._index
+
+
+def test_snapshot_stats_does_not_block_the_event_loop(client):
+    with ThreadPoolExecutor(1) as pool, taskSnapshot.lock:
+        # a refresh in progress holds the lock: the stats request waits, other requests go on
+        stats = pool.submit(client.get, '/reports/snapshot')
+        assert client.get('/tasks/search').status_code == 200
+        assert not stats.done()
+    assert stats.result(timeout=5).status_code == 200
@@ -0,0 +1,51 @@
+import sqlite3
+
+import pytest
+
+from helpers.db import DB
+from schemas.task_input_output import TaskInputBulkUpdate
+from services.tasks import Tasks
+
+
+def statuses(ids: list) -> list:
+    return [DB.select('SELECT status FROM tasks WHERE id = ?', (id,))[0]['status'] for id in ids]
+
+
+def test_bulk_update_by_ids(client):
+    ids = [client.post('/tasks/add', json={'title': f'bulk {n}'}).json()['id'] for n in range(3)]
+    client.put(f'/tasks/update/{ids[2]}', json={'status': 'completed'})
+
+    result = client.put('/tasks/bulk_update', json={'ids': ids, 'patch': {'status': 'completed'}, 'updated_by_user_id': 7}).json()
+    # the task already completed is left alone
+    assert result == {'count': 2, 'ids': ids[:2]}
+    assert statuses(ids) == ['completed'] * 3
+
+    for id in ids[:2]:
+        history = client.get(f'/task_records/history/{id}').json()
+        assert [record['action'] for record in history] == ['created', 'completed']
+        assert history[-1]['updated_by_user_id'] == 7 and history[-1]['comment'] == 'Changed status'
+
+
+def test_bulk_update_by_filter(client):
+    project = client.post('/projects/add', json={'name': 'bulk filter'}).json()['id']
+    ids = [client.post('/tasks/add', json={'title': f'filtered {n}', 'project_id': project, 'priority': priority}).json()['id']
+           for n, priority in enumerate(('low', 'low', 'high'))]
+
+    result = client.put('/tasks/bulk_update', json={'filter': {'project_id': project, 'priority': 'low'}, 'patch': {'status': 'blocked'}}).json()
+    assert result == {'count': 2, 'ids': ids[:2]}
+    assert statuses(ids) == ['blocked', 'blocked', 'pending']
+    assert client.get(f'/task_records/history/{ids[2]}').json()[-1]['action'] == 'created'
+
+
+def test_bulk_update_rejects_empty_patch_and_target(client):
+    assert client.put('/tasks/bulk_update', json={'ids': [1], 'patch': {}}).status_code == 400
+    assert client.put('/tasks/bulk_update', json={'patch': {'status': 'blocked'}}).status_code == 422
+
+
+def test_bulk_update_is_one_transaction(client, monkeypatch):
+    ids = [client.post('/tasks/add', json={'title': f'atomic {n}'}).json()['id'] for n in range(2)]
+    # the history insert fails after the tasks were updated: the updates are rolled back with it
+    monkeypatch.setattr(Tasks, 'BULK_HISTORY_SQL', 'INSERT INTO missing_table VALUES (?, ?, ?, ?, ?)')
+    with pytest.raises(sqlite3.OperationalError):
+        Tasks.updateBulk(TaskInputBulkUpdate(ids=ids, patch={'status': 'completed'}))
+    assert statuses(ids) == ['pending', 'pending']
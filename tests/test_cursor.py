@@ -0,0 +1,41 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from helpers.cursor import Cursor
+
+
+def raw(*parts) -> str:
+    return base64.urlsafe_b64encode(json.dumps(parts).encode()).decode().rstrip('=')
+
+
+def test_round_trip():
+    assert Cursor.decode(Cursor.encode('created_at', '2024-01-01 10:00:00', 7), 'created_at') == ('2024-01-01 10:00:00', 7)
+    assert Cursor.decode(Cursor.encode('id', 7, 7), 'id') == (7, 7)
+
+
+@pytest.mark.parametrize('cursor', ['not base64!', raw('created_at', [1], 1), raw('created_at', {'a': 1}, 1), raw('created_at', 'x')])
+def test_malformed_cursor(cursor):
+    with pytest.raises(HTTPException) as error:
+        Cursor.decode(cursor, 'created_at')
+    assert error.value.status_code == 400
+
+
+def test_other_sort_rejected():
+    with pytest.raises(HTTPException) as error:
+        Cursor.decode(Cursor.encode('id', 7, 7), 'created_at')
+    assert error.value.status_code == 400
+
+
+def test_search_route_rejects_crafted_cursor(client):
+    response = client.get('/tasks/search', params={'sort': 'created_at', 'cursor': raw('created_at', [1], 1)})
+    assert response.status_code == 400
+
+
+def test_full_text_search_has_no_next_cursor(client):
+    for n in range(3):
+        client.post('/tasks/add', json={'title': f'cursorless release {n}'})
+    response = client.get('/tasks/search', params={'q': 'cursorless', 'limit': 2})
+    assert len(response.json()) == 2 and 'x-next-cursor' not in response.headers
@@ -0,0 +1,35 @@
+from helpers.cache import EntityCache
+from helpers.db import DB
+
+
+def test_put_after_invalidation_is_dropped():
+    cache = EntityCache()
+    generation = cache.generation('tasks')
+    cache.invalidate('tasks', 1)
+    cache.put('tasks', 1, {'id': 1, 'title': 'stale'}, generation)
+    assert cache.get('tasks', 1) is None
+
+
+def test_update_by_id_invalidates_only_that_row(client):
+    first, second = (client.post('/tasks/add', json={'title': f'cached {n}'}).json()['id'] for n in range(2))
+    DB.select_task_by_id(first), DB.select_task_by_id(second)
+    assert DB.cache.get('tasks', first) is not None
+
+    DB.execute('UPDATE tasks SET title = ? WHERE id = ?', ('renamed', first))
+    assert DB.cache.get('tasks', first) is None
+    assert DB.cache.get('tasks', second)['title'] == 'cached 1'
+    assert DB.select_task_by_id(first)['title'] == 'renamed'
+
+    assert client.put(f'/tasks/update/{second}', json={'title': 'renamed too'}).json()['title'] == 'renamed too'
+    assert DB.select_task_by_id(second)['title'] == 'renamed too'
+
+
+def test_delete_clears_cached_rows(client):
+    id = client.post('/tasks/add', json={'title': 'deleted'}).json()['id']
+    user = client.post('/users/add', json={'first_name': 'Cached', 'last_name': 'User', 'email': 'cached@example.com', 'password': 'cached-user'}).json()['id']
+    DB.select_task_by_id(id), DB.select_user_by_id(user)
+
+    DB.execute('DELETE FROM tasks WHERE id = ?', (id,))
+    assert DB.select_task_by_id(id) is None
+    # foreign key actions may have changed other tables: their rows are dropped too
+    assert DB.cache.get('users', user) is None
@@ -0,0 +1,15 @@
+from helpers.profiler import QueryProfiler
+
+
+def test_server_timing_only_when_profiling(client, monkeypatch):
+    monkeypatch.setattr(QueryProfiler, 'enabled', False)
+    assert 'server-timing' not in client.get('/tasks/search').headers
+
+    monkeypatch.setattr(QueryProfiler, 'enabled', True)
+    timing = client.get('/tasks/search', params={'limit': 1}).headers['server-timing']
+    assert timing.startswith('db;dur=') and 'total;dur=' in timing
+
+
+def test_normalize_collapses_values():
+    assert QueryProfiler.normalize("SELECT *  FROM tasks WHERE id IN (?, ?, ?) AND title = 'x'") == \
+        'SELECT * FROM tasks WHERE id IN (...) AND title = ?'
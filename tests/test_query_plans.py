@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pytest
+
+from helpers.cursor import Cursor
+from helpers.db import DB
+from services.projects import Projects
+from services.reminders import Reminders
+from services.task_changes import TaskChanges
+from services.task_records import TaskRecords
+from services.tasks import Tasks
+from services.users import Users
+
+# (statement as the services build it, access that must appear in its EXPLAIN QUERY PLAN)
+PLANS = {
+    'tasks by status': (lambda: Tasks.searchStatement(status='pending'), 'USING INDEX idx_tasks_status_due'),
+    'my open tasks': (lambda: Tasks.searchStatement(assigned_user_id=1, status='pending'), 'USING INDEX idx_tasks_assignee_status_due'),
+    'project board': (lambda: Tasks.searchStatement(project_id=1, status='in_progress'), 'USING INDEX idx_tasks_project_status_due'),
+    'project tree': (lambda: Tasks.searchStatement(project_tree=1), 'SEARCH project_closure USING PRIMARY KEY'),
+    'tasks keyset page by created_at': (
+        lambda: Tasks.searchStatement(sort='created_at', cursor=Cursor.encode('created_at', '2024-01-01', 1)),
+        'USING INDEX idx_tasks_created_at'),
+    'task records keyset page by created_at': (
+        lambda: Tasks.searchStatement(sort='created_at', cursor=Cursor.encode('created_at', '2024-01-01', 1), records=True),
+        'USING INDEX idx_tasks_created_at'),
+    'tasks full text': (lambda: Tasks.searchStatement(q='release'), 'SEARCH tasks USING INTEGER PRIMARY KEY'),
+    'users keyset page': (lambda: Users.searchStatement(cursor=Cursor.encode('id', None, 5)), 'SEARCH users USING INTEGER PRIMARY KEY'),
+    'users full text': (lambda: Users.searchStatement(q='ann'), 'SEARCH users USING INTEGER PRIMARY KEY'),
+    'task history': (lambda: TaskRecords.historyStatement(1, since=datetime(2024, 1, 1)), 'USING INDEX idx_task_records_task_date'),
+    'task changes since': (lambda: (TaskChanges.SINCE_SQL, (0, 100)), 'SEARCH task_changes USING INTEGER PRIMARY KEY'),
+    'reminder sweep chunk': (
+        lambda: (Reminders.CHUNK_SQL, dict(status='pending', since='', until='2024-01-01', after_date='', after_id=0, limit=500)),
+        'USING COVERING INDEX idx_tasks_status_due'),
+    'reminder claim': (lambda: (Reminders.CLAIM_SQL, (100,)), 'USING INDEX idx_task_reminders_unsent'),
+    'subtasks': (lambda: (Tasks.SUBTASKS_SQL, (1, 5, 100)), 'SEARCH c USING PRIMARY KEY'),
+    'project descendants': (lambda: (Projects.DESCENDANTS_SQL, (1, 5, 100)), 'SEARCH c USING PRIMARY KEY'),
+    'existing parents': (lambda: (Tasks.EXISTING_SQL, ('[1, 2]',)), 'SEARCH tasks USING INTEGER PRIMARY KEY'),
+}
+
+
+@pytest.mark.parametrize('statement, expected', PLANS.values(), ids=PLANS.keys())
+def test_query_plan(client, statement, expected):
+    sql, params = statement()
+    plan = DB.explain(sql, params)
+    assert any(expected in detail for detail in plan), plan
@@ -0,0 +1,38 @@
+from helpers.cache import TableVersions
+
+
+def test_bump_all_covers_unwritten_tables():
+    versions = TableVersions()
+    versions.bump('tasks')
+    before = versions.snapshot(('users',))
+    versions.bumpAll()
+    assert versions.snapshot(('users',)) != before
+
+
+def test_write_to_dependent_table_changes_etag(client):
+    user = client.post('/users/add', json={'first_name': 'Etag', 'last_name': 'Owner', 'email': 'etag@example.com', 'password': 'etag-owner'}).json()['id']
+    id = client.post('/tasks/add', json={'title': 'etag', 'assigned_user_id': user}).json()['id']
+    response = client.get('/tasks/search', params={'id': id})
+    etag = response.headers['etag']
+    assert response.json()[0]['assignee']['last_name'] == 'Owner'
+
+    response = client.get('/tasks/search', params={'id': id}, headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.headers['etag'] == etag
+
+    # the task row is unchanged, but the response embeds its assignee from users
+    assert client.put(f'/users/update/{user}', json={'last_name': 'Renamed'}).status_code == 200
+    response = client.get('/tasks/search', params={'id': id}, headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['etag'] != etag
+    assert response.json()[0]['assignee']['last_name'] == 'Renamed'
+
+
+def test_reset_invalidates_etag(client):
+    id = client.post('/tasks/add', json={'title': 'before reset'}).json()['id']
+    response = client.get('/tasks/search', params={'id': id})
+    assert [task['id'] for task in response.json()] == [id]
+    etag = response.headers['etag']
+
+    assert client.post('/reset_database').status_code == 200
+    response = client.get('/tasks/search', params={'id': id}, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json() == []
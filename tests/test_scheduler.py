@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+from helpers.scheduler import Scheduler
+
+
+def test_start_runs_jobs_until_stopped():
+    async def scenario():
+        scheduler = Scheduler()
+        job = scheduler.add('tick', lambda: 'ticked', interval=0.01, jitter=0)
+        scheduler.start()
+        scheduler.start()  # already started: no second loop
+        assert len(scheduler._tasks) == 1
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+        runs = job.metrics['runs']
+        assert runs >= 2 and job.metrics['last_result'] == 'ticked'
+        assert scheduler._tasks == [] and job.stats()['next_run_in'] is None
+        await asyncio.sleep(0.05)
+        assert job.metrics['runs'] == runs
+
+    asyncio.run(scenario())
+
+
+def test_failures_are_recorded_and_overlapping_runs_skipped():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+
+    async def scenario():
+        scheduler = Scheduler()
+        scheduler.add('broken', lambda: 1 / 0, interval=60)
+        assert await scheduler.run('broken')
+        assert scheduler.jobs['broken'].metrics['failures'] == 1
+        assert scheduler.jobs['broken'].metrics['last_error'].startswith('ZeroDivisionError')
+
+        job = scheduler.add('slow', slow, interval=60)
+        first = asyncio.ensure_future(scheduler.run('slow'))
+        await asyncio.sleep(0.05)
+        assert not await scheduler.run('slow')
+        release.set()
+        assert await first
+        assert job.metrics['skipped'] == 1 and job.metrics['runs'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_run_job_route(client):
+    response = client.post('/debug/scheduler/change_prune/run')
+    assert response.status_code == 200
+    assert response.json()['ran'] and response.json()['runs'] >= 1
+    assert client.post('/debug/scheduler/missing/run').status_code == 404
+    assert 'change_prune' in client.get('/debug/scheduler').json()['jobs']
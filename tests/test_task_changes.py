@@ -0,0 +1,13 @@
+from helpers.db import DB
+from services.task_changes import TaskChanges
+
+
+def test_prune_bumps_only_task_changes(client):
+    client.post('/tasks/add', json={'title': 'change feed'})
+    DB.execute("UPDATE task_changes SET changed_at = datetime('now', '-400 days')")
+    tables = ('tasks', 'users', 'task_changes')
+    before = [DB.versions.get(table) for table in tables]
+
+    assert TaskChanges.prune()['pruned'] > 0
+    after = [DB.versions.get(table) for table in tables]
+    assert after == [before[0], before[1], before[2] + 1]
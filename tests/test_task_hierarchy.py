@@ -0,0 +1,45 @@
+from helpers.db import DB
+
+
+def closure(table: str, ids: set) -> list:
+    '''(ancestor, descendant, depth) rows of the nodes ids, from the closure table and recomputed from parent_id'''
+    stored = DB.select(f'SELECT ancestor, descendant, depth FROM {table}_closure ORDER BY 1, 2')
+    expected = DB.select(f'''WITH RECURSIVE t(ancestor, descendant, depth) AS (
+                                 SELECT id, id, 0 FROM {table}s
+                                 UNION ALL SELECT t.ancestor, c.id, t.depth + 1 FROM t JOIN {table}s c ON c.parent_id = t.descendant
+                             ) SELECT * FROM t ORDER BY 1, 2''')
+    pick = lambda rows: [row for row in rows if row['descendant'] in ids]
+    return pick(stored), pick(expected)
+
+
+def test_subtasks_and_move(client):
+    root = client.post('/tasks/add', json={'title': 'epic'}).json()['id']
+    child = client.post('/tasks/add', json={'title': 'story', 'parent_id': root}).json()['id']
+    leaf = client.post('/tasks/add', json={'title': 'subtask', 'parent_id': child, 'status': 'completed'}).json()['id']
+
+    subtasks = client.get(f'/tasks/{root}/subtasks').json()
+    assert [(task['id'], task['depth']) for task in subtasks] == [(child, 1), (leaf, 2)]
+    assert client.get(f'/tasks/{root}/progress').json()['by_status']['completed'] == 1
+
+    assert client.put(f'/tasks/{root}/parent', json={'parent_id': leaf}).status_code == 409
+    assert client.put(f'/tasks/{leaf}/parent', json={'parent_id': None}).status_code == 200
+    assert [task['id'] for task in client.get(f'/tasks/{root}/subtasks').json()] == [child]
+
+    stored, expected = closure('task', {root, child, leaf})
+    assert stored == expected
+
+
+def test_bulk_import_rejects_missing_parent(client):
+    parent = client.post('/tasks/add', json={'title': 'parent'}).json()['id']
+    response = client.post('/tasks/bulk', json=[
+        {'title': 'ok', 'parent_id': parent},
+        {'title': 'dangling', 'parent_id': 999999},
+        {'title': 'root'},
+    ])
+    result = response.json()
+    assert result['inserted'] == 2
+    assert result['errors'] == [{'index': 1, 'error': 'Task with id 999999 does not exist'}]
+    assert [task['title'] for task in client.get(f'/tasks/{parent}/subtasks').json()] == ['ok']
+
+    only_missing = client.post('/tasks/bulk', json=[{'title': 'dangling', 'parent_id': 999999}]).json()
+    assert only_missing['inserted'] == 0 and len(only_missing['errors']) == 1
@@ -0,0 +1,23 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+
+def test_history_range_with_offset(client):
+    id = client.post('/tasks/add', json={'title': 'history in another zone'}).json()['id']
+    plus2 = timezone(timedelta(hours=2))
+    now = datetime.now(timezone.utc).astimezone(plus2)
+
+    since = (now - timedelta(minutes=1)).isoformat()
+    history = client.get(f'/task_records/history/{id}', params={'since': since}).json()
+    assert [record['action'] for record in history] == ['created']
+
+    until = (now - timedelta(minutes=1)).isoformat()
+    assert client.get(f'/task_records/history/{id}', params={'until': until}).json() == []
+
+
+def test_export_includes_pending_history_and_converts_offsets(client):
+    id = client.post('/tasks/add', json={'title': 'exported right away'}).json()['id']
+    since = (datetime.now(timezone.utc) - timedelta(minutes=1)).astimezone(timezone(timedelta(hours=2))).isoformat()
+
+    response = client.get('/task_records/export', params={'task_id': id, 'since': since})
+    assert [json.loads(line)['action'] for line in response.text.splitlines()] == ['created']
@@ -0,0 +1,48 @@
+from helpers.db import DB
+
+# the rollups recomputed from tasks, as TaskStats.REBUILD_SQL builds them
+EXPECTED_STATS_SQL = '''
+    SELECT 'all' AS scope, 0 AS scope_id, status, priority, count(*) AS task_count FROM tasks GROUP BY status, priority
+    UNION ALL SELECT 'project', COALESCE(project_id, 0), status, priority, count(*) FROM tasks GROUP BY 2, status, priority
+    UNION ALL SELECT 'user', COALESCE(assigned_user_id, 0), status, priority, count(*) FROM tasks GROUP BY 2, status, priority
+    ORDER BY 1, 2, 3, 4
+'''
+EXPECTED_DUE_SQL = '''
+    SELECT 'all' AS scope, 0 AS scope_id, due_date, count(*) AS open_count FROM tasks
+        WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY due_date
+    UNION ALL SELECT 'project', COALESCE(project_id, 0), due_date, count(*) FROM tasks
+        WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY 2, due_date
+    UNION ALL SELECT 'user', COALESCE(assigned_user_id, 0), due_date, count(*) FROM tasks
+        WHERE status != 'completed' AND due_date IS NOT NULL GROUP BY 2, due_date
+    ORDER BY 1, 2, 3
+'''
+
+
+def assert_rollups_match():
+    '''The trigger-maintained rollups equal COUNT(*) over tasks, with no rows left at zero'''
+    stats = DB.select('SELECT scope, scope_id, status, priority, task_count FROM task_stats ORDER BY 1, 2, 3, 4')
+    due = DB.select('SELECT scope, scope_id, due_date, open_count FROM task_due_stats ORDER BY 1, 2, 3')
+    assert stats == DB.select(EXPECTED_STATS_SQL)
+    assert due == DB.select(EXPECTED_DUE_SQL)
+
+
+def test_rollups_follow_insert_update_move_and_delete(client):
+    projects = [client.post('/projects/add', json={'name': f'rollup {n}'}).json()['id'] for n in range(2)]
+    ids = [client.post('/tasks/add', json={
+        'title': f'rollup {n}', 'project_id': projects[0], 'assigned_user_id': n % 2 + 1,
+        'due_date': f'2020-01-0{n + 1}', 'priority': 'high',
+    }).json()['id'] for n in range(3)]
+    assert_rollups_match()
+
+    client.put(f'/tasks/update/{ids[0]}', json={'status': 'completed'})
+    client.put(f'/tasks/update/{ids[1]}', json={'due_date': '2020-02-01', 'priority': 'low'})
+    assert_rollups_match()
+
+    client.put(f'/tasks/update/{ids[2]}', json={'project_id': projects[1], 'assigned_user_id': 3})
+    assert_rollups_match()
+
+    for id in ids:
+        DB.execute('DELETE FROM tasks WHERE id = ?', (id,))
+    assert_rollups_match()
+    assert DB.select('SELECT count(*) AS zero FROM task_due_stats WHERE open_count = 0')[0]['zero'] == 0
+    assert DB.select('SELECT count(*) AS zero FROM task_stats WHERE task_count = 0')[0]['zero'] == 0
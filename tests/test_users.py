@@ -0,0 +1,76 @@
+import json
+
+
+def test_add_and_search_user(client):
+    response = client.post('/users/add', json={'first_name': 'Ada', 'last_name': 'Lovelace', 'email': 'ada@example.com', 'password': 'analytical'})
+    assert response.status_code == 200
+    id = response.json()['id']
+
+    users = client.get('/users/search', params={'q': 'lovel'}).json()
+    assert [user['id'] for user in users] == [id]
+    assert users[0]['first_name'] == 'Ada' and users[0]['role'] == 'developer'
+
+    assert client.post('/users/add', json={'first_name': 'Ada', 'last_name': 'L', 'email': 'ada@example.com', 'password': 'analytical'}).status_code == 409
+
+
+def test_bulk_import_users(client):
+    rows = [
+        {'first_name': 'Alan', 'last_name': 'Turing', 'email': 'alan@example.com', 'password': 'enigma-machine', 'role': 'admin'},
+        {'first_name': 'Grace', 'last_name': 'Hopper', 'email': 'grace@example.com', 'password': 'compiler-1952'},
+        {'first_name': 'Alan', 'last_name': 'Again', 'email': 'alan@example.com', 'password': 'duplicate-email'},
+        {'first_name': 'No', 'last_name': 'Email', 'password': 'missing-email'},
+    ]
+    response = client.post('/users/bulk', json=rows)
+    assert response.status_code == 200
+    result = response.json()
+    assert result['inserted'] == 2
+    assert [error['index'] for error in result['errors']] == [2, 3]
+
+    users = client.get('/users/search', params={'q': 'hopper'}).json()
+    assert [user['email'] for user in users] == ['grace@example.com']
+
+
+def test_bulk_import_users_ndjson(client):
+    body = '\n'.join(json.dumps({'first_name': f'Nd{i}', 'last_name': 'Json', 'email': f'nd{i}@example.com', 'password': 'password-123'}) for i in range(3))
+    response = client.post('/users/bulk', content=body, headers={'Content-Type': 'application/x-ndjson'})
+    assert response.json() == {'inserted': 3, 'errors': []}
+
+
+def test_update_user(client):
+    id = client.post('/users/add', json={'first_name': 'Linus', 'last_name': 'T', 'email': 'linus@example.com', 'password': 'penguin-os'}).json()['id']
+
+    assert client.put(f'/users/update/{id}', json={'last_name': 'Torvalds', 'role': 'manager'}).status_code == 200
+    user = client.get('/users/search', params={'id': id}).json()[0]
+    assert (user['first_name'], user['last_name'], user['role']) == ('Linus', 'Torvalds', 'manager')
+
+    assert client.put('/users/update/999999', json={'last_name': 'Nobody'}).status_code == 404
+
+
+def test_search_pages_follow_next_cursor(client):
+    for n in range(3):
+        client.post('/users/add', json={'first_name': 'Page', 'last_name': f'Turner{n}', 'email': f'page{n}@example.com', 'password': 'page-turner'})
+
+    # full-text results are paged by offset only, no cursor is offered
+    response = client.get('/users/search', params={'q': 'turner', 'limit': 2})
+    assert len(response.json()) == 2 and 'x-next-cursor' not in response.headers
+
+    response = client.get('/users/search', params={'name': 'Page', 'limit': 2})
+    seen = [user['id'] for user in response.json()]
+    while 'x-next-cursor' in response.headers:
+        response = client.get('/users/search', params={'name': 'Page', 'limit': 2, 'cursor': response.headers['x-next-cursor']})
+        assert response.status_code == 200
+        seen += [user['id'] for user in response.json()]
+    assert len(seen) == 3 and seen == sorted(seen)
+
+
+def test_fast_json_search_matches_pydantic(client, monkeypatch):
+    from helpers.response_cache import responseCache
+
+    client.post('/users/add', json={'first_name': 'Fast', 'last_name': 'Json', 'email': 'fast@example.com', 'password': 'orjson-fast', 'role': 'admin'})
+    monkeypatch.setattr(responseCache, 'enabled', False)
+    bodies = {}
+    for fast in (False, True):
+        monkeypatch.setattr(responseCache, 'fastJson', fast)
+        bodies[fast] = client.get('/users/search', params={'limit': 50}).content
+    assert bodies[True] == bodies[False]
+    assert b'fast@example.com' in bodies[True]